@@ -2,7 +2,7 @@
 # Generated by the protocol buffer compiler.  DO NOT EDIT!
 # NO CHECKED-IN PROTOBUF GENCODE
 # source: heartbeat_service.proto
-# Protobuf Python Version: 6.30.0
+# Protobuf Python Version: 6.31.0
 """Generated protocol buffer code."""
 from google.protobuf import descriptor as _descriptor
 from google.protobuf import descriptor_pool as _descriptor_pool
@@ -12,7 +12,7 @@ from google.protobuf.internal import builder as _builder
 _runtime_version.ValidateProtobufRuntimeVersion(
     _runtime_version.Domain.PUBLIC,
     6,
-    30,
+    31,
     0,
     '',
     'heartbeat_service.proto'
@@ -25,7 +25,7 @@ _sym_db = _symbol_database.Default()
 from google.protobuf import empty_pb2 as google_dot_protobuf_dot_empty__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x17heartbeat_service.proto\x12\x02hb\x1a\x1bgoogle/protobuf/empty.proto\"1\n\nUptimeInfo\x12\x0f\n\x07node_id\x18\x01 \x01(\t\x12\x12\n\nuptime_sec\x18\x02 \x01(\x01\x32\x7f\n\x10HeartbeatService\x12\x36\n\x04Ping\x12\x16.google.protobuf.Empty\x1a\x16.google.protobuf.Empty\x12\x33\n\tGetUptime\x12\x16.google.protobuf.Empty\x1a\x0e.hb.UptimeInfob\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x17heartbeat_service.proto\x12\x02hb\x1a\x1bgoogle/protobuf/empty.proto\"1\n\nUptimeInfo\x12\x0f\n\x07node_id\x18\x01 \x01(\t\x12\x12\n\nuptime_sec\x18\x02 \x01(\x01\"*\n\tStatsInfo\x12\x0f\n\x07node_id\x18\x01 \x01(\t\x12\x0c\n\x04json\x18\x02 \x01(\t\"m\n\x11LeaderBeatRequest\x12\x0f\n\x07node_id\x18\x01 \x01(\t\x12\x0f\n\x07peer_id\x18\x02 \x01(\t\x12\x12\n\nuptime_sec\x18\x03 \x01(\x01\x12\x10\n\x08lease_ms\x18\x04 \x01(\r\x12\x10\n\x08head_seq\x18\x05 \x01(\x04\"W\n\rLeaderBeatAck\x12\x0f\n\x07node_id\x18\x01 \x01(\t\x12\x0f\n\x07peer_id\x18\x02 \x01(\t\x12\x10\n\x08\x61\x63\x63\x65pted\x18\x03 \x01(\x08\x12\x12\n\nuptime_sec\x18\x04 \x01(\x01\x32\xea\x01\n\x10HeartbeatService\x12\x36\n\x04Ping\x12\x16.google.protobuf.Empty\x1a\x16.google.protobuf.Empty\x12\x33\n\tGetUptime\x12\x16.google.protobuf.Empty\x1a\x0e.hb.UptimeInfo\x12\x36\n\nLeaderBeat\x12\x15.hb.LeaderBeatRequest\x1a\x11.hb.LeaderBeatAck\x12\x31\n\x08GetStats\x12\x16.google.protobuf.Empty\x1a\r.hb.StatsInfob\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -34,6 +34,12 @@ if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
   _globals['_UPTIMEINFO']._serialized_start=60
   _globals['_UPTIMEINFO']._serialized_end=109
-  _globals['_HEARTBEATSERVICE']._serialized_start=111
-  _globals['_HEARTBEATSERVICE']._serialized_end=238
+  _globals['_STATSINFO']._serialized_start=111
+  _globals['_STATSINFO']._serialized_end=153
+  _globals['_LEADERBEATREQUEST']._serialized_start=155
+  _globals['_LEADERBEATREQUEST']._serialized_end=264
+  _globals['_LEADERBEATACK']._serialized_start=266
+  _globals['_LEADERBEATACK']._serialized_end=353
+  _globals['_HEARTBEATSERVICE']._serialized_start=356
+  _globals['_HEARTBEATSERVICE']._serialized_end=590
 # @@protoc_insertion_point(module_scope)
@@ -6,7 +6,7 @@ import warnings
 from google.protobuf import empty_pb2 as google_dot_protobuf_dot_empty__pb2
 import heartbeat_service_pb2 as heartbeat__service__pb2
 
-GRPC_GENERATED_VERSION = '1.72.1'
+GRPC_GENERATED_VERSION = '1.73.0'
 GRPC_VERSION = grpc.__version__
 _version_not_supported = False
 
@@ -45,6 +45,16 @@ class HeartbeatServiceStub(object):
                 request_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
                 response_deserializer=heartbeat__service__pb2.UptimeInfo.FromString,
                 _registered_method=True)
+        self.LeaderBeat = channel.unary_unary(
+                '/hb.HeartbeatService/LeaderBeat',
+                request_serializer=heartbeat__service__pb2.LeaderBeatRequest.SerializeToString,
+                response_deserializer=heartbeat__service__pb2.LeaderBeatAck.FromString,
+                _registered_method=True)
+        self.GetStats = channel.unary_unary(
+                '/hb.HeartbeatService/GetStats',
+                request_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+                response_deserializer=heartbeat__service__pb2.StatsInfo.FromString,
+                _registered_method=True)
 
 
 class HeartbeatServiceServicer(object):
@@ -64,6 +74,20 @@ class HeartbeatServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def LeaderBeat(self, request, context):
+        """leader -> followers every lease_renew_ms: keeps their lease on it alive
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetStats(self, request, context):
+        """operator view: persistence / registry counters as JSON
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_HeartbeatServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -77,6 +101,16 @@ def add_HeartbeatServiceServicer_to_server(servicer, server):
                     request_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
                     response_serializer=heartbeat__service__pb2.UptimeInfo.SerializeToString,
             ),
+            'LeaderBeat': grpc.unary_unary_rpc_method_handler(
+                    servicer.LeaderBeat,
+                    request_deserializer=heartbeat__service__pb2.LeaderBeatRequest.FromString,
+                    response_serializer=heartbeat__service__pb2.LeaderBeatAck.SerializeToString,
+            ),
+            'GetStats': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetStats,
+                    request_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+                    response_serializer=heartbeat__service__pb2.StatsInfo.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'hb.HeartbeatService', rpc_method_handlers)
@@ -141,3 +175,57 @@ class HeartbeatService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def LeaderBeat(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/hb.HeartbeatService/LeaderBeat',
+            heartbeat__service__pb2.LeaderBeatRequest.SerializeToString,
+            heartbeat__service__pb2.LeaderBeatAck.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetStats(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/hb.HeartbeatService/GetStats',
+            google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+            heartbeat__service__pb2.StatsInfo.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
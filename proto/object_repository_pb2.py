@@ -2,7 +2,7 @@
 # Generated by the protocol buffer compiler.  DO NOT EDIT!
 # NO CHECKED-IN PROTOBUF GENCODE
 # source: object_repository.proto
-# Protobuf Python Version: 6.30.0
+# Protobuf Python Version: 6.31.0
 """Generated protocol buffer code."""
 from google.protobuf import descriptor as _descriptor
 from google.protobuf import descriptor_pool as _descriptor_pool
@@ -12,7 +12,7 @@ from google.protobuf.internal import builder as _builder
 _runtime_version.ValidateProtobufRuntimeVersion(
     _runtime_version.Domain.PUBLIC,
     6,
-    30,
+    31,
     0,
     '',
     'object_repository.proto'
@@ -25,7 +25,7 @@ _sym_db = _symbol_database.Default()
 from google.protobuf import empty_pb2 as google_dot_protobuf_dot_empty__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x17object_repository.proto\x12\nobjectrepo\x1a\x1bgoogle/protobuf/empty.proto\"\x89\x01\n\x0fRegisterRequest\x12\x13\n\x0bobject_name\x18\x01 \x01(\t\x12\x16\n\x0eobject_address\x18\x02 \x01(\t\x12\x10\n\x08language\x18\x03 \x01(\t\x12\x0f\n\x07version\x18\x04 \x01(\t\x12\x0e\n\x06region\x18\x05 \x01(\t\x12\x16\n\x0eis_replication\x18\x06 \x01(\x08\"#\n\x10RegisterResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"@\n\x11\x44\x65registerRequest\x12\x13\n\x0bobject_name\x18\x01 \x01(\t\x12\x16\n\x0eis_replication\x18\x02 \x01(\x08\"%\n\x12\x44\x65registerResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"\x87\x01\n\rUpdateRequest\x12\x13\n\x0bobject_name\x18\x01 \x01(\t\x12\x16\n\x0eobject_address\x18\x02 \x01(\t\x12\x10\n\x08language\x18\x03 \x01(\t\x12\x0f\n\x07version\x18\x04 \x01(\t\x12\x0e\n\x06region\x18\x05 \x01(\t\x12\x16\n\x0eis_replication\x18\x06 \x01(\x08\"!\n\x0eUpdateResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"!\n\nGetRequest\x12\x13\n\x0bobject_name\x18\x01 \x01(\t\"%\n\x0bGetResponse\x12\x16\n\x0eobject_address\x18\x01 \x01(\t\"l\n\nObjectInfo\x12\x13\n\x0bobject_name\x18\x01 \x01(\t\x12\x16\n\x0eobject_address\x18\x02 \x01(\t\x12\x10\n\x08language\x18\x03 \x01(\t\x12\x0f\n\x07version\x18\x04 \x01(\t\x12\x0e\n\x06region\x18\x05 \x01(\t\"=\n\x12ObjectListResponse\x12\'\n\x07objects\x18\x01 \x03(\x0b\x32\x16.objectrepo.ObjectInfo\"$\n\rHeartbeatPing\x12\x13\n\x0bobject_name\x18\x01 \x01(\t\"\x1a\n\x0cHeartbeatAck\x12\n\n\x02ok\x18\x01 \x01(\x08\x32\x85\x04\n\x10ObjectRepository\x12K\n\x0eRegisterObject\x12\x1b.objectrepo.RegisterRequest\x1a\x1c.objectrepo.RegisterResponse\x12Q\n\x10\x44\x65registerObject\x12\x1d.objectrepo.DeregisterRequest\x1a\x1e.objectrepo.DeregisterResponse\x12\x45\n\x0cUpdateObject\x12\x19.objectrepo.UpdateRequest\x1a\x1a.objectrepo.UpdateResponse\x12<\n\tGetObject\x12\x16.objectrepo.GetRequest\x1a\x17.objectrepo.GetResponse\x12\x45\n\x0bListObjects\x12\x16.google.protobuf.Empty\x1a\x1e.objectrepo.ObjectListResponse\x12@\n\tHeartbeat\x12\x19.objectrepo.HeartbeatPing\x1a\x18.objectrepo.HeartbeatAck\x12\x43\n\tSyncState\x12\x1e.objectrepo.ObjectListResponse\x1a\x16.google.protobuf.Emptyb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x17object_repository.proto\x12\nobjectrepo\x1a\x1bgoogle/protobuf/empty.proto\"\x9b\x01\n\x0fRegisterRequest\x12\x13\n\x0bobject_name\x18\x01 \x01(\t\x12\x16\n\x0eobject_address\x18\x02 \x01(\t\x12\x10\n\x08language\x18\x03 \x01(\t\x12\x0f\n\x07version\x18\x04 \x01(\t\x12\x0e\n\x06region\x18\x05 \x01(\t\x12\x16\n\x0eis_replication\x18\x06 \x01(\x08\x12\x10\n\x08lease_id\x18\x07 \x01(\x03\"5\n\x10RegisterResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x10\n\x08revision\x18\x02 \x01(\x04\"@\n\x11\x44\x65registerRequest\x12\x13\n\x0bobject_name\x18\x01 \x01(\t\x12\x16\n\x0eis_replication\x18\x02 \x01(\x08\"7\n\x12\x44\x65registerResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x10\n\x08revision\x18\x02 \x01(\x04\"\x87\x01\n\rUpdateRequest\x12\x13\n\x0bobject_name\x18\x01 \x01(\t\x12\x16\n\x0eobject_address\x18\x02 \x01(\t\x12\x10\n\x08language\x18\x03 \x01(\t\x12\x0f\n\x07version\x18\x04 \x01(\t\x12\x0e\n\x06region\x18\x05 \x01(\t\x12\x16\n\x0eis_replication\x18\x06 \x01(\x08\"!\n\x0eUpdateResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"7\n\nGetRequest\x12\x13\n\x0bobject_name\x18\x01 \x01(\t\x12\x14\n\x0cmin_revision\x18\x02 \x01(\x04\"7\n\x0bGetResponse\x12\x16\n\x0eobject_address\x18\x01 \x01(\t\x12\x10\n\x08revision\x18\x02 \x01(\x04\"\x7f\n\nObjectInfo\x12\x13\n\x0bobject_name\x18\x01 \x01(\t\x12\x16\n\x0eobject_address\x18\x02 \x01(\t\x12\x10\n\x08language\x18\x03 \x01(\t\x12\x0f\n\x07version\x18\x04 \x01(\t\x12\x0e\n\x06region\x18\x05 \x01(\t\x12\x11\n\tlast_seen\x18\x06 \x01(\x01\"O\n\x12ObjectListResponse\x12\'\n\x07objects\x18\x01 \x03(\x0b\x32\x16.objectrepo.ObjectInfo\x12\x10\n\x08revision\x18\x02 \x01(\x04\"$\n\rHeartbeatPing\x12\x13\n\x0bobject_name\x18\x01 \x01(\t\"\x1a\n\x0cHeartbeatAck\x12\n\n\x02ok\x18\x01 \x01(\x08\",\n\nItemResult\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\r\n\x05\x65rror\x18\x02 \x01(\t\"Z\n\x14\x42\x61tchRegisterRequest\x12*\n\x05items\x18\x01 \x03(\x0b\x32\x1b.objectrepo.RegisterRequest\x12\x16\n\x0eis_replication\x18\x02 \x01(\x08\"R\n\x15\x42\x61tchRegisterResponse\x12\'\n\x07results\x18\x01 \x03(\x0b\x32\x16.objectrepo.ItemResult\x12\x10\n\x08revision\x18\x02 \x01(\x04\"E\n\x16\x42\x61tchDeregisterRequest\x12\x13\n\x0bobject_name\x18\x01 \x03(\t\x12\x16\n\x0eis_replication\x18\x02 \x01(\x08\"T\n\x17\x42\x61tchDeregisterResponse\x12\'\n\x07results\x18\x01 \x03(\x0b\x32\x16.objectrepo.ItemResult\x12\x10\n\x08revision\x18\x02 \x01(\x04\"<\n\x0f\x42\x61tchGetRequest\x12\x13\n\x0bobject_name\x18\x01 \x03(\t\x12\x14\n\x0cmin_revision\x18\x02 \x01(\x04\"<\n\x10\x42\x61tchGetResponse\x12\x16\n\x0eobject_address\x18\x01 \x03(\t\x12\x10\n\x08revision\x18\x02 \x01(\x04\",\n\x15\x42\x61tchHeartbeatRequest\x12\x13\n\x0bobject_name\x18\x01 \x03(\t\"$\n\x16\x42\x61tchHeartbeatResponse\x12\n\n\x02ok\x18\x01 \x03(\x08\"$\n\x11LeaseGrantRequest\x12\x0f\n\x07ttl_sec\x18\x01 \x01(\x01\"7\n\x12LeaseGrantResponse\x12\x10\n\x08lease_id\x18\x01 \x01(\x03\x12\x0f\n\x07ttl_sec\x18\x02 \x01(\x01\")\n\x15LeaseKeepAliveRequest\x12\x10\n\x08lease_id\x18\x01 \x01(\x03\"5\n\x16LeaseKeepAliveResponse\x12\n\n\x02ok\x18\x01 \x01(\x08\x12\x0f\n\x07ttl_sec\x18\x02 \x01(\x01\"&\n\x12LeaseRevokeRequest\x12\x10\n\x08lease_id\x18\x01 \x01(\x03\"7\n\x13LeaseRevokeResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07removed\x18\x02 \x01(\x05\"N\n\x0cTouchRequest\x12\x13\n\x0bobject_name\x18\x01 \x03(\t\x12\x11\n\tlast_seen\x18\x02 \x03(\x01\x12\x16\n\x0eis_replication\x18\x03 \x01(\x08\"\"\n\rTouchResponse\x12\x11\n\trefreshed\x18\x01 \x01(\x05\"\"\n\x0cWatchRequest\x12\x12\n\nsubscriber\x18\x01 \x01(\t\"\xa2\x01\n\x0b\x43hangeEvent\x12*\n\x04kind\x18\x01 \x01(\x0e\x32\x1c.objectrepo.ChangeEvent.Kind\x12\x0b\n\x03seq\x18\x02 \x01(\x04\x12&\n\x06object\x18\x03 \x01(\x0b\x32\x16.objectrepo.ObjectInfo\"2\n\x04Kind\x12\x07\n\x03PUT\x10\x00\x12\n\n\x06\x44\x45LETE\x10\x01\x12\t\n\x05RESET\x10\x02\x12\n\n\x06SYNCED\x10\x03\"L\n\x0b\x43hangeBatch\x12\'\n\x06\x65vents\x18\x01 \x03(\x0b\x32\x17.objectrepo.ChangeEvent\x12\x14\n\x0cstaleness_ms\x18\x02 \x01(\x01\"Y\n\tReplBatch\x12\x11\n\tleader_id\x18\x01 \x01(\t\x12\'\n\x06\x65vents\x18\x02 \x03(\x0b\x32\x17.objectrepo.ChangeEvent\x12\x10\n\x08head_seq\x18\x03 \x01(\x04\"1\n\x07ReplAck\x12\x13\n\x0b\x61pplied_seq\x18\x01 \x01(\x04\x12\x11\n\tleader_id\x18\x02 \x01(\t\"7\n\x0fSnapshotRequest\x12\x0f\n\x07node_id\x18\x01 \x01(\t\x12\x13\n\x0b\x63hunk_bytes\x18\x02 \x01(\r\"N\n\rDigestRequest\x12\r\n\x05level\x18\x01 \x01(\r\x12\r\n\x05nodes\x18\x02 \x03(\r\x12\x0f\n\x07\x62uckets\x18\x03 \x01(\r\x12\x0e\n\x06\x66\x61nout\x18\x04 \x01(\r\"!\n\x0e\x44igestResponse\x12\x0f\n\x07\x64igests\x18\x01 \x03(\x06\" \n\rBucketRequest\x12\x0f\n\x07\x62uckets\x18\x01 \x03(\r\"I\n\x0e\x42ucketContents\x12\x0e\n\x06\x62ucket\x18\x01 \x01(\r\x12\'\n\x07objects\x18\x02 \x03(\x0b\x32\x16.objectrepo.ObjectInfo2\xe9\x0b\n\x10ObjectRepository\x12K\n\x0eRegisterObject\x12\x1b.objectrepo.RegisterRequest\x1a\x1c.objectrepo.RegisterResponse\x12Q\n\x10\x44\x65registerObject\x12\x1d.objectrepo.DeregisterRequest\x1a\x1e.objectrepo.DeregisterResponse\x12\x45\n\x0cUpdateObject\x12\x19.objectrepo.UpdateRequest\x1a\x1a.objectrepo.UpdateResponse\x12<\n\tGetObject\x12\x16.objectrepo.GetRequest\x1a\x17.objectrepo.GetResponse\x12\x45\n\x0bListObjects\x12\x16.google.protobuf.Empty\x1a\x1e.objectrepo.ObjectListResponse\x12@\n\tHeartbeat\x12\x19.objectrepo.HeartbeatPing\x1a\x18.objectrepo.HeartbeatAck\x12\x43\n\tSyncState\x12\x1e.objectrepo.ObjectListResponse\x1a\x16.google.protobuf.Empty\x12K\n\nLeaseGrant\x12\x1d.objectrepo.LeaseGrantRequest\x1a\x1e.objectrepo.LeaseGrantResponse\x12W\n\x0eLeaseKeepAlive\x12!.objectrepo.LeaseKeepAliveRequest\x1a\".objectrepo.LeaseKeepAliveResponse\x12N\n\x0bLeaseRevoke\x12\x1e.objectrepo.LeaseRevokeRequest\x1a\x1f.objectrepo.LeaseRevokeResponse\x12\x43\n\x0cTouchObjects\x12\x18.objectrepo.TouchRequest\x1a\x19.objectrepo.TouchResponse\x12\x43\n\x0cWatchChanges\x12\x18.objectrepo.WatchRequest\x1a\x17.objectrepo.ChangeBatch0\x01\x12;\n\tReplicate\x12\x15.objectrepo.ReplBatch\x1a\x13.objectrepo.ReplAck(\x01\x30\x01\x12\x45\n\rFetchSnapshot\x12\x1b.objectrepo.SnapshotRequest\x1a\x15.objectrepo.ReplBatch0\x01\x12\x43\n\nGetDigests\x12\x19.objectrepo.DigestRequest\x1a\x1a.objectrepo.DigestResponse\x12G\n\x0c\x46\x65tchBuckets\x12\x19.objectrepo.BucketRequest\x1a\x1a.objectrepo.BucketContents0\x01\x12T\n\rBatchRegister\x12 .objectrepo.BatchRegisterRequest\x1a!.objectrepo.BatchRegisterResponse\x12Z\n\x0f\x42\x61tchDeregister\x12\".objectrepo.BatchDeregisterRequest\x1a#.objectrepo.BatchDeregisterResponse\x12\x45\n\x08\x42\x61tchGet\x12\x1b.objectrepo.BatchGetRequest\x1a\x1c.objectrepo.BatchGetResponse\x12W\n\x0e\x42\x61tchHeartbeat\x12!.objectrepo.BatchHeartbeatRequest\x1a\".objectrepo.BatchHeartbeatResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -33,29 +33,85 @@ _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'object_repository_pb2', _gl
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
   _globals['_REGISTERREQUEST']._serialized_start=69
-  _globals['_REGISTERREQUEST']._serialized_end=206
-  _globals['_REGISTERRESPONSE']._serialized_start=208
-  _globals['_REGISTERRESPONSE']._serialized_end=243
-  _globals['_DEREGISTERREQUEST']._serialized_start=245
-  _globals['_DEREGISTERREQUEST']._serialized_end=309
-  _globals['_DEREGISTERRESPONSE']._serialized_start=311
-  _globals['_DEREGISTERRESPONSE']._serialized_end=348
-  _globals['_UPDATEREQUEST']._serialized_start=351
-  _globals['_UPDATEREQUEST']._serialized_end=486
-  _globals['_UPDATERESPONSE']._serialized_start=488
-  _globals['_UPDATERESPONSE']._serialized_end=521
-  _globals['_GETREQUEST']._serialized_start=523
-  _globals['_GETREQUEST']._serialized_end=556
-  _globals['_GETRESPONSE']._serialized_start=558
-  _globals['_GETRESPONSE']._serialized_end=595
-  _globals['_OBJECTINFO']._serialized_start=597
-  _globals['_OBJECTINFO']._serialized_end=705
-  _globals['_OBJECTLISTRESPONSE']._serialized_start=707
-  _globals['_OBJECTLISTRESPONSE']._serialized_end=768
-  _globals['_HEARTBEATPING']._serialized_start=770
-  _globals['_HEARTBEATPING']._serialized_end=806
-  _globals['_HEARTBEATACK']._serialized_start=808
-  _globals['_HEARTBEATACK']._serialized_end=834
-  _globals['_OBJECTREPOSITORY']._serialized_start=837
-  _globals['_OBJECTREPOSITORY']._serialized_end=1354
+  _globals['_REGISTERREQUEST']._serialized_end=224
+  _globals['_REGISTERRESPONSE']._serialized_start=226
+  _globals['_REGISTERRESPONSE']._serialized_end=279
+  _globals['_DEREGISTERREQUEST']._serialized_start=281
+  _globals['_DEREGISTERREQUEST']._serialized_end=345
+  _globals['_DEREGISTERRESPONSE']._serialized_start=347
+  _globals['_DEREGISTERRESPONSE']._serialized_end=402
+  _globals['_UPDATEREQUEST']._serialized_start=405
+  _globals['_UPDATEREQUEST']._serialized_end=540
+  _globals['_UPDATERESPONSE']._serialized_start=542
+  _globals['_UPDATERESPONSE']._serialized_end=575
+  _globals['_GETREQUEST']._serialized_start=577
+  _globals['_GETREQUEST']._serialized_end=632
+  _globals['_GETRESPONSE']._serialized_start=634
+  _globals['_GETRESPONSE']._serialized_end=689
+  _globals['_OBJECTINFO']._serialized_start=691
+  _globals['_OBJECTINFO']._serialized_end=818
+  _globals['_OBJECTLISTRESPONSE']._serialized_start=820
+  _globals['_OBJECTLISTRESPONSE']._serialized_end=899
+  _globals['_HEARTBEATPING']._serialized_start=901
+  _globals['_HEARTBEATPING']._serialized_end=937
+  _globals['_HEARTBEATACK']._serialized_start=939
+  _globals['_HEARTBEATACK']._serialized_end=965
+  _globals['_ITEMRESULT']._serialized_start=967
+  _globals['_ITEMRESULT']._serialized_end=1011
+  _globals['_BATCHREGISTERREQUEST']._serialized_start=1013
+  _globals['_BATCHREGISTERREQUEST']._serialized_end=1103
+  _globals['_BATCHREGISTERRESPONSE']._serialized_start=1105
+  _globals['_BATCHREGISTERRESPONSE']._serialized_end=1187
+  _globals['_BATCHDEREGISTERREQUEST']._serialized_start=1189
+  _globals['_BATCHDEREGISTERREQUEST']._serialized_end=1258
+  _globals['_BATCHDEREGISTERRESPONSE']._serialized_start=1260
+  _globals['_BATCHDEREGISTERRESPONSE']._serialized_end=1344
+  _globals['_BATCHGETREQUEST']._serialized_start=1346
+  _globals['_BATCHGETREQUEST']._serialized_end=1406
+  _globals['_BATCHGETRESPONSE']._serialized_start=1408
+  _globals['_BATCHGETRESPONSE']._serialized_end=1468
+  _globals['_BATCHHEARTBEATREQUEST']._serialized_start=1470
+  _globals['_BATCHHEARTBEATREQUEST']._serialized_end=1514
+  _globals['_BATCHHEARTBEATRESPONSE']._serialized_start=1516
+  _globals['_BATCHHEARTBEATRESPONSE']._serialized_end=1552
+  _globals['_LEASEGRANTREQUEST']._serialized_start=1554
+  _globals['_LEASEGRANTREQUEST']._serialized_end=1590
+  _globals['_LEASEGRANTRESPONSE']._serialized_start=1592
+  _globals['_LEASEGRANTRESPONSE']._serialized_end=1647
+  _globals['_LEASEKEEPALIVEREQUEST']._serialized_start=1649
+  _globals['_LEASEKEEPALIVEREQUEST']._serialized_end=1690
+  _globals['_LEASEKEEPALIVERESPONSE']._serialized_start=1692
+  _globals['_LEASEKEEPALIVERESPONSE']._serialized_end=1745
+  _globals['_LEASEREVOKEREQUEST']._serialized_start=1747
+  _globals['_LEASEREVOKEREQUEST']._serialized_end=1785
+  _globals['_LEASEREVOKERESPONSE']._serialized_start=1787
+  _globals['_LEASEREVOKERESPONSE']._serialized_end=1842
+  _globals['_TOUCHREQUEST']._serialized_start=1844
+  _globals['_TOUCHREQUEST']._serialized_end=1922
+  _globals['_TOUCHRESPONSE']._serialized_start=1924
+  _globals['_TOUCHRESPONSE']._serialized_end=1958
+  _globals['_WATCHREQUEST']._serialized_start=1960
+  _globals['_WATCHREQUEST']._serialized_end=1994
+  _globals['_CHANGEEVENT']._serialized_start=1997
+  _globals['_CHANGEEVENT']._serialized_end=2159
+  _globals['_CHANGEEVENT_KIND']._serialized_start=2109
+  _globals['_CHANGEEVENT_KIND']._serialized_end=2159
+  _globals['_CHANGEBATCH']._serialized_start=2161
+  _globals['_CHANGEBATCH']._serialized_end=2237
+  _globals['_REPLBATCH']._serialized_start=2239
+  _globals['_REPLBATCH']._serialized_end=2328
+  _globals['_REPLACK']._serialized_start=2330
+  _globals['_REPLACK']._serialized_end=2379
+  _globals['_SNAPSHOTREQUEST']._serialized_start=2381
+  _globals['_SNAPSHOTREQUEST']._serialized_end=2436
+  _globals['_DIGESTREQUEST']._serialized_start=2438
+  _globals['_DIGESTREQUEST']._serialized_end=2516
+  _globals['_DIGESTRESPONSE']._serialized_start=2518
+  _globals['_DIGESTRESPONSE']._serialized_end=2551
+  _globals['_BUCKETREQUEST']._serialized_start=2553
+  _globals['_BUCKETREQUEST']._serialized_end=2585
+  _globals['_BUCKETCONTENTS']._serialized_start=2587
+  _globals['_BUCKETCONTENTS']._serialized_end=2660
+  _globals['_OBJECTREPOSITORY']._serialized_start=2663
+  _globals['_OBJECTREPOSITORY']._serialized_end=4176
 # @@protoc_insertion_point(module_scope)
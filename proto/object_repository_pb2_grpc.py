@@ -6,7 +6,7 @@ import warnings
 from google.protobuf import empty_pb2 as google_dot_protobuf_dot_empty__pb2
 import object_repository_pb2 as object__repository__pb2
 
-GRPC_GENERATED_VERSION = '1.72.1'
+GRPC_GENERATED_VERSION = '1.73.0'
 GRPC_VERSION = grpc.__version__
 _version_not_supported = False
 
@@ -70,6 +70,71 @@ class ObjectRepositoryStub(object):
                 request_serializer=object__repository__pb2.ObjectListResponse.SerializeToString,
                 response_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
                 _registered_method=True)
+        self.LeaseGrant = channel.unary_unary(
+                '/objectrepo.ObjectRepository/LeaseGrant',
+                request_serializer=object__repository__pb2.LeaseGrantRequest.SerializeToString,
+                response_deserializer=object__repository__pb2.LeaseGrantResponse.FromString,
+                _registered_method=True)
+        self.LeaseKeepAlive = channel.unary_unary(
+                '/objectrepo.ObjectRepository/LeaseKeepAlive',
+                request_serializer=object__repository__pb2.LeaseKeepAliveRequest.SerializeToString,
+                response_deserializer=object__repository__pb2.LeaseKeepAliveResponse.FromString,
+                _registered_method=True)
+        self.LeaseRevoke = channel.unary_unary(
+                '/objectrepo.ObjectRepository/LeaseRevoke',
+                request_serializer=object__repository__pb2.LeaseRevokeRequest.SerializeToString,
+                response_deserializer=object__repository__pb2.LeaseRevokeResponse.FromString,
+                _registered_method=True)
+        self.TouchObjects = channel.unary_unary(
+                '/objectrepo.ObjectRepository/TouchObjects',
+                request_serializer=object__repository__pb2.TouchRequest.SerializeToString,
+                response_deserializer=object__repository__pb2.TouchResponse.FromString,
+                _registered_method=True)
+        self.WatchChanges = channel.unary_stream(
+                '/objectrepo.ObjectRepository/WatchChanges',
+                request_serializer=object__repository__pb2.WatchRequest.SerializeToString,
+                response_deserializer=object__repository__pb2.ChangeBatch.FromString,
+                _registered_method=True)
+        self.Replicate = channel.stream_stream(
+                '/objectrepo.ObjectRepository/Replicate',
+                request_serializer=object__repository__pb2.ReplBatch.SerializeToString,
+                response_deserializer=object__repository__pb2.ReplAck.FromString,
+                _registered_method=True)
+        self.FetchSnapshot = channel.unary_stream(
+                '/objectrepo.ObjectRepository/FetchSnapshot',
+                request_serializer=object__repository__pb2.SnapshotRequest.SerializeToString,
+                response_deserializer=object__repository__pb2.ReplBatch.FromString,
+                _registered_method=True)
+        self.GetDigests = channel.unary_unary(
+                '/objectrepo.ObjectRepository/GetDigests',
+                request_serializer=object__repository__pb2.DigestRequest.SerializeToString,
+                response_deserializer=object__repository__pb2.DigestResponse.FromString,
+                _registered_method=True)
+        self.FetchBuckets = channel.unary_stream(
+                '/objectrepo.ObjectRepository/FetchBuckets',
+                request_serializer=object__repository__pb2.BucketRequest.SerializeToString,
+                response_deserializer=object__repository__pb2.BucketContents.FromString,
+                _registered_method=True)
+        self.BatchRegister = channel.unary_unary(
+                '/objectrepo.ObjectRepository/BatchRegister',
+                request_serializer=object__repository__pb2.BatchRegisterRequest.SerializeToString,
+                response_deserializer=object__repository__pb2.BatchRegisterResponse.FromString,
+                _registered_method=True)
+        self.BatchDeregister = channel.unary_unary(
+                '/objectrepo.ObjectRepository/BatchDeregister',
+                request_serializer=object__repository__pb2.BatchDeregisterRequest.SerializeToString,
+                response_deserializer=object__repository__pb2.BatchDeregisterResponse.FromString,
+                _registered_method=True)
+        self.BatchGet = channel.unary_unary(
+                '/objectrepo.ObjectRepository/BatchGet',
+                request_serializer=object__repository__pb2.BatchGetRequest.SerializeToString,
+                response_deserializer=object__repository__pb2.BatchGetResponse.FromString,
+                _registered_method=True)
+        self.BatchHeartbeat = channel.unary_unary(
+                '/objectrepo.ObjectRepository/BatchHeartbeat',
+                request_serializer=object__repository__pb2.BatchHeartbeatRequest.SerializeToString,
+                response_deserializer=object__repository__pb2.BatchHeartbeatResponse.FromString,
+                _registered_method=True)
 
 
 class ObjectRepositoryServicer(object):
@@ -117,6 +182,84 @@ class ObjectRepositoryServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def LeaseGrant(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def LeaseKeepAlive(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def LeaseRevoke(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def TouchObjects(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def WatchChanges(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Replicate(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def FetchSnapshot(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetDigests(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def FetchBuckets(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def BatchRegister(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def BatchDeregister(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def BatchGet(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def BatchHeartbeat(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_ObjectRepositoryServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -155,6 +298,71 @@ def add_ObjectRepositoryServicer_to_server(servicer, server):
                     request_deserializer=object__repository__pb2.ObjectListResponse.FromString,
                     response_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
             ),
+            'LeaseGrant': grpc.unary_unary_rpc_method_handler(
+                    servicer.LeaseGrant,
+                    request_deserializer=object__repository__pb2.LeaseGrantRequest.FromString,
+                    response_serializer=object__repository__pb2.LeaseGrantResponse.SerializeToString,
+            ),
+            'LeaseKeepAlive': grpc.unary_unary_rpc_method_handler(
+                    servicer.LeaseKeepAlive,
+                    request_deserializer=object__repository__pb2.LeaseKeepAliveRequest.FromString,
+                    response_serializer=object__repository__pb2.LeaseKeepAliveResponse.SerializeToString,
+            ),
+            'LeaseRevoke': grpc.unary_unary_rpc_method_handler(
+                    servicer.LeaseRevoke,
+                    request_deserializer=object__repository__pb2.LeaseRevokeRequest.FromString,
+                    response_serializer=object__repository__pb2.LeaseRevokeResponse.SerializeToString,
+            ),
+            'TouchObjects': grpc.unary_unary_rpc_method_handler(
+                    servicer.TouchObjects,
+                    request_deserializer=object__repository__pb2.TouchRequest.FromString,
+                    response_serializer=object__repository__pb2.TouchResponse.SerializeToString,
+            ),
+            'WatchChanges': grpc.unary_stream_rpc_method_handler(
+                    servicer.WatchChanges,
+                    request_deserializer=object__repository__pb2.WatchRequest.FromString,
+                    response_serializer=object__repository__pb2.ChangeBatch.SerializeToString,
+            ),
+            'Replicate': grpc.stream_stream_rpc_method_handler(
+                    servicer.Replicate,
+                    request_deserializer=object__repository__pb2.ReplBatch.FromString,
+                    response_serializer=object__repository__pb2.ReplAck.SerializeToString,
+            ),
+            'FetchSnapshot': grpc.unary_stream_rpc_method_handler(
+                    servicer.FetchSnapshot,
+                    request_deserializer=object__repository__pb2.SnapshotRequest.FromString,
+                    response_serializer=object__repository__pb2.ReplBatch.SerializeToString,
+            ),
+            'GetDigests': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetDigests,
+                    request_deserializer=object__repository__pb2.DigestRequest.FromString,
+                    response_serializer=object__repository__pb2.DigestResponse.SerializeToString,
+            ),
+            'FetchBuckets': grpc.unary_stream_rpc_method_handler(
+                    servicer.FetchBuckets,
+                    request_deserializer=object__repository__pb2.BucketRequest.FromString,
+                    response_serializer=object__repository__pb2.BucketContents.SerializeToString,
+            ),
+            'BatchRegister': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchRegister,
+                    request_deserializer=object__repository__pb2.BatchRegisterRequest.FromString,
+                    response_serializer=object__repository__pb2.BatchRegisterResponse.SerializeToString,
+            ),
+            'BatchDeregister': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchDeregister,
+                    request_deserializer=object__repository__pb2.BatchDeregisterRequest.FromString,
+                    response_serializer=object__repository__pb2.BatchDeregisterResponse.SerializeToString,
+            ),
+            'BatchGet': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchGet,
+                    request_deserializer=object__repository__pb2.BatchGetRequest.FromString,
+                    response_serializer=object__repository__pb2.BatchGetResponse.SerializeToString,
+            ),
+            'BatchHeartbeat': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchHeartbeat,
+                    request_deserializer=object__repository__pb2.BatchHeartbeatRequest.FromString,
+                    response_serializer=object__repository__pb2.BatchHeartbeatResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'objectrepo.ObjectRepository', rpc_method_handlers)
@@ -354,3 +562,354 @@ class ObjectRepository(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def LeaseGrant(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/objectrepo.ObjectRepository/LeaseGrant',
+            object__repository__pb2.LeaseGrantRequest.SerializeToString,
+            object__repository__pb2.LeaseGrantResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def LeaseKeepAlive(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/objectrepo.ObjectRepository/LeaseKeepAlive',
+            object__repository__pb2.LeaseKeepAliveRequest.SerializeToString,
+            object__repository__pb2.LeaseKeepAliveResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def LeaseRevoke(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/objectrepo.ObjectRepository/LeaseRevoke',
+            object__repository__pb2.LeaseRevokeRequest.SerializeToString,
+            object__repository__pb2.LeaseRevokeResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def TouchObjects(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/objectrepo.ObjectRepository/TouchObjects',
+            object__repository__pb2.TouchRequest.SerializeToString,
+            object__repository__pb2.TouchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def WatchChanges(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/objectrepo.ObjectRepository/WatchChanges',
+            object__repository__pb2.WatchRequest.SerializeToString,
+            object__repository__pb2.ChangeBatch.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Replicate(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/objectrepo.ObjectRepository/Replicate',
+            object__repository__pb2.ReplBatch.SerializeToString,
+            object__repository__pb2.ReplAck.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def FetchSnapshot(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/objectrepo.ObjectRepository/FetchSnapshot',
+            object__repository__pb2.SnapshotRequest.SerializeToString,
+            object__repository__pb2.ReplBatch.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetDigests(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/objectrepo.ObjectRepository/GetDigests',
+            object__repository__pb2.DigestRequest.SerializeToString,
+            object__repository__pb2.DigestResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def FetchBuckets(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/objectrepo.ObjectRepository/FetchBuckets',
+            object__repository__pb2.BucketRequest.SerializeToString,
+            object__repository__pb2.BucketContents.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def BatchRegister(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/objectrepo.ObjectRepository/BatchRegister',
+            object__repository__pb2.BatchRegisterRequest.SerializeToString,
+            object__repository__pb2.BatchRegisterResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def BatchDeregister(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/objectrepo.ObjectRepository/BatchDeregister',
+            object__repository__pb2.BatchDeregisterRequest.SerializeToString,
+            object__repository__pb2.BatchDeregisterResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def BatchGet(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/objectrepo.ObjectRepository/BatchGet',
+            object__repository__pb2.BatchGetRequest.SerializeToString,
+            object__repository__pb2.BatchGetResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def BatchHeartbeat(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/objectrepo.ObjectRepository/BatchHeartbeat',
+            object__repository__pb2.BatchHeartbeatRequest.SerializeToString,
+            object__repository__pb2.BatchHeartbeatResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -0,0 +1,126 @@
+# ==============================================================
+#  admission.py
+#  admission control / load shedding for both gRPC servers
+#
+#  Three gates, cheapest first:
+#    maximum_concurrent_rpcs : handed to grpc.server(); core gRPC answers
+#                              RESOURCE_EXHAUSTED once that many RPCs are
+#                              queued or running
+#    min_deadline_ms         : an RPC whose client deadline has (nearly)
+#                              run out while it sat in the queue is
+#                              dropped before any work is done for it
+#    method_limits           : per-method concurrency caps, so a burst of
+#                              one kind (ListObjects after a failover)
+#                              cannot take every worker
+#  Rejections are RESOURCE_EXHAUSTED with a jittered
+#  "grpc-retry-pushback-ms" trailer telling the client when to retry.
+# ==============================================================
+
+import random, threading
+
+import grpc
+
+PUSHBACK_KEY = "grpc-retry-pushback-ms"
+
+
+class Admission:
+
+    def __init__(self, cfg: dict):
+        self.max_rpcs     = cfg.get("maximum_concurrent_rpcs", 0) or None
+        self.min_deadline = cfg.get("min_deadline_ms", 0) / 1000.0
+        self.pushback_ms  = cfg.get("retry_pushback_ms", 200)
+        self.limits       = dict(cfg.get("method_limits", {}))
+        self._inflight    = {m: 0 for m in self.limits}
+        self._lock        = threading.Lock()
+        self.admitted     = 0
+        self.shed         = dict(deadline=0, method_limit=0)
+
+    # =============== gate ====================================================
+    def enter(self, method, ctx):
+        """-> None if admitted (caller must leave()), else the rejection reason."""
+        rem=ctx.time_remaining()
+        if rem is not None and rem < self.min_deadline:
+            self.shed["deadline"] += 1
+            return f"deadline too close ({rem*1000:.1f} ms left)"
+        limit=self.limits.get(method)
+        if limit is not None:
+            with self._lock:
+                if self._inflight[method] >= limit:
+                    self.shed["method_limit"] += 1
+                    return f"{method} at its limit of {limit} concurrent calls"
+                self._inflight[method] += 1
+        self.admitted += 1
+        return None
+
+    def leave(self, method):
+        if method in self._inflight:
+            with self._lock:
+                self._inflight[method] -= 1
+
+    def pushback(self):
+        """Trailing metadata for a rejection; jittered so retries do not re-align."""
+        ms=int(self.pushback_ms*random.uniform(0.5, 1.5))
+        return ((PUSHBACK_KEY, str(ms)),), ms
+
+    def stats(self) -> dict:
+        return dict(maximum_concurrent_rpcs=self.max_rpcs, admitted=self.admitted,
+                    shed=dict(self.shed), inflight=dict(self._inflight))
+
+
+def _method(details):
+    return details.method.rsplit("/", 1)[-1]
+
+
+# =============== interceptors ================================================
+class AdmissionInterceptor(grpc.ServerInterceptor):
+    """Thread-pool server: gates unary-unary handlers."""
+
+    def __init__(self, adm: Admission):
+        self.adm=adm
+
+    def intercept_service(self, continuation, details):
+        handler=continuation(details)
+        if handler is None or handler.unary_unary is None:
+            return handler
+        adm, method, inner=self.adm, _method(details), handler.unary_unary
+
+        def gated(req, ctx):
+            why=adm.enter(method, ctx)
+            if why is not None:
+                md, ms=adm.pushback()
+                ctx.set_trailing_metadata(md)
+                ctx.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, f"{why}; retry in {ms} ms")
+            try:
+                return inner(req, ctx)
+            finally:
+                adm.leave(method)
+        return grpc.unary_unary_rpc_method_handler(
+            gated, request_deserializer=handler.request_deserializer,
+            response_serializer=handler.response_serializer)
+
+
+class AioAdmissionInterceptor(grpc.aio.ServerInterceptor):
+    """grpc.aio server: same gate, coroutine handlers."""
+
+    def __init__(self, adm: Admission):
+        self.adm=adm
+
+    async def intercept_service(self, continuation, details):
+        handler=await continuation(details)
+        if handler is None or handler.unary_unary is None:
+            return handler
+        adm, method, inner=self.adm, _method(details), handler.unary_unary
+
+        async def gated(req, ctx):
+            why=adm.enter(method, ctx)
+            if why is not None:
+                md, ms=adm.pushback()
+                ctx.set_trailing_metadata(md)
+                await ctx.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, f"{why}; retry in {ms} ms")
+            try:
+                return await inner(req, ctx)
+            finally:
+                adm.leave(method)
+        return grpc.unary_unary_rpc_method_handler(
+            gated, request_deserializer=handler.request_deserializer,
+            response_serializer=handler.response_serializer)
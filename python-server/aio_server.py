@@ -0,0 +1,325 @@
+# ==============================================================
+#  aio_server.py
+#  grpc.aio server mode  (config "server_mode": "aio")
+#
+#  Same registry, same background threads (expiry, election,
+#  checkpoints); only the RPC layer changes.  Handlers are coroutines
+#  on one event loop, so an idle heartbeat or ping costs a task, not
+#  an OS thread:
+#    - reads and the heartbeat fast path never block and run inline
+#    - writes apply in memory under the shard lock, then await their
+#      commit through Store.wait_async (group mode) - no thread parked
+#    - replication fans out concurrently over grpc.aio channels
+#  In "sync" persistence the commit itself is disk I/O, so the local
+#  apply is pushed to a worker thread to keep the loop responsive.
+# ==============================================================
+
+import asyncio, time
+
+import grpc
+import object_repository_pb2       as pb
+import object_repository_pb2_grpc  as pb_grpc
+import heartbeat_service_pb2_grpc  as hb_grpc
+from google.protobuf import empty_pb2
+
+from registry_server_wifi import (ObjectRegistry, HeartbeatServicer, RPC_TIMEOUT,
+                                  PEER_CHANNEL_OPTS, REPL_BATCH)
+from admission import AioAdmissionInterceptor
+from follower  import min_revision
+
+
+class AsyncObjectRegistry(ObjectRegistry):
+    """ObjectRegistry whose RPC handlers are coroutines."""
+
+    def __init__(self, cfg: dict, hb_servicer):
+        super().__init__(cfg, hb_servicer)
+        self.aio_biz = {}              # aio stubs, created on the serving loop
+        self._bg     = set()           # fire-and-forget replication tasks ("async" ack)
+
+    def open_peer_channels(self):
+        """Must run on the event loop that serves the RPCs."""
+        self.aio_biz = {
+            p["id"]: pb_grpc.ObjectRepositoryStub(
+                grpc.aio.insecure_channel(f"{p['host']}:{p['biz_port']}",
+                                          options=PEER_CHANNEL_OPTS))
+            for p in self.peers_cfg
+        }
+
+    async def _local(self, fn, *args):
+        if self.store.mode == "sync":                  # commit is inline disk I/O
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    async def _fanout(self, method, reqs):
+        """Concurrent unary replication, same ack modes and metrics as Replicator."""
+        if self.shipper is not None:
+            return await self.shipper.wait_async(self.feed.seq)
+        rep=self.replicator
+        if not self.aio_biz or not reqs:
+            return True
+
+        ob=rep.outbox
+        batch=REPL_BATCH[method] if len(reqs) > 1 else None
+
+        async def peer_batch(pid, stub):              # the lot as one message
+            if ob is not None and ob.busy(pid):
+                ob.put(pid, method, reqs); return False
+            t0=time.perf_counter()
+            try:
+                await getattr(stub, batch[0])(batch[1](reqs), timeout=RPC_TIMEOUT)
+                rep.record(pid, time.perf_counter()-t0); return True
+            except grpc.RpcError:
+                rep.record(pid, None)
+                if ob is not None: ob.put(pid, method, reqs)
+                return False
+
+        async def peer(pid, stub):
+            ok=True
+            for i, r in enumerate(reqs):
+                if ob is not None and ob.busy(pid):   # never overtake queued writes
+                    ob.put(pid, method, reqs[i:]); return False
+                t0=time.perf_counter()
+                try:
+                    await getattr(stub, method)(r, timeout=RPC_TIMEOUT)
+                    rep.record(pid, time.perf_counter()-t0)
+                except grpc.RpcError:
+                    rep.record(pid, None); ok=False
+                    if ob is not None:
+                        ob.put(pid, method, reqs[i:]); return False
+            return ok
+        t0=time.perf_counter()
+        send=peer_batch if batch else peer
+        tasks=[asyncio.ensure_future(send(pid, stub)) for pid, stub in self.aio_biz.items()]
+        for t in tasks:                                # stragglers outlive this call
+            self._bg.add(t); t.add_done_callback(self._bg.discard)
+        need=rep.needed()
+        if need == 0:
+            return True
+        acked=0
+        for f in asyncio.as_completed(tasks):
+            acked += await f
+            if acked >= need: break
+        rep.ack_wait.add(time.perf_counter()-t0)
+        if acked < need: rep.shortfall += 1
+        return acked >= need
+
+    async def _forward(self, method, req, ctx, empty):
+        pid=self.fwd.target(ctx)
+        if pid is None or pid not in self.aio_biz:
+            return self._reject_if_backup(ctx) or empty
+        return await self.fwd.call_async(self.aio_biz[pid], method, req, ctx, empty)
+
+    # =============== CRUD RPC  (only leader accepts) ========================
+    async def RegisterObject(self, req, ctx):
+        if not self.is_leader and not req.is_replication:
+            return await self._forward("RegisterObject", req, ctx,
+                                       pb.RegisterResponse(success=False))
+
+        t, err=await self._local(self._register_local, req)
+        if err:
+            ctx.set_code(grpc.StatusCode.NOT_FOUND); ctx.set_details(err)
+            return pb.RegisterResponse(success=False)
+        await self.store.wait_async(t)
+        print(f"[REGISTER] {req.object_name}")
+
+        if self.is_leader and not req.is_replication:
+            await self._fanout("RegisterObject", [self._replica(req)])
+        return pb.RegisterResponse(success=True, revision=self.feed.seq)
+
+    async def DeregisterObject(self, req, ctx):
+        if not self.is_leader and not req.is_replication:
+            return await self._forward("DeregisterObject", req, ctx,
+                                       pb.DeregisterResponse(success=False))
+
+        await self.store.wait_async(await self._local(self._deregister_local, req.object_name))
+        print(f"[DEREGISTER] {req.object_name}")
+
+        if self.is_leader and not req.is_replication:
+            await self._fanout("DeregisterObject", [pb.DeregisterRequest(
+                object_name=req.object_name, is_replication=True)])
+        return pb.DeregisterResponse(success=True, revision=self.feed.seq)
+
+    async def UpdateObject(self, req, ctx):
+        await ctx.abort(grpc.StatusCode.UNIMPLEMENTED, "UpdateObject: not supported here")
+
+    async def SyncState(self, req, ctx):
+        if not self.is_leader:
+            return await self._forward("SyncState", req, ctx, empty_pb2.Empty())
+        await asyncio.to_thread(self._sync_local, req)   # lock round + store commit, off the loop
+        print(f"[SYNC] Received {len(req.objects)} objects.")
+        await self._fanout("RegisterObject", [self._synced(o) for o in req.objects])
+        return empty_pb2.Empty()
+
+    # =============== batches ================================================
+    async def BatchRegister(self, req, ctx):
+        if not self.is_leader and not req.is_replication:
+            return await self._forward("BatchRegister", req, ctx, pb.BatchRegisterResponse())
+        t, results=await self._local(self._register_many, req.items, req.is_replication)
+        await self.store.wait_async(t)
+        print(f"[REGISTER] batch of {len(req.items)}")
+        if self.is_leader and not req.is_replication:
+            await self._fanout("RegisterObject", [self._replica(r) for r, res
+                                                  in zip(req.items, results) if res.success])
+        return pb.BatchRegisterResponse(results=results, revision=self.feed.seq)
+
+    async def BatchDeregister(self, req, ctx):
+        if not self.is_leader and not req.is_replication:
+            return await self._forward("BatchDeregister", req, ctx, pb.BatchDeregisterResponse())
+        gone, t=await self._local(self._deregister_many, req.object_name)
+        await self.store.wait_async(t)
+        print(f"[DEREGISTER] batch of {len(req.object_name)}")
+        if self.is_leader and not req.is_replication and gone:
+            await self._fanout("DeregisterObject", [pb.DeregisterRequest(
+                object_name=n, is_replication=True) for n in gone])
+        return pb.BatchDeregisterResponse(results=[pb.ItemResult(success=True)
+                                                   for _ in req.object_name],
+                                          revision=self.feed.seq)
+
+    async def BatchGet(self, req, ctx):
+        if why:=self.follower.check(req.min_revision):
+            return await self._stale_read("BatchGet", req, ctx, pb.BatchGetResponse(), why)
+        return self._batch_get_local(req)
+
+    async def BatchHeartbeat(self, req, ctx):
+        if self.hb_fast:
+            return super().BatchHeartbeat(req, ctx)
+        ok, t=await self._local(self._heartbeat_many, req.object_name)
+        await self.store.wait_async(t)
+        return pb.BatchHeartbeatResponse(ok=ok)
+
+    # =============== shared leases (leader only) ============================
+    async def LeaseGrant(self, req, ctx):
+        return super().LeaseGrant(req, ctx)
+
+    async def LeaseKeepAlive(self, req, ctx):
+        if not self.is_leader or self.hb_fast:
+            return super().LeaseKeepAlive(req, ctx)
+        lease, t=await self._local(self._keepalive_local, req.lease_id)
+        await self.store.wait_async(t)
+        return pb.LeaseKeepAliveResponse(ok=lease is not None,
+                                         ttl_sec=lease.ttl if lease else 0)
+
+    async def LeaseRevoke(self, req, ctx):
+        if not self.is_leader:
+            return self._reject_if_backup(ctx) or pb.LeaseRevokeResponse(success=False)
+        r=await self._local(self._revoke_local, req.lease_id)
+        if r is None:
+            return pb.LeaseRevokeResponse(success=False)
+        gone, t=r
+        await self.store.wait_async(t)
+        print(f"[LEASE] revoke {req.lease_id} -> {len(gone)} objects")
+        await self._fanout("DeregisterObject", [pb.DeregisterRequest(
+            object_name=n, is_replication=True) for n in gone])
+        return pb.LeaseRevokeResponse(success=True, removed=len(gone))
+
+    # =============== reads / liveness =======================================
+    async def _stale_read(self, method, req, ctx, empty, why):
+        pid=self.fwd.target(ctx, writes=False) if self.follower.action == "forward" else None
+        if pid in self.aio_biz:
+            return await self.fwd.call_async(self.aio_biz[pid], method, req, ctx, empty)
+        self.follower.refused += 1
+        ctx.set_code(grpc.StatusCode.UNAVAILABLE); ctx.set_details(f"follower read: {why}")
+        return empty
+
+    async def GetObject(self, req, ctx):
+        if why:=self.follower.check(req.min_revision):
+            return await self._stale_read("GetObject", req, ctx, pb.GetResponse(), why)
+        return self._get_local(req)
+
+    async def ListObjects(self, req, ctx):
+        if why:=self.follower.check(min_revision(req, ctx)):
+            return await self._stale_read("ListObjects", req, ctx, pb.ObjectListResponse(), why)
+        return self._list_local()
+
+    async def TouchObjects(self, req, ctx):
+        return super().TouchObjects(req, ctx)
+
+    async def WatchChanges(self, req, ctx):
+        sub=self.feed.subscribe(req.subscriber or ctx.peer())
+        try:
+            for batch in self._feed_snapshot():
+                yield self._stamped(batch)
+            while not sub.overflowed:
+                evs=await asyncio.to_thread(sub.take, self.watch_keep_s)
+                yield self._stamped(pb.ChangeBatch(events=[self._change_event(*e) for e in evs]))
+        finally:
+            self.feed.unsubscribe(sub)
+
+    async def FetchSnapshot(self, req, ctx):
+        if not self.is_leader:
+            await ctx.abort(grpc.StatusCode.FAILED_PRECONDITION, "not leader")
+        for b in super().FetchSnapshot(req, ctx):     # the loop gets a turn between chunks
+            yield b
+
+    async def GetDigests(self, req, ctx):
+        resp, err=await asyncio.to_thread(self.ae.digests, req)     # may rebuild the tree
+        if err: await ctx.abort(*err)
+        return resp
+
+    async def FetchBuckets(self, req, ctx):
+        for b in await asyncio.to_thread(list, self.ae.bucket_contents(req)):
+            yield b
+
+    async def Heartbeat(self, req, ctx):
+        if self.hb_fast:
+            return super().Heartbeat(req, ctx)
+        ok, t=await self._local(self._heartbeat_put, req.object_name)
+        if not ok:
+            return pb.HeartbeatAck(ok=False)
+        await self.store.wait_async(t)
+        return pb.HeartbeatAck(ok=True)
+
+
+class AsyncHeartbeatServicer(HeartbeatServicer):
+
+    async def Ping(self, req, ctx):
+        if self._registry and self._registry.is_leader:
+            return empty_pb2.Empty()
+        await ctx.abort(grpc.StatusCode.UNAVAILABLE, "not primary")
+
+    async def GetUptime(self, req, ctx):
+        return super().GetUptime(req, ctx)
+
+    async def LeaderBeat(self, req, ctx):
+        return super().LeaderBeat(req, ctx)
+
+    async def GetStats(self, req, ctx):
+        return super().GetStats(req, ctx)
+
+
+# ============================ main =========================================
+async def _serve(cfg):
+    hb_servicer = AsyncHeartbeatServicer()
+    reg         = AsyncObjectRegistry(cfg, hb_servicer)
+    reg.open_peer_channels()
+    gate        = dict(interceptors=[AioAdmissionInterceptor(reg.admission)],
+                       maximum_concurrent_rpcs=reg.admission.max_rpcs)
+
+    workers     = cfg.get("read_workers", 0)
+    if workers:
+        gate["options"]=[("grpc.so_reuseport", 1)]
+
+    biz_srv = grpc.aio.server(**gate)
+    pb_grpc.add_ObjectRepositoryServicer_to_server(reg, biz_srv)
+    biz_srv.add_insecure_port(cfg["self_address"])
+    await biz_srv.start()
+    print("✅ biz @", cfg["self_address"], "(aio)")
+    if workers:
+        from workers import start_read_workers
+        own_srv = grpc.aio.server()
+        pb_grpc.add_ObjectRepositoryServicer_to_server(reg, own_srv)
+        own_srv.add_insecure_port(cfg["owner_address"])
+        await own_srv.start()
+        start_read_workers(cfg)
+
+    hb_srv = grpc.aio.server(**gate)
+    hb_grpc.add_HeartbeatServiceServicer_to_server(hb_servicer, hb_srv)
+    hb_srv.add_insecure_port(cfg["hb_address"])
+    await hb_srv.start()
+    print("✅ hb  @", cfg["hb_address"], "(aio)")
+
+    await biz_srv.wait_for_termination()
+
+
+def serve_aio(cfg: dict):
+    asyncio.run(_serve(cfg))
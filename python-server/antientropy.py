@@ -0,0 +1,200 @@
+# ==============================================================
+#  antientropy.py
+#  Merkle-digest anti-entropy  (config "ae_interval_sec")
+#
+#  The name space is cut into ae_buckets buckets by a stable hash
+#  (crc32 - Python's hash() is salted per process).  A bucket's digest
+#  is the XOR of its objects' 64-bit content hashes; last_seen is left
+#  out, liveness is not replicated state.  The buckets are the leaves
+#  of a tree with ae_fanout children per node.
+#
+#  Every ae_interval_sec a backup walks the leader's tree from the
+#  root, descending only into nodes whose digests differ, and fetches
+#  the leaf buckets that differed the same way in two consecutive
+#  rounds: neither side's digest moved in between, so it is not a change
+#  still in flight that replication is about to deliver.  A clean round is
+#  one small RPC; repair traffic follows divergence, not registry
+#  size.
+# ==============================================================
+
+import hashlib, threading, time, zlib
+
+import grpc
+import object_repository_pb2 as pb
+
+from metrics import RollingStat
+
+
+def bucket_of(name: str, buckets: int) -> int:
+    return zlib.crc32(name.encode()) % buckets
+
+
+def object_digest(n, address, language, version, region) -> int:
+    k=f"{n}\0{address}\0{language}\0{version}\0{region}".encode()
+    return int.from_bytes(hashlib.blake2b(k, digest_size=8).digest(), "little")
+
+
+class MerkleDigests:
+    """
+    The tree over one ShardedMap.  Bucket vectors are kept per shard and
+    only rebuilt for shards whose rev moved; the tree itself is reused
+    for up to max_age seconds so one peer's walk sees one version.
+    """
+
+    def __init__(self, objects, buckets: int = 1024, fanout: int = 16, max_age: float = 1.0):
+        self.objects  = objects
+        self.buckets  = buckets
+        self.fanout   = fanout
+        self.max_age  = max_age
+        self._shard   = [(-1, {})]*len(objects.shards)     # (rev, {bucket: xor})
+        self._tree    = (None, 0.0, None)                   # (revs, built_at, levels)
+        self._lock    = threading.Lock()
+        self.build    = RollingStat()
+
+    def _vector(self, i, sh):
+        rev, vec=self._shard[i]
+        if rev == sh.rev:
+            return vec
+        rev=sh.rev; vec={}; B=self.buckets
+        for n, inf in sh.objects.copy().items():
+            b=bucket_of(n, B)
+            vec[b]=vec.get(b, 0) ^ object_digest(n, inf["address"], inf["language"],
+                                                 inf["version"], inf["region"])
+        self._shard[i]=(rev, vec)
+        return vec
+
+    def levels(self, max_age=None) -> list:
+        """[[root], ..., [leaf digests]]"""
+        age=self.max_age if max_age is None else max_age
+        with self._lock:
+            shards=self.objects.shards; now=time.monotonic()
+            revs, built, levels=self._tree
+            if levels is not None and (revs == tuple(s.rev for s in shards) or now-built < age):
+                return levels
+            t0=time.perf_counter(); revs=tuple(s.rev for s in shards)
+            leaves=[0]*self.buckets
+            for i, sh in enumerate(shards):
+                for b, d in self._vector(i, sh).items(): leaves[b] ^= d
+            levels=[leaves]
+            while len(levels[0]) > 1:
+                kids=levels[0]; F=self.fanout
+                levels.insert(0, [int.from_bytes(hashlib.blake2b(
+                    b"".join(d.to_bytes(8, "little") for d in kids[i:i+F]),
+                    digest_size=8).digest(), "little") for i in range(0, len(kids), F)])
+            self._tree=(revs, now, levels)
+            self.build.add(time.perf_counter()-t0)
+            return levels
+
+    def children(self, level, i, levels):
+        return range(i*self.fanout, min((i+1)*self.fanout, len(levels[level+1])))
+
+
+class AntiEntropy:
+    """Both halves: the digests this node serves and the backup's repair loop."""
+
+    def __init__(self, reg, cfg: dict):
+        self.reg      = reg
+        self.interval = cfg.get("ae_interval_sec", 10)
+        self.tree     = MerkleDigests(reg.objects, cfg.get("ae_buckets", 1024),
+                                      cfg.get("ae_fanout", 16), cfg.get("ae_tree_max_age_sec", 1.0))
+        self.timeout  = cfg.get("ae_timeout_sec", 10)
+        self._suspect = {}                 # bucket -> (mine, theirs) last round
+        # metrics ------------------------------------------------------------
+        self.rounds       = 0
+        self.clean        = 0
+        self.errors       = 0
+        self.divergent    = 0              # buckets differing in the last round
+        self.repaired     = 0              # buckets fetched and fixed
+        self.puts         = 0
+        self.deletes      = 0
+        self.digest_bytes = 0
+        self.repair_bytes = 0
+        self.round_ms     = RollingStat()
+        if self.interval > 0:
+            threading.Thread(target=self._loop, daemon=True, name="anti-entropy").start()
+
+    # =============== serving side ===========================================
+    def digests(self, req):
+        """-> (DigestResponse, None) or (None, (status code, details))."""
+        t=self.tree
+        if (req.buckets, req.fanout) != (t.buckets, t.fanout):
+            return None, (grpc.StatusCode.FAILED_PRECONDITION,
+                          f"tree shape {t.buckets}/{t.fanout}, asked {req.buckets}/{req.fanout}")
+        levels=t.levels()
+        if req.level >= len(levels):
+            return None, (grpc.StatusCode.OUT_OF_RANGE, f"tree has {len(levels)} levels")
+        row=levels[req.level]
+        return pb.DigestResponse(digests=[row[i] for i in req.nodes if i < len(row)]), None
+
+    def bucket_contents(self, req):
+        want=set(req.buckets); B=self.tree.buckets; found={b: [] for b in want}
+        for n, inf in self.reg.objects.items():
+            if (b:=bucket_of(n, B)) in want: found[b].append((n, inf))
+        for b, view in found.items():
+            yield pb.BucketContents(bucket=b, objects=self.reg._build_infos(dict(view)))
+
+    # =============== backup side =============================================
+    def _loop(self):
+        while True:
+            time.sleep(self.interval)
+            reg=self.reg; pid=reg._leader_peer()
+            if reg.is_leader or pid is None or reg._pulling or reg._resync is not None:
+                continue
+            try:
+                self.round(reg.peer_biz[pid])
+            except grpc.RpcError as e:
+                self.errors += 1
+                print(f"[AE] round against {pid} failed ({e.code().name}): {e.details()}")
+
+    def round(self, stub) -> list:
+        """One walk of the leader's tree; -> the buckets repaired."""
+        t0=time.perf_counter(); t=self.tree; mine=t.levels(max_age=0)
+        level=0; want=[0]; diff={}
+        while True:
+            req=pb.DigestRequest(level=level, nodes=want, buckets=t.buckets, fanout=t.fanout)
+            resp=stub.GetDigests(req, timeout=self.timeout)
+            self.digest_bytes += req.ByteSize()+resp.ByteSize()
+            diff={i: (mine[level][i], d) for i, d in zip(want, resp.digests) if mine[level][i] != d}
+            if not diff or level == len(mine)-1:
+                break
+            want=[c for i in diff for c in t.children(level, i, mine)]; level += 1
+        self.rounds += 1; self.divergent=len(diff)
+        fix=[b for b, pair in diff.items() if self._suspect.get(b) == pair]
+        self._suspect={b: pair for b, pair in diff.items() if b not in fix}
+        if fix:
+            self._repair(stub, fix)
+        else:
+            self.clean += not diff
+        self.round_ms.add(time.perf_counter()-t0)
+        return fix
+
+    def _repair(self, stub, buckets):
+        """Make these buckets match the leader's: puts for what differs, deletes for extras."""
+        reg=self.reg; B=self.tree.buckets; want=set(buckets); theirs={}
+        for bc in stub.FetchBuckets(pb.BucketRequest(buckets=buckets), timeout=self.timeout):
+            self.repair_bytes += bc.ByteSize()
+            for o in bc.objects: theirs[o.object_name]=o
+        E=pb.ChangeEvent; evs=[]
+        for n, o in theirs.items():
+            inf=reg.objects.get(n)
+            if inf is None or (inf["address"], inf["language"], inf["version"], inf["region"]) \
+                    != (o.object_address, o.language, o.version, o.region):
+                evs.append(E(kind=E.PUT, object=o))
+        for n, _ in reg.objects.items():
+            if n not in theirs and bucket_of(n, B) in want:
+                evs.append(E(kind=E.DELETE, object=pb.ObjectInfo(object_name=n)))
+        if evs:
+            reg._apply_replica(pb.ReplBatch(events=evs))
+        k=sum(e.kind == E.PUT for e in evs)
+        self.repaired += len(buckets); self.puts += k; self.deletes += len(evs)-k
+        print(f"[AE] repaired {len(buckets)} buckets: {k} puts, {len(evs)-k} deletes")
+
+    # =============== observability ===========================================
+    def stats(self) -> dict:
+        return dict(interval_sec=self.interval, buckets=self.tree.buckets, fanout=self.tree.fanout,
+                    rounds=self.rounds, clean_rounds=self.clean, errors=self.errors,
+                    divergent_buckets=self.divergent, suspect_buckets=len(self._suspect),
+                    repaired_buckets=self.repaired, repaired_puts=self.puts,
+                    repaired_deletes=self.deletes, digest_bytes=self.digest_bytes,
+                    repair_bytes=self.repair_bytes, round_ms=self.round_ms.snapshot(),
+                    tree_build_ms=self.tree.build.snapshot())
@@ -0,0 +1,529 @@
+# ==============================================================
+#  bench_registry.py
+#  micro-benchmarks for ObjectRegistry (in-process unless noted)
+#
+#    python bench_registry.py heartbeat [--threads 8] [--seconds 3]
+#    python bench_registry.py writes    [--persistence sync]
+#    python bench_registry.py coldstart [--sizes 10000,100000,1000000]
+#    python bench_registry.py storage   conformance + throughput per engine
+#    python bench_registry.py reads     read latency under concurrent writes
+#    python bench_registry.py shards    [--shard-counts 1,4,16,64]
+#    python bench_registry.py server    [--inflight 10000]  threaded vs aio
+#    python bench_registry.py workers   [--worker-counts 0,1,2,4]  SO_REUSEPORT lookups
+#    python bench_registry.py replication [--ack all]  unary vs streamed log shipping
+#    python bench_registry.py statetransfer [--sizes ...]  joining backup: MB/s, time to caught up
+#    python bench_registry.py antientropy [--objects 100000]  Merkle repair bytes vs drift
+#    python bench_registry.py batch     [--batch-sizes 1,10,100,1000]  objects/s per batch size
+#    (server .. statetransfer run real servers in subprocesses over loopback)
+#
+#  Behaviour tests live in tests/ (one file per feature, sharing these
+#  helpers):  python -m pytest -q tests
+# ==============================================================
+
+import argparse, asyncio, contextlib, json, multiprocessing, os, random, socket, sys, tempfile, threading, time
+
+import grpc
+import registry_server_wifi   as srv
+import object_repository_pb2  as pb
+import object_repository_pb2_grpc as pb_grpc
+import heartbeat_service_pb2_grpc as hb_grpc
+from snapshot import write_snapshot
+from storage  import MODES, SqliteStore, open_store
+from metrics  import RollingStat
+from google.protobuf import empty_pb2
+
+
+def make_registry(**over):
+    """Stand-alone leader on a throw-away database, peers disabled."""
+    cfg=dict(peers=[], bootstrap_primary=True, ttl_seconds=3600,
+             database=os.path.join(tempfile.mkdtemp(prefix="edcs-bench-"), "bench.db"))
+    cfg.update(over)
+    with quiet():
+        return srv.ObjectRegistry(cfg, srv.HeartbeatServicer())
+
+
+@contextlib.contextmanager
+def quiet():
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def populate(reg, n):
+    with quiet():
+        for i in range(n):
+            reg.RegisterObject(pb.RegisterRequest(
+                object_name=f"svc-{i}", object_address=f"10.0.{i//250}.{i%250}:6000",
+                language="Python", version="1.0", region="EU"), None)
+    reg.store.flush()
+
+
+def hammer(fn, threads, seconds):
+    """Run fn(rng) from `threads` threads for `seconds`; return calls/sec."""
+    stop=threading.Event(); counts=[0]*threads
+
+    def worker(k):
+        rng=random.Random(k); c=0
+        while not stop.is_set():
+            fn(rng); c += 1
+        counts[k]=c
+
+    ts=[threading.Thread(target=worker, args=(k,)) for k in range(threads)]
+    with quiet():
+        t0=time.perf_counter()
+        for t in ts: t.start()
+        time.sleep(seconds); stop.set()
+        for t in ts: t.join()
+    return sum(counts)/(time.perf_counter()-t0)
+
+
+# =============== scenarios ==================================================
+def bench_heartbeat(a):
+    print(f"heartbeat: {a.objects} objects, {a.threads} threads, {a.seconds}s each")
+    for label, over in (("locked row rewrite (before)", dict(heartbeat_fast_path=False)),
+                        ("fast path          (after) ", dict(heartbeat_fast_path=True))):
+        reg=make_registry(persistence=a.persistence, **over); populate(reg, a.objects)
+        names=[f"svc-{i}" for i in range(a.objects)]
+        rate=hammer(lambda rng: reg.Heartbeat(
+            pb.HeartbeatPing(object_name=rng.choice(names)), None), a.threads, a.seconds)
+        print(f"  {label}: {rate:>10,.0f} heartbeats/s")
+
+
+def bench_writes(a):
+    print(f"register: {a.threads} threads, {a.seconds}s each, persistence={a.persistence}")
+    for engine in ("sqlite", "journal"):
+        reg=make_registry(storage=engine, persistence=a.persistence)
+        rate=hammer(lambda rng: reg.RegisterObject(pb.RegisterRequest(
+            object_name=f"svc-{rng.randrange(a.objects)}", object_address="10.0.0.1:6000",
+            language="Python", version="1.0", region="EU"), None), a.threads, a.seconds)
+        reg.store.flush()
+        print(f"  {engine:<8}: {rate:>10,.0f} registers/s   "
+              f"commit p99 {reg.store.stats()['commit_ms'].get('p99')} ms")
+
+
+def bench_coldstart(a):
+    """Time from process state on disk to a constructed, serving registry."""
+    ttl=3600; now=time.time()
+    print(f"cold start: {a.expired:.0%} of rows older than ttl_seconds={ttl}")
+    for n in (int(x) for x in a.sizes.split(",")):
+        rows=[(f"svc-{i}", f"10.0.{i//250%250}.{i%250}:6000", "Python", "1.0", "EU",
+               now-ttl*2 if i < n*a.expired else now) for i in range(n)]
+        base=tempfile.mkdtemp(prefix="edcs-bench-")
+
+        db=os.path.join(base, "cold.db")
+        st=SqliteStore(db); st.load()
+        st.conn.executemany("INSERT INTO objects VALUES (?,?,?,?,?,?)", rows); st.conn.commit()
+        st.conn.close()
+        t0=time.perf_counter()
+        legacy=SqliteStore(db).load()                 # old path: SELECT * + dict per row
+        objs={r[0]: dict(address=r[1], language=r[2], version=r[3], region=r[4],
+                         last_seen=r[5], source="local") for r in legacy}
+        t_legacy=time.perf_counter()-t0; del legacy, objs
+
+        t0=time.perf_counter(); reg=make_registry(database=db, ttl_seconds=ttl)
+        t_sql=time.perf_counter()-t0; live=len(reg.objects); del reg
+
+        jd=os.path.join(base, "cold.journal"); os.makedirs(jd)
+        write_snapshot(os.path.join(jd, "snapshot.dat"), 1, rows)
+        t0=time.perf_counter(); reg=make_registry(storage="journal", journal_dir=jd, ttl_seconds=ttl)
+        t_snap=time.perf_counter()-t0; del reg
+
+        print(f"  {n:>9,} rows ({live:,} live):  sqlite SELECT * {t_legacy*1000:>8.1f} ms"
+              f" | sqlite filtered {t_sql*1000:>8.1f} ms | mmap snapshot {t_snap*1000:>8.1f} ms")
+
+
+# =============== storage engines ============================================
+ENGINES = ("sqlite", "sqlite-wal", "journal", "memory")
+
+
+def _open(engine, base, mode):
+    st=open_store(dict(storage=engine, persistence=mode, group_commit_ms=1,
+                       database=os.path.join(base, "s.db"),
+                       journal_dir=os.path.join(base, "s.journal")))
+    return st, st.load()
+
+
+def _inf(addr, ts):
+    return dict(address=addr, language="Go", version="2", region="US", last_seen=ts)
+
+
+def check_store(engine, mode):
+    """Shared conformance checks; raises AssertionError on the first miss."""
+    base=tempfile.mkdtemp(prefix="edcs-conf-"); now=time.time()
+    st, rows=_open(engine, base, mode)
+    assert rows == [], "fresh store must load empty"
+
+    st.wait(st.put("a", _inf("1:1", now)))
+    st.wait(st.put_many([("b", _inf("2:2", now)), ("c", _inf("3:3", now-100))]))
+    st.wait(st.put("a", _inf("1:9", now)))                       # overwrite
+    st.wait(st.delete("b")); st.wait(st.delete("missing"))       # delete is idempotent
+    st.wait(st.touch([(now+5, "c"), (now+5, "ghost")]))          # touch never creates
+    st.wait(st.touch([(now-500, "a")]))                          # ...nor regresses
+    st.wait(st.apply([("put", "d", _inf("4:4", now)), ("del", "a"),
+                      ("put", "a", _inf("1:10", now)), ("touch", now+7, "d")]))
+    st.flush(); st.checkpoint()
+
+    want={"a": ("a", "1:10", "Go", "2", "US", now),
+          "c": ("c", "3:3",  "Go", "2", "US", now+5),
+          "d": ("d", "4:4",  "Go", "2", "US", now+7)}
+    got={r[0]: tuple(r) for r in st.load()}
+    assert got == want, f"state mismatch: {got}"
+
+    st.close()
+    st, rows=_open(engine, base, mode)
+    got={r[0]: tuple(r) for r in rows}
+    assert got == (want if st.persistent else {}), f"after reopen: {got}"
+    if st.persistent:                       # engines may discard expired rows here
+        got={r[0] for r in st.load(min_last_seen=now+6)}
+        assert got == {"d"}, f"min_last_seen filter: {got}"
+    st.close()
+
+
+def bench_storage(a):
+    for engine in ENGINES:
+        for mode in MODES:
+            try:
+                check_store(engine, mode); ok="conformant"
+            except AssertionError as e:
+                ok=f"FAILED: {e}"
+            st, _=_open(engine, tempfile.mkdtemp(prefix="edcs-bench-"), mode)
+            inf=_inf("10.0.0.1:6000", time.time())
+            single=hammer(lambda rng: st.wait(st.put(f"svc-{rng.randrange(a.objects)}", inf)),
+                          a.threads, a.seconds)
+            batch=[("put", f"svc-{i}", inf) for i in range(1000)]
+            t0=time.perf_counter(); n=0
+            while time.perf_counter()-t0 < a.seconds:
+                st.wait(st.apply(batch)); n += len(batch)
+            st.flush(); rate=n/(time.perf_counter()-t0); st.close()
+            print(f"  {engine:<10} {mode:<5}  {ok:<10}  put {single:>9,.0f}/s"
+                  f"  apply(1000) {rate:>10,.0f} rows/s")
+
+
+def bench_reads(a):
+    print(f"reads: {a.objects} objects, {a.threads} readers + {a.writers} writers, "
+          f"{a.seconds}s each (1 in 50 reads is ListObjects)")
+    for label, lockfree in (("locked reads   (before)", False),
+                            ("snapshot reads (after) ", True)):
+        reg=make_registry(lockfree_reads=lockfree, persistence=a.persistence)
+        populate(reg, a.objects)
+        get_lat=RollingStat(window=200_000); list_lat=RollingStat(window=20_000)
+        stop=threading.Event()
+
+        def writer(k):
+            rng=random.Random(-k-1)
+            while not stop.is_set():
+                reg.RegisterObject(pb.RegisterRequest(
+                    object_name=f"svc-{rng.randrange(a.objects)}",
+                    object_address="10.9.9.9:6000"), None)
+
+        def reader(rng):
+            t0=time.perf_counter()
+            if rng.random() < 0.02:
+                reg.ListObjects(empty_pb2.Empty(), None); list_lat.add(time.perf_counter()-t0)
+            else:
+                reg.GetObject(pb.GetRequest(object_name=f"svc-{rng.randrange(a.objects)}"), None)
+                get_lat.add(time.perf_counter()-t0)
+
+        with quiet():
+            ws=[threading.Thread(target=writer, args=(k,)) for k in range(a.writers)]
+            for w in ws: w.start()
+            hammer(reader, a.threads, a.seconds)
+            stop.set()
+            for w in ws: w.join()
+        g=get_lat.snapshot(); l=list_lat.snapshot()
+        print(f"  {label}: GetObject p50 {g.get('p50')} ms  p99 {g.get('p99')} ms"
+              f" | ListObjects p50 {l.get('p50')} ms  p99 {l.get('p99')} ms")
+
+
+def bench_shards(a):
+    print(f"shards: register / deregister / lookup mix, {a.threads} threads, {a.seconds}s each,"
+          f" persistence={a.persistence}")
+    for n in (int(x) for x in a.shard_counts.split(",")):
+        reg=make_registry(shards=n, persistence=a.persistence); populate(reg, a.objects)
+
+        def op(rng):
+            name=f"svc-{rng.randrange(a.objects)}"
+            if rng.random() < 0.2:
+                reg.RegisterObject(pb.RegisterRequest(object_name=name,
+                                                      object_address="10.1.1.1:6000"), None)
+            else:
+                reg.DeregisterObject(pb.DeregisterRequest(object_name=name), None) \
+                    if rng.random() < 0.05 else \
+                    reg.GetObject(pb.GetRequest(object_name=name), None)
+        rate=hammer(op, a.threads, a.seconds)
+        st=reg.objects.stats()
+        print(f"  {n:>3} shards: {rate:>10,.0f} ops/s   contention {st['contention_ratio']:.2%}"
+              f"   worst shard wait p99 {max(st['wait_ms_p99'])} ms")
+
+
+def _free_port():
+    with socket.socket() as so:
+        so.bind(("127.0.0.1", 0)); return so.getsockname()[1]
+
+
+def _serve_quiet(cfg):
+    with quiet():
+        srv.serve(cfg)
+
+
+async def _populate_rpc(biz, n):
+    async with grpc.aio.insecure_channel(biz) as ch:
+        await asyncio.wait_for(ch.channel_ready(), 30)
+        stub=pb_grpc.ObjectRepositoryStub(ch)
+        for i in range(0, n, 500):
+            await asyncio.gather(*(stub.RegisterObject(pb.RegisterRequest(
+                object_name=f"svc-{j}", object_address="10.0.0.1:6000"))
+                for j in range(i, min(i+500, n))))
+
+
+async def _drive(biz, hb, a, inflight, seed, op):
+    """
+    Keep `inflight` RPCs outstanding for a.seconds.  op: "lookup" (GetObject),
+    "register" (RegisterObject) or "mixed" (heartbeats, every 4th a ping).
+    """
+    own=[("grpc.use_local_subchannel_pool", 1)]       # one TCP connection per channel
+    chans=[grpc.aio.insecure_channel(biz, options=own) for _ in range(a.channels)]
+    hbch =[grpc.aio.insecure_channel(hb,  options=own) for _ in range(a.channels)]
+    biz_stubs=[pb_grpc.ObjectRepositoryStub(c) for c in chans]
+    hb_stubs =[hb_grpc.HeartbeatServiceStub(c) for c in hbch]
+    lat=RollingStat(window=65536); done=[0]; errs=[0]
+    stop=time.perf_counter()+a.seconds
+
+    async def loop(k):
+        rng=random.Random(seed*inflight+k); b=biz_stubs[k % a.channels]; h=hb_stubs[k % a.channels]
+        while time.perf_counter() < stop:
+            t0=time.perf_counter(); name=f"svc-{rng.randrange(a.objects)}"
+            try:
+                if op == "lookup":   await b.GetObject(pb.GetRequest(object_name=name), timeout=30)
+                elif op == "register":
+                    await b.RegisterObject(pb.RegisterRequest(
+                        object_name=name, object_address=f"10.0.0.{k % 250}:6000"), timeout=30)
+                elif k % 4: await b.Heartbeat(pb.HeartbeatPing(object_name=name), timeout=30)
+                else:       await h.Ping(empty_pb2.Empty(), timeout=30)
+                lat.add(time.perf_counter()-t0); done[0] += 1
+            except grpc.RpcError:
+                errs[0] += 1
+    t0=time.perf_counter()
+    await asyncio.gather(*(loop(k) for k in range(inflight)))
+    el=time.perf_counter()-t0
+    for c in chans+hbch: await c.close()
+    return done[0]/el, lat.snapshot(), errs[0]
+
+
+def _client(biz, hb, a, inflight, seed, op, out):
+    out.put(asyncio.run(_drive(biz, hb, a, inflight, seed, op)))
+
+
+def _load_server(cfg, a, op="mixed", warmup=0.0, others=()):
+    """
+    Serve `cfg` (and then `others`) in subprocesses, populate it and drive it
+    from a.clients processes; -> (summary line, its GetStats afterwards).
+    """
+    ctx=multiprocessing.get_context("spawn")
+    biz, hb=cfg["self_address"], cfg["hb_address"]
+    ps=[ctx.Process(target=_serve_quiet, args=(c,)) for c in (cfg, *others)]
+    try:
+        for p in ps: p.start(); time.sleep(0.5)       # first one has the longest uptime
+        asyncio.run(_populate_rpc(biz, a.objects))
+        time.sleep(warmup)
+        out=ctx.Queue()
+        cs=[ctx.Process(target=_client, args=(biz, hb, a, a.inflight//a.clients, k, op, out))
+            for k in range(a.clients)]
+        for c in cs: c.start()
+        res=[out.get() for _ in cs]
+        for c in cs: c.join()
+        time.sleep(0.5)
+        st=_stats(hb)
+    finally:
+        for p in ps: p.kill(); p.join()
+    rate=sum(r[0] for r in res); errs=sum(r[2] for r in res)
+    p50=max(r[1].get("p50", 0) for r in res); p99=max(r[1].get("p99", 0) for r in res)
+    return f"{rate:>9,.0f} rpc/s   p50 {p50:>8} ms   p99 {p99:>8} ms   errors {errs}", st
+
+
+def _server_cfg(**over):
+    cfg=dict(peers=[], bootstrap_primary=True, ttl_seconds=3600,
+             self_address=f"127.0.0.1:{_free_port()}", hb_address=f"127.0.0.1:{_free_port()}",
+             database=os.path.join(tempfile.mkdtemp(prefix="edcs-bench-"), "bench.db"))
+    cfg.update(over)
+    return cfg
+
+
+def bench_server(a):
+    print(f"server: {a.inflight} RPCs in flight from {a.clients} client processes,"
+          f" {a.seconds}s, persistence={a.persistence}")
+    for mode in ("thread", "aio"):
+        cfg=_server_cfg(server_mode=mode, persistence=a.persistence)
+        print(f"  {mode:<6}: {_load_server(cfg, a)[0]}")
+
+
+def bench_workers(a):
+    print(f"workers: GetObject, {a.inflight} in flight from {a.clients} client processes"
+          f" x {a.channels} connections, {a.seconds}s  ({os.cpu_count()} cores)")
+    for n in (int(x) for x in a.worker_counts.split(",")):
+        cfg=_server_cfg(read_workers=n, owner_address=f"127.0.0.1:{_free_port()}",
+                        persistence=a.persistence)
+        print(f"  {n:>2} read workers: {_load_server(cfg, a, op='lookup', warmup=2.0+n)[0]}")
+
+
+def bench_replication(a):
+    print(f"replication: leader + 1 backup, RegisterObject with {a.inflight} in flight,"
+          f" {a.seconds}s, ack={a.ack}, persistence={a.persistence}")
+    for transport in ("unary", "stream"):
+        lead=_server_cfg(persistence=a.persistence, replication_transport=transport,
+                         replication_ack=a.ack)
+        back=_server_cfg(persistence=a.persistence, bootstrap_primary=False)
+        for x, y in ((lead, back), (back, lead)):
+            h, b=y["self_address"].rsplit(":", 1)[1], y["hb_address"].rsplit(":", 1)[1]
+            x["peers"]=[dict(id="peer", host="127.0.0.1", biz_port=int(h), hb_port=int(b))]
+        line, st=_load_server(lead, a, op="register", warmup=2.0, others=(back,))
+        rep=st["replication"]; peer=rep["peers"]["peer"]
+        extra=(f"batch rows avg {peer['batch_rows'].get('avg', 0)}  lag {peer['lag_events']} ev"
+               if transport == "stream" else f"peer rpc p50 {peer['latency_ms'].get('p50', 0)} ms")
+        print(f"  {transport:<6}: {line}   ack wait p99 {rep['ack_wait_ms'].get('p99', 0)} ms   {extra}")
+
+
+def _stats(hb):
+    return json.loads(hb_grpc.HeartbeatServiceStub(grpc.insecure_channel(hb))
+                      .GetStats(empty_pb2.Empty(), timeout=5).json)
+
+
+def bench_statetransfer(a):
+    print(f"statetransfer: leader with N objects, a backup joins while a client keeps"
+          f" registering, persistence={a.persistence}")
+    ctx=multiprocessing.get_context("spawn")
+    for n in (int(x) for x in a.sizes.split(",")):
+        for transport in ("unary", "stream"):
+            lead=_server_cfg(persistence=a.persistence, replication_transport=transport,
+                             replication_ack="async")
+            back=_server_cfg(persistence=a.persistence, replication_transport=transport,
+                             bootstrap_primary=False)
+            for x, y in ((lead, back), (back, lead)):
+                h, b=y["self_address"].rsplit(":", 1)[1], y["hb_address"].rsplit(":", 1)[1]
+                x["peers"]=[dict(id="peer", host="127.0.0.1", biz_port=int(h), hb_port=int(b))]
+            ps=[ctx.Process(target=_serve_quiet, args=(lead,))]
+            try:
+                ps[0].start(); time.sleep(0.5)
+                asyncio.run(_populate_rpc(lead["self_address"], n))
+                ps.append(ctx.Process(target=_serve_quiet, args=(back,))); ps[1].start()
+                stub=pb_grpc.ObjectRepositoryStub(grpc.insecure_channel(lead["self_address"]))
+                stop=time.time()+120; k=0; x={}
+                while time.time() < stop and not x:
+                    stub.RegisterObject(pb.RegisterRequest(object_name=f"live-{k % 100}",
+                                                           object_address=f"10.0.1.{k % 250}:6000"))
+                    k += 1
+                    if k % 50 == 0:
+                        with contextlib.suppress(grpc.RpcError):
+                            x=_stats(back["hb_address"])["replica"]["transfer"]["last"]
+            finally:
+                for p in ps: p.kill(); p.join()
+            if not x:
+                print(f"  {n:>8,} {transport:<6}: no transfer within 120 s"); continue
+            print(f"  {n:>8,} {transport:<6}: {x['bytes']/1e6:>7.2f} MB in {x['chunks']:>4} chunks"
+                  f"   copy {x['copy_ms']:>9} ms  {x['mb_per_s']:>6} MB/s"
+                  f"   caught up {x['caught_up_ms']:>9} ms   ({k} writes meanwhile)")
+
+
+class _Direct:
+    """Stub stand-in that calls another in-process registry's anti-entropy."""
+
+    def __init__(self, ae):
+        self.ae=ae
+
+    def GetDigests(self, req, timeout=None):
+        return self.ae.digests(req)[0]
+
+    def FetchBuckets(self, req, timeout=None):
+        return self.ae.bucket_contents(req)
+
+
+def bench_antientropy(a):
+    print(f"antientropy: {a.objects} objects, digest walk + repair vs number of drifted objects")
+    lead=make_registry(persistence=a.persistence, ae_interval_sec=0)
+    back=make_registry(persistence=a.persistence, ae_interval_sec=0)
+    for reg in (lead, back):                          # same content, no per-write commit wait
+        for i in range(a.objects):
+            reg._register_local(pb.RegisterRequest(object_name=f"svc-{i}",
+                                                   object_address=f"10.0.{i//250}.{i%250}:6000"))
+        reg.store.flush()
+    stub=_Direct(lead.ae); ae=back.ae; rng=random.Random(7)
+    for k in (0, 1, 10, 100, 1000):
+        with quiet():
+            for i in rng.sample(range(a.objects), k):
+                if i % 3: back._register_local(pb.RegisterRequest(object_name=f"svc-{i}",
+                                                                  object_address="drifted"))
+                else:     back._deregister_local(f"svc-{i}")
+            d0, r0=ae.digest_bytes, ae.repair_bytes; t0=time.perf_counter()
+            ae.round(stub); fixed=ae.round(stub)       # suspect, then confirm + repair
+            el=time.perf_counter()-t0
+            ae.round(stub)
+        print(f"  {k:>5} drifted: {ae.digest_bytes-d0:>8,} B digests  {ae.repair_bytes-r0:>9,} B repair"
+              f"   {len(fixed):>4} buckets   {el*1000:>8.1f} ms   clean after: {ae.divergent == 0}")
+
+
+def bench_batch(a):
+    print(f"batch: objects/s vs batch size over loopback, {a.threads} client threads,"
+          f" {a.seconds}s each, {a.objects} names, persistence={a.persistence}"
+          f"  (size 1 = the single-object RPCs)")
+    cfg=_server_cfg(persistence=a.persistence)
+    p=multiprocessing.get_context("spawn").Process(target=_serve_quiet, args=(cfg,))
+    p.start()
+    try:
+        ch=grpc.insecure_channel(cfg["self_address"])
+        grpc.channel_ready_future(ch).result(30); stub=pb_grpc.ObjectRepositoryStub(ch)
+        asyncio.run(_populate_rpc(cfg["self_address"], a.objects))
+        names=[f"svc-{i}" for i in range(a.objects)]
+        reg=lambda n: pb.RegisterRequest(object_name=n, object_address="10.0.0.1:6000",
+                                         language="Python", version="1.0", region="EU")
+        ops={"register" : (lambda ns: stub.RegisterObject(reg(ns[0])),
+                           lambda ns: stub.BatchRegister(pb.BatchRegisterRequest(
+                               items=[reg(n) for n in ns]))),
+             "get"      : (lambda ns: stub.GetObject(pb.GetRequest(object_name=ns[0])),
+                           lambda ns: stub.BatchGet(pb.BatchGetRequest(object_name=ns))),
+             "heartbeat": (lambda ns: stub.Heartbeat(pb.HeartbeatPing(object_name=ns[0])),
+                           lambda ns: stub.BatchHeartbeat(pb.BatchHeartbeatRequest(
+                               object_name=ns)))}
+        for op, (one, many) in ops.items():
+            line=[]
+            for size in (int(x) for x in a.batch_sizes.split(",")):
+                call=one if size == 1 else many
+                rate=hammer(lambda rng: call(rng.sample(names, min(size, len(names)))),
+                            a.threads, a.seconds)
+                line.append(f"{size:>5}: {rate*size:>10,.0f}")
+            print(f"  {op:<9} " + "   ".join(line))
+    finally:
+        p.kill(); p.join()
+
+
+SCENARIOS = {"heartbeat": bench_heartbeat,
+             "writes"   : bench_writes,
+             "coldstart": bench_coldstart,
+             "storage"  : bench_storage,
+             "reads"    : bench_reads,
+             "shards"   : bench_shards,
+             "server"   : bench_server,
+             "workers"  : bench_workers,
+             "replication": bench_replication,
+             "statetransfer": bench_statetransfer,
+             "antientropy": bench_antientropy,
+             "batch"    : bench_batch}
+
+if __name__ == "__main__":
+    ap=argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("scenario", choices=sorted(SCENARIOS))
+    ap.add_argument("--threads",     type=int,   default=8)
+    ap.add_argument("--writers",     type=int,   default=4)
+    ap.add_argument("--seconds",     type=float, default=3.0)
+    ap.add_argument("--objects",     type=int,   default=1000)
+    ap.add_argument("--persistence", default="sync")
+    ap.add_argument("--sizes",       default="10000,100000,1000000")
+    ap.add_argument("--expired",     type=float, default=0.8)
+    ap.add_argument("--shard-counts", default="1,4,16,64")
+    ap.add_argument("--inflight",    type=int,   default=10000)
+    ap.add_argument("--channels",    type=int,   default=8)
+    ap.add_argument("--clients",     type=int,   default=4)
+    ap.add_argument("--worker-counts", default="0,1,2,4")
+    ap.add_argument("--ack",         default="all")
+    ap.add_argument("--batch-sizes", default="1,10,100,1000")
+    args=ap.parse_args()
+    SCENARIOS[args.scenario](args)
+    sys.exit(0)
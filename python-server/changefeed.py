@@ -0,0 +1,80 @@
+# ==============================================================
+#  changefeed.py
+#  in-process fan-out of registry mutations to subscribers
+#
+#  The registry publishes ("put", name, info) / ("del", name, None)
+#  while it still holds the shard lock, so every subscriber sees the
+#  changes to one name in commit order.  Each subscriber has its own
+#  bounded queue; one that falls too far behind is cut off and has to
+#  resubscribe (and resync from a snapshot) instead of growing memory.
+# ==============================================================
+
+import threading
+from collections import deque
+
+
+class Subscriber:
+
+    def __init__(self, name, max_queue):
+        self.name       = name
+        self.max_queue  = max_queue
+        self.overflowed = False
+        self.sent       = 0
+        self._q         = deque()
+        self._cv        = threading.Condition()
+
+    def __len__(self):
+        return len(self._q)
+
+    def _push(self, events):
+        with self._cv:
+            if len(self._q)+len(events) > self.max_queue:
+                self.overflowed=True; self._q.clear()
+            else:
+                self._q.extend(events)
+            self._cv.notify()
+
+    def take(self, timeout: float, limit: int = 1024):
+        """Up to `limit` queued (seq, kind, name, info) events; waits at most `timeout`."""
+        with self._cv:
+            if not self._q and not self.overflowed:
+                self._cv.wait(timeout)
+            q=self._q; out=[q.popleft() for _ in range(min(limit, len(q)))]
+        self.sent += len(out)
+        return out
+
+
+class ChangeFeed:
+
+    def __init__(self, max_queue: int = 100_000):
+        self.max_queue = max_queue
+        self.seq       = 0
+        self._subs     = []
+        self._lock     = threading.Lock()
+
+    def publish(self, events):
+        """events: [(kind, name, info)]; the seq moves even while nobody listens."""
+        if not events:
+            return
+        with self._lock:
+            base=self.seq; self.seq += len(events)
+            if not self._subs:
+                return                            # revisions still count, no fan-out
+            out=[(base+i+1, *e) for i, e in enumerate(events)]
+            for s in self._subs: s._push(out)
+
+    def subscribe(self, name) -> Subscriber:
+        s=Subscriber(name, self.max_queue)
+        with self._lock:
+            self._subs=self._subs+[s]             # copy-on-write: publish() reads lock-free
+        return s
+
+    def unsubscribe(self, s: Subscriber):
+        with self._lock:
+            self._subs=[x for x in self._subs if x is not s]
+
+    def stats(self) -> dict:
+        return dict(seq=self.seq,
+                    subscribers={s.name: dict(queued=len(s), sent=s.sent,
+                                              overflowed=s.overflowed)
+                                 for s in self._subs})
@@ -0,0 +1,196 @@
+# ==============================================================
+#  election.py
+#  uptime polling for the leader election  (config "elect_*")
+#
+#  Every round asks all peers for GetUptime at once (one grpc future
+#  each), so a round costs one RPC_TIMEOUT however many peers are
+#  down, not one per dead peer.
+#
+#  Each peer sits behind a circuit breaker.  After elect_breaker_failures
+#  failed polls in a row it opens: the peer is counted absent without
+#  being asked, for elect_breaker_open_sec at first, doubling (jittered)
+#  up to elect_breaker_open_max_sec.  When that runs out one probe goes
+#  through (half-open); an answer closes the breaker, a failure opens it
+#  again for twice as long.
+#
+#  With lease_ms > 0 nobody polls while a leader is alive.  The leader
+#  pushes a LeaderBeat to every peer each lease_renew_ms (default: half
+#  the lease); a beat gives the follower a lease on that leader for
+#  lease_ms.  Only a follower whose lease lapsed runs a polling round,
+#  and a dead leader is replaced about lease_ms after it was last heard.
+#  Traffic: polling every 2 s costs N*(N-1)/2 RPC/s, beats (N-1)/renew.
+#  At the defaults (900 / 450 ms) that is 2.2*(N-1) RPC/s: fewer from
+#  5 nodes up, up to 2.2x more for 2..4 nodes - the price of sub-second
+#  failover.  lease_renew_ms >= 2000/N breaks even for N nodes.
+#  A leader whose beat is refused by a node that also leads and has
+#  the longer uptime steps down (partition healed, two leaders).
+# ==============================================================
+
+import random, threading, time
+
+import grpc
+import heartbeat_service_pb2 as hb_pb
+from google.protobuf import empty_pb2
+
+from metrics import RollingStat
+
+
+class Breaker:
+
+    def __init__(self, fail_max: int = 3, open_sec: float = 2.0, open_max_sec: float = 30.0):
+        self.fail_max = fail_max
+        self.open_s   = (open_sec, open_max_sec)
+        self.wait     = open_sec           # next open period
+        self.fails    = 0                  # consecutive
+        self.until    = 0.0                # monotonic; 0 = closed
+        # metrics ------------------------------------------------------------
+        self.trips    = 0
+        self.skipped  = 0
+
+    @property
+    def state(self) -> str:
+        if not self.until: return "closed"
+        return "open" if time.monotonic() < self.until else "half_open"
+
+    def allow(self) -> bool:
+        if self.until and time.monotonic() < self.until:
+            self.skipped += 1; return False
+        return True
+
+    def success(self):
+        self.fails=0; self.until=0.0; self.wait=self.open_s[0]
+
+    def failure(self) -> bool:
+        """-> True when this failure opened the breaker."""
+        self.fails += 1
+        if not self.until and self.fails < self.fail_max:
+            return False
+        self.until=time.monotonic()+self.wait*random.uniform(0.8, 1.2)
+        self.wait=min(self.open_s[1], self.wait*2); self.trips += 1
+        return True
+
+
+class UptimePoller:
+    """One election round: GetUptime from every peer whose breaker allows it."""
+
+    def __init__(self, stubs: dict, timeout: float = 1.0, fail_max: int = 3,
+                 open_sec: float = 2.0, open_max_sec: float = 30.0):
+        self.stubs     = stubs
+        self.timeout   = timeout
+        self.breakers  = {pid: Breaker(fail_max, open_sec, open_max_sec) for pid in stubs}
+        # metrics ------------------------------------------------------------
+        self.rounds    = 0
+        self.round_dur = RollingStat()
+        self.rtt       = {pid: RollingStat() for pid in stubs}
+        self.errors    = {pid: 0 for pid in stubs}
+
+    def poll(self) -> dict:
+        """-> {peer id: UptimeInfo} for the peers that answered."""
+        t0=time.perf_counter(); calls={}; done={}
+        for pid, stub in self.stubs.items():
+            if not self.breakers[pid].allow():
+                continue
+            sent=time.perf_counter()
+            f=stub.GetUptime.future(empty_pb2.Empty(), timeout=self.timeout)
+            f.add_done_callback(lambda _, pid=pid: done.__setitem__(pid, time.perf_counter()))
+            calls[pid]=(sent, f)
+        out={}
+        for pid, (sent, f) in calls.items():
+            b=self.breakers[pid]
+            try:
+                out[pid]=f.result()
+            except grpc.RpcError as e:
+                self.errors[pid] += 1
+                if b.failure():
+                    print(f"[ELECT] {pid} unreachable ({e.code().name}), not polled"
+                          f" for ~{b.until-time.monotonic():.1f}s")
+                continue
+            if b.until: print(f"[ELECT] {pid} is back")
+            b.success(); self.rtt[pid].add(done.get(pid, time.perf_counter())-sent)
+        self.rounds += 1; self.round_dur.add(time.perf_counter()-t0)
+        return out
+
+    # =============== observability ===========================================
+    def stats(self) -> dict:
+        return dict(rounds=self.rounds, round_ms=self.round_dur.snapshot(),
+                    peers={pid: dict(breaker=b.state, consecutive_failures=b.fails,
+                                     trips=b.trips, skipped=b.skipped, errors=self.errors[pid],
+                                     rtt_ms=self.rtt[pid].snapshot())
+                           for pid, b in self.breakers.items()})
+
+
+class LeaderLease:
+    """Both ends of the lease: the leader's beats and the follower's expiry."""
+
+    def __init__(self, stubs: dict, node_id: str, peer_id: str,
+                 lease_ms: float = 900, renew_ms: float = 450):
+        self.stubs     = stubs
+        self.node_id   = node_id
+        self.peer_id   = peer_id
+        self.lease_ms  = int(lease_ms)
+        self.lease_s   = lease_ms / 1000.0
+        self.renew_s   = renew_ms / 1000.0
+        self.enabled   = lease_ms > 0
+        self.holder    = None              # leader the lease is on
+        self.until     = 0.0               # monotonic
+        self.heard     = 0.0               # monotonic, last beat from holder
+        self._lapsed   = None              # `heard` when the lease ran out
+        self._lock     = threading.Lock()
+        # metrics ------------------------------------------------------------
+        self.sent      = 0
+        self.send_errs = 0
+        self.received  = 0
+        self.refused   = 0                 # beats this node refused
+        self.lapses    = 0
+        self.beat_rtt  = RollingStat()
+        self.failover  = RollingStat()     # leader last heard -> next leader known
+
+    def valid(self) -> bool:
+        return time.monotonic() < self.until
+
+    # =============== leader side ============================================
+    def push(self, uptime, head_seq, on_ack):
+        """Fire one beat at every peer; acks come back on gRPC threads."""
+        req=hb_pb.LeaderBeatRequest(node_id=self.node_id, peer_id=self.peer_id,
+                                    uptime_sec=uptime, lease_ms=self.lease_ms, head_seq=head_seq)
+        for pid, stub in self.stubs.items():
+            sent=time.perf_counter()
+            f=stub.LeaderBeat.future(req, timeout=self.lease_s)
+            f.add_done_callback(lambda f, pid=pid, sent=sent: self._acked(pid, sent, f, on_ack))
+            self.sent += 1
+
+    def _acked(self, pid, sent, f, on_ack):
+        try:
+            ack=f.result()
+        except grpc.RpcError:
+            self.send_errs += 1; return
+        self.beat_rtt.add(time.perf_counter()-sent)
+        on_ack(pid, ack)
+
+    # =============== follower side ==========================================
+    def grant(self, leader, lease_s=None, beat=True):
+        """A beat from `leader` (or an election that picked it) renews the lease."""
+        now=time.monotonic()
+        with self._lock:
+            if self._lapsed is not None:
+                self.failover.add(now-self._lapsed); self._lapsed=None
+            self.holder=leader; self.until=now+(lease_s or self.lease_s); self.heard=now
+            self.received += beat
+
+    def lapse(self):
+        """Called once the lease ran out; failover is timed from the last beat."""
+        with self._lock:
+            if self._lapsed is None and self.holder is not None:
+                self.lapses += 1; self._lapsed=self.heard or time.monotonic()
+                print(f"[LEASE] lease on {self.holder} lapsed"
+                      f" ({(time.monotonic()-self._lapsed)*1000:.0f} ms since last beat)")
+
+    # =============== observability ===========================================
+    def stats(self) -> dict:
+        left=self.until-time.monotonic()
+        return dict(enabled=self.enabled, lease_ms=self.lease_ms,
+                    renew_ms=round(self.renew_s*1000), holder=self.holder,
+                    remaining_ms=round(max(0.0, left)*1000, 3), beats_sent=self.sent,
+                    send_errors=self.send_errs, beats_received=self.received,
+                    refused=self.refused, lapses=self.lapses,
+                    beat_rtt_ms=self.beat_rtt.snapshot(), failover_ms=self.failover.snapshot())
@@ -0,0 +1,54 @@
+# ==============================================================
+#  expiry.py
+#  deadline scheduler for TTL expiry  (lazy-deletion min-heap)
+#
+#  Refreshing an object (heartbeat) never touches the heap: when an
+#  entry reaches the top it is re-checked against the object's live
+#  deadline and either reported as expired or re-armed.  A tick
+#  therefore costs O((expiring + re-armed) * log N), not O(N).
+# ==============================================================
+
+import heapq, threading
+
+
+class ExpiryQueue:
+
+    def __init__(self):
+        self._heap  = []          # (deadline, name)
+        self._armed = {}          # name -> deadline of its live heap entry
+        self._lock  = threading.Lock()
+
+    def __len__(self):
+        return len(self._armed)
+
+    def arm(self, name, deadline):
+        """Make sure `name` is looked at no later than `deadline`."""
+        with self._lock:
+            self._arm(name, deadline)
+
+    def _arm(self, name, deadline):
+        cur=self._armed.get(name)
+        if cur is None or deadline < cur:
+            self._armed[name]=deadline
+            heapq.heappush(self._heap, (deadline, name))
+
+    def due(self, now, deadline_of):
+        """
+        Pop everything whose heap deadline has passed.  deadline_of(name)
+        returns the live deadline, or None if the object is gone / exempt.
+        Returns the names that really expired; refreshed ones are re-armed.
+        """
+        out=[]
+        with self._lock:
+            h=self._heap
+            while h and h[0][0] <= now:
+                d, n=heapq.heappop(h)
+                if self._armed.get(n) != d:        # superseded by an earlier arm()
+                    continue
+                del self._armed[n]
+                live=deadline_of(n)
+                if live is None:
+                    continue
+                if live <= now: out.append(n)
+                else:           self._arm(n, live)
+        return out
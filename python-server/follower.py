@@ -0,0 +1,122 @@
+# ==============================================================
+#  follower.py
+#  follower reads with bounded staleness  (config "follower_*")
+#
+#  GetObject / ListObjects are answered by backups too.  A revision is
+#  the leader's change-feed seq: writes return it (RegisterResponse /
+#  DeregisterResponse .revision), reads return the revision they saw,
+#  and a read may ask for at least one (GetRequest.min_revision, or
+#  x-min-revision metadata on ListObjects) to read its own writes.
+#
+#  The leader's lease beats carry its head seq, so a backup knows what
+#  the leader had at each beat.  It is fresh as of the last beat whose
+#  head it has applied; staleness is the time since then.  A read a
+#  backup cannot serve within follower_max_staleness_ms (or below the
+#  asked revision) is forwarded to the leader ("forward") or refused
+#  with UNAVAILABLE ("reject").  The leader serves everything.
+#
+#  applied seq is only known with the stream transport; under "unary"
+#  a backup counts as never fresh and bounded reads go to the leader.
+#  A new leader starts its own seq, so tokens from before a failover
+#  just send reads to the leader.
+# ==============================================================
+
+import threading, time
+from collections import deque
+
+from metrics import RollingStat
+
+MIN_REVISION = "x-min-revision"
+
+
+def min_revision(req, ctx) -> int:
+    """GetRequest carries the token; ListObjects (Empty) gets it as metadata."""
+    rev=getattr(req, "min_revision", 0)
+    if rev or ctx is None:                 # in-process callers (bench) pass no context
+        return rev
+    for k, v in ctx.invocation_metadata() or ():
+        if k == MIN_REVISION:
+            try: return int(v)
+            except ValueError: return 0
+    return 0
+
+
+class FollowerReads:
+
+    def __init__(self, reg, max_staleness_ms: float = 1000, action: str = "forward"):
+        if action not in ("forward", "reject"):
+            raise ValueError(f"unknown follower_stale_action {action!r} (want forward | reject)")
+        self.reg       = reg
+        self.bound     = max_staleness_ms / 1000.0     # 0 = serve whatever we have
+        self.action    = action
+        self._heads    = deque(maxlen=512)             # (leader head seq, monotonic when known)
+        self._leader   = None
+        self._lock     = threading.Lock()
+        # metrics ------------------------------------------------------------
+        self.served    = 0                  # answered here as a backup
+        self.too_stale = 0
+        self.too_old   = 0                  # below the asked revision
+        self.refused   = 0
+        self.stale_at  = RollingStat()      # staleness of the reads served here
+
+    def note_head(self, leader, head):
+        """The leader had `head` just now (lease beat)."""
+        now=time.monotonic()
+        with self._lock:
+            if leader != self._leader:
+                self._heads.clear(); self._leader=leader
+            if self._heads and self._heads[-1][0] == head:
+                self._heads[-1]=(head, now)
+            elif not self._heads or self._heads[-1][0] < head:
+                self._heads.append((head, now))
+            else:                                      # seq went back: leader restarted
+                self._heads.clear(); self._heads.append((head, now))
+
+    def revision(self) -> int:
+        reg=self.reg
+        if reg.is_leader:
+            return reg.feed.seq
+        if reg.shipper is None:                        # unary: no seq reaches backups
+            return 0
+        return reg.repl_applied if reg.repl_leader == reg.leader_id else 0
+
+    def staleness(self) -> float:
+        """Seconds since the leader last had nothing this node lacks (inf: unknown)."""
+        reg=self.reg
+        if reg.is_leader:
+            return 0.0
+        if reg.shipper is None:
+            return float("inf")
+        applied=self.revision()
+        with self._lock:
+            if self._leader != reg.leader_id:
+                return float("inf")
+            h=self._heads
+            while len(h) > 1 and h[1][0] <= applied: h.popleft()
+            if h and h[0][0] <= applied:
+                return time.monotonic()-h[0][1]
+        return float("inf")
+
+    def check(self, want_rev):
+        """-> None to serve locally, else why not."""
+        if self.reg.is_leader:
+            return None
+        if want_rev and self.revision() < want_rev:
+            self.too_old += 1; return f"revision {self.revision()} < {want_rev}"
+        if self.bound:
+            s=self.staleness()
+            if s > self.bound:
+                self.too_stale += 1
+                return "staleness unknown" if s == float("inf") else f"{s*1000:.0f} ms stale"
+            self.stale_at.add(s)
+        self.served += 1
+        return None
+
+    # =============== observability ===========================================
+    def stats(self) -> dict:
+        s=self.staleness()
+        return dict(max_staleness_ms=round(self.bound*1000), action=self.action,
+                    revision=self.revision(),
+                    staleness_ms=None if s == float("inf") else round(s*1000, 3),
+                    served=self.served, too_stale=self.too_stale, below_revision=self.too_old,
+                    refused=self.refused, served_staleness_ms=self.stale_at.snapshot())
@@ -0,0 +1,89 @@
+# ==============================================================
+#  forwarding.py
+#  backups proxy client writes to the leader  (config "forward_writes")
+#
+#  A backup used to answer RegisterObject / DeregisterObject with
+#  FAILED_PRECONDITION "not leader" and clients walked the node list
+#  until one took it.  Now the backup resends the request on its
+#  existing channel to the leader (peer_biz / aio_biz, one per peer,
+#  multiplexed) and relays the answer, so any node costs the client one
+#  round trip.  The client's deadline is passed through, capped at
+#  forward_timeout_sec.
+#
+#  A forwarded call carries FORWARDED metadata; a node that gets one
+#  while not leading (leadership moved in between) rejects it rather
+#  than forwarding again, so a request is never bounced around.  With
+#  no leader known yet the old rejection stands.
+# ==============================================================
+
+import time
+
+import grpc
+
+from metrics import RollingStat
+
+FORWARDED = ("x-edcs-forwarded", "1")
+
+
+def forwarded(ctx) -> bool:
+    return FORWARDED in tuple(ctx.invocation_metadata() or ())
+
+
+class WriteForwarder:
+
+    def __init__(self, reg, enabled: bool = True, timeout: float = 5.0):
+        self.reg      = reg
+        self.enabled  = enabled
+        self.timeout  = timeout
+        # metrics ------------------------------------------------------------
+        self.count    = {}                 # method -> forwarded
+        self.errors   = 0                  # leader unreachable / failed
+        self.no_leader= 0                  # rejected, no leader to send to
+        self.rtt      = RollingStat()      # ms for the relayed call, leader work included
+
+    def target(self, ctx, writes=True):
+        """-> leader's peer id, or None when this request must be rejected."""
+        if (writes and not self.enabled) or forwarded(ctx):
+            return None
+        pid=self.reg._leader_peer()
+        if pid is None: self.no_leader += 1
+        return pid
+
+    def _timeout(self, ctx):
+        rem=ctx.time_remaining()
+        return self.timeout if rem is None else min(rem, self.timeout)
+
+    def _failed(self, ctx, e, empty):
+        self.errors += 1
+        ctx.set_code(e.code()); ctx.set_details(f"forwarded to leader: {e.details()}")
+        return empty
+
+    def call(self, pid, method, req, ctx, empty):
+        t0=time.perf_counter()
+        try:
+            resp=getattr(self.reg.peer_biz[pid], method)(req, timeout=self._timeout(ctx),
+                                                         metadata=(FORWARDED,))
+        except grpc.RpcError as e:
+            return self._failed(ctx, e, empty)
+        self._done(method, t0)
+        return resp
+
+    async def call_async(self, stub, method, req, ctx, empty):
+        t0=time.perf_counter()
+        try:
+            resp=await getattr(stub, method)(req, timeout=self._timeout(ctx),
+                                             metadata=(FORWARDED,))
+        except grpc.RpcError as e:
+            return self._failed(ctx, e, empty)
+        self._done(method, t0)
+        return resp
+
+    def _done(self, method, t0):
+        self.rtt.add(time.perf_counter()-t0)
+        self.count[method]=self.count.get(method, 0)+1
+
+    # =============== observability ===========================================
+    def stats(self) -> dict:
+        return dict(enabled=self.enabled, forwarded=dict(self.count),
+                    total=sum(self.count.values()), errors=self.errors,
+                    no_leader=self.no_leader, leader_rtt_ms=self.rtt.snapshot())
@@ -0,0 +1,286 @@
+# ==============================================================
+#  journal.py
+#  append-only storage engine for ObjectRegistry
+#
+#  <dir>/journal-<gen>.log   framed records, appended + fsync'd
+#  <dir>/snapshot.dat        compacted state covering gens < its own
+#                            (EDCSSNP2, see snapshot.py; an older EDCSSNP1
+#                            file - magic <u32 gen> then PUT records - is
+#                            read once and rewritten as EDCSSNP2)
+#
+#  record  = <u32 len><u32 crc32> body
+#  body    = <u8 op> payload
+#    PUT   : name address language version region (<u16 len>utf8 each) <f64 last_seen>
+#    DEL   : name
+#    TOUCH : <u32 n> n x (name <f64 last_seen>)     heartbeat batch
+#
+#  Recovery = snapshot load + replay of every newer journal gen; a torn
+#  tail record (short read / bad crc) ends replay and is cut off.
+# ==============================================================
+
+import os, struct, threading, time, zlib
+
+from storage import Store
+from snapshot import SnapshotReader, write_snapshot
+
+OP_PUT, OP_DEL, OP_TOUCH = 1, 2, 3
+SNAP_V1 = b"EDCSSNP1"
+
+_HDR  = struct.Struct("<II")
+_U16  = struct.Struct("<H")
+_U32  = struct.Struct("<I")
+_F64  = struct.Struct("<d")
+
+
+# =============== record codec ===============================================
+def _s(buf, v):
+    b=v.encode(); buf += _U16.pack(len(b)); buf += b
+
+
+def _enc_put(row):
+    buf=bytearray([OP_PUT])
+    for v in row[:5]: _s(buf, v)
+    buf += _F64.pack(row[5]); return buf
+
+
+def _enc_del(name):
+    buf=bytearray([OP_DEL]); _s(buf, name); return buf
+
+
+def _enc_touch(rows):
+    buf=bytearray([OP_TOUCH]); buf += _U32.pack(len(rows))
+    for ts, n in rows:
+        _s(buf, n); buf += _F64.pack(ts)
+    return buf
+
+
+def _frame(body):
+    return _HDR.pack(len(body), zlib.crc32(body)) + body
+
+
+def _decode(body):
+    """-> (op, payload) ; PUT->row, DEL->name, TOUCH->[(ts,name)]"""
+    mv=memoryview(body); op=mv[0]; pos=1
+
+    def s():
+        nonlocal pos
+        (ln,)=_U16.unpack_from(mv, pos); pos += 2
+        v=str(mv[pos:pos+ln], "utf-8"); pos += ln; return v
+
+    def f():
+        nonlocal pos
+        (v,)=_F64.unpack_from(mv, pos); pos += 8; return v
+
+    if op == OP_PUT:
+        return op, (s(), s(), s(), s(), s(), f())
+    if op == OP_DEL:
+        return op, s()
+    (n,)=_U32.unpack_from(mv, pos); pos += 4
+    out=[]
+    for _ in range(n):
+        name=s(); out.append((f(), name))
+    return op, out
+
+
+def _read_records(path):
+    """Yield (op, payload) and finally the offset of the last good record."""
+    with open(path, "rb") as fh:
+        data=fh.read()
+    pos=0
+    while pos+_HDR.size <= len(data):
+        ln, crc=_HDR.unpack_from(data, pos)
+        body=data[pos+_HDR.size:pos+_HDR.size+ln]
+        if len(body) < ln or zlib.crc32(body) != crc:
+            break
+        yield _decode(body)
+        pos += _HDR.size+ln
+    yield pos
+
+
+def _read_snapshot_v1(path):
+    """Snapshot as written before EDCSSNP2: magic, <u32 gen>, framed PUT records."""
+    with open(path, "rb") as fh:
+        data=fh.read()
+    (gen,)=_U32.unpack_from(data, len(SNAP_V1))
+    state={}; pos=len(SNAP_V1)+_U32.size
+    while pos < len(data):
+        ln, crc=_HDR.unpack_from(data, pos)
+        body=data[pos+_HDR.size:pos+_HDR.size+ln]
+        if len(body) < ln or zlib.crc32(body) != crc:
+            raise ValueError(f"{path}: corrupt record at byte {pos}")
+        _apply_record(state, *_decode(body)); pos += _HDR.size+ln
+    return state, gen
+
+
+def _apply_record(state, op, payload):
+    if op == OP_PUT:
+        state[payload[0]]=payload
+    elif op == OP_DEL:
+        state.pop(payload, None)
+    else:
+        for ts, n in payload:
+            row=state.get(n)
+            if row is not None and ts > row[5]:
+                state[n]=row[:5]+(ts,)
+
+
+# ==========================================================================
+
+
+class JournalStore(Store):
+    """
+    Sequential appends instead of B-tree updates.  A mirror of the current
+    rows is kept so compaction can snapshot without asking the registry;
+    compaction runs on its own thread and only holds the write lock long
+    enough to copy the mirror and roll over to a new journal generation.
+    """
+
+    engine = "journal"
+
+    def __init__(self, path: str, compact_bytes: int = 64 << 20,
+                 fsync: bool = True, **opts):
+        os.makedirs(path, exist_ok=True)
+        self.dir           = path
+        self.compact_bytes = compact_bytes
+        self.fsync         = fsync
+        self._mirror       = {}
+        self._gen          = 0
+        self._fh           = None
+        self._seg_bytes    = 0
+        self._compacting   = threading.Lock()
+        self.compactions   = 0
+        self.last_compact_ms = None
+        super().__init__(**opts)
+
+    # =============== files ===================================================
+    def _seg(self, gen):
+        return os.path.join(self.dir, f"journal-{gen:08d}.log")
+
+    def _gens(self):
+        return sorted(int(f[8:16]) for f in os.listdir(self.dir)
+                      if f.startswith("journal-") and f.endswith(".log"))
+
+    def _sync(self, fh):
+        fh.flush()
+        if self.fsync: os.fsync(fh.fileno())
+
+    # =============== recovery ================================================
+    def load(self, min_last_seen=None):
+        with self._wlock:
+            snap, snap_gen = self._open_snapshot()
+            gens=[g for g in self._gens() if g >= snap_gen]
+            tail=[]
+            for g in gens:
+                *recs, good=_read_records(self._seg(g))
+                tail.append(recs)
+                if good < os.path.getsize(self._seg(g)):
+                    print(f"⚠ journal gen {g}: torn tail cut at byte {good}")
+                    with open(self._seg(g), "r+b") as fh: fh.truncate(good)
+            # a TOUCH in the tail can revive a snapshot row that looks expired:
+            # those names are decoded whatever their snapshot last_seen
+            touched={n for recs in tail for op, p in recs if op == OP_TOUCH for _, n in p}
+            state=self._snapshot_rows(snap, min_last_seen, touched)
+            for recs in tail:
+                for op, payload in recs:
+                    _apply_record(state, op, payload)
+            if min_last_seen is not None:          # expiry is judged on the final state
+                state={n: r for n, r in state.items() if r[5] >= min_last_seen}
+            self._mirror=state
+            self._gen=max(gens[-1] if gens else 0, snap_gen)
+            self._fh=open(self._seg(self._gen), "ab")
+            self._seg_bytes=self._fh.tell()
+            return list(state.values())
+
+    def _open_snapshot(self):
+        """-> (SnapshotReader | dict of rows | None, gen)"""
+        p=os.path.join(self.dir, "snapshot.dat")
+        if not os.path.exists(p):
+            return None, 0
+        with open(p, "rb") as fh:
+            v1=fh.read(len(SNAP_V1)) == SNAP_V1
+        if v1:
+            state, gen = _read_snapshot_v1(p)
+            write_snapshot(p, gen, state.values())
+            print(f"✅ {p}: converted {len(state)} rows from EDCSSNP1")
+            return state, gen
+        snap=SnapshotReader(p)
+        return snap, snap.gen
+
+    @staticmethod
+    def _snapshot_rows(snap, min_last_seen, keep):
+        if snap is None:
+            return {}
+        if isinstance(snap, dict):
+            return snap
+        try:
+            return {r[0]: r for r in snap.rows(min_last_seen, keep)}
+        finally:
+            snap.close()
+
+    # =============== append path =============================================
+    def _write(self, ops):
+        if self._fh is None:
+            raise RuntimeError("JournalStore.load() must run before writes")
+        out=bytearray(); touches=[]
+        for op, args in ops:
+            if op == "touch":
+                touches.append(args); continue
+            if touches:                               # keep record order
+                out += self._emit_touch(touches); touches=[]
+            if op == "put":
+                self._mirror[args[0]]=args; out += _frame(_enc_put(args))
+            else:
+                self._mirror.pop(args[0], None); out += _frame(_enc_del(args[0]))
+        if touches:
+            out += self._emit_touch(touches)
+        self._fh.write(out); self._sync(self._fh)
+        self._seg_bytes += len(out)
+        if self._seg_bytes >= self.compact_bytes and not self._compacting.locked():
+            threading.Thread(target=self.compact, daemon=True).start()
+
+    def _emit_touch(self, rows):
+        live=[]
+        for ts, n in rows:
+            row=self._mirror.get(n)
+            if row is not None:
+                if ts > row[5]: self._mirror[n]=row[:5]+(ts,)
+                live.append((ts, n))
+        return _frame(_enc_touch(live)) if live else b""
+
+    # =============== compaction ==============================================
+    def checkpoint(self):
+        if self._seg_bytes >= self.compact_bytes // 2:
+            self.compact()
+
+    def close(self):
+        super().close()
+        with self._compacting, self._wlock:
+            if self._fh is not None:
+                self._sync(self._fh); self._fh.close(); self._fh=None
+
+    def compact(self):
+        """Snapshot the current rows and drop the journal gens it covers."""
+        if not self._compacting.acquire(blocking=False):
+            return
+        try:
+            t0=time.perf_counter()
+            with self._wlock:                         # roll over: O(1) + dict copy
+                rows=list(self._mirror.values())
+                self._sync(self._fh); self._fh.close()
+                self._gen += 1; new_gen=self._gen
+                self._fh=open(self._seg(new_gen), "ab"); self._seg_bytes=0
+            write_snapshot(os.path.join(self.dir, "snapshot.dat"), new_gen, rows)
+            for g in self._gens():
+                if g < new_gen: os.remove(self._seg(g))
+            self.compactions += 1
+            self.last_compact_ms=round((time.perf_counter()-t0)*1000, 3)
+        finally:
+            self._compacting.release()
+
+    def stats(self) -> dict:
+        st=super().stats()
+        st.update(journal_gen=self._gen,
+                  journal_bytes=self._seg_bytes,
+                  compactions=self.compactions,
+                  last_compact_ms=self.last_compact_ms)
+        return st
@@ -0,0 +1,104 @@
+# ==============================================================
+#  lease.py
+#  shared leases: many registrations, one keep-alive
+#
+#  A client grants a lease with a TTL, registers any number of objects
+#  with that lease_id and renews all of them with one LeaseKeepAlive.
+#  Attached objects have no expiry bookkeeping of their own; when the
+#  lease lapses they are removed together.  A keep-alive still moves
+#  their last_seen, so a copy that only knows plain TTL (a backup, the
+#  store after a restart) does not drop objects the lease keeps alive.
+#
+#  Leases live in the leader's memory only.  After a restart or a
+#  failover LeaseKeepAlive answers ok=false and the client grants a new
+#  lease and re-registers.
+# ==============================================================
+
+import threading, time, uuid
+
+from expiry import ExpiryQueue
+
+
+class Lease:
+    __slots__ = ("id", "ttl", "deadline", "names")
+
+    def __init__(self, lid, ttl):
+        self.id       = lid
+        self.ttl      = ttl
+        self.deadline = time.time()+ttl
+        self.names    = set()
+
+
+class LeaseTable:
+
+    def __init__(self, default_ttl: float, max_ttl: float):
+        self.default_ttl = default_ttl
+        self.max_ttl     = max_ttl
+        self._leases     = {}
+        self._lock       = threading.Lock()
+        self._expiry     = ExpiryQueue()
+        self.keepalives  = 0
+
+    def __len__(self):
+        return len(self._leases)
+
+    def attached(self):
+        with self._lock:
+            return sum(len(l.names) for l in self._leases.values())
+
+    # =============== client calls ===========================================
+    def grant(self, ttl: float) -> Lease:
+        ttl=min(ttl if ttl > 0 else self.default_ttl, self.max_ttl)
+        lease=Lease(uuid.uuid4().int >> 65, ttl)       # positive int64
+        with self._lock:
+            self._leases[lease.id]=lease
+        self._expiry.arm(lease.id, lease.deadline)
+        return lease
+
+    def keepalive(self, lid) -> Lease | None:
+        with self._lock:                                # never races due()'s pop
+            lease=self._leases.get(lid)
+            if lease is not None:
+                lease.deadline=time.time()+lease.ttl    # heap is re-armed lazily
+                self.keepalives += 1
+        return lease
+
+    def revoke(self, lid) -> set | None:
+        with self._lock:
+            lease=self._leases.pop(lid, None)
+        return lease.names if lease else None
+
+    # =============== attachment (caller holds the registry lock) ============
+    def attach(self, lid, name) -> bool:
+        with self._lock:
+            lease=self._leases.get(lid)
+            if lease is None: return False
+            lease.names.add(name); return True
+
+    def detach(self, lid, name):
+        with self._lock:
+            lease=self._leases.get(lid)
+            if lease is not None: lease.names.discard(name)
+
+    def names(self, lid) -> list:
+        with self._lock:
+            lease=self._leases.get(lid)
+            return list(lease.names) if lease else []
+
+    def deadline(self, lid):
+        lease=self._leases.get(lid)
+        return lease.deadline if lease else None
+
+    # =============== expiry ==================================================
+    def due(self, now):
+        """Pop leases that lapsed; -> [(lease_id, names)]."""
+        out=[]
+        for lid in self._expiry.due(now, self.deadline):
+            with self._lock:
+                lease=self._leases.get(lid)
+                if lease is None:
+                    continue
+                if lease.deadline <= now:
+                    del self._leases[lid]; out.append((lid, lease.names)); continue
+            self._expiry.arm(lid, lease.deadline)       # renewed since due() looked
+        return out
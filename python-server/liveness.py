@@ -0,0 +1,139 @@
+# ==============================================================
+#  liveness.py
+#  last_seen propagation between the nodes  (config "liveness_sync_ms")
+#
+#  Heartbeats only move last_seen on the node that receives them, but
+#  every backup runs the same TTL sweep over its replicated entries.
+#  Without this a backup would expire every live service ttl_seconds
+#  after it last saw a write, and a failover would land on an empty
+#  registry.
+#
+#  The leader notes name -> last_seen on every heartbeat (one dict
+#  store, no lock) and every liveness_sync_ms sends each backup one
+#  TouchObjects(is_replication) with the newest value per name, at
+#  most liveness_batch_max names per RPC.  A peer that cannot be
+#  reached keeps its pending refreshes (newest wins) for the next
+#  flush.
+#
+#  A client may heartbeat through a backup instead.  The backup notes
+#  those the same way and every liveness_sync_ms relays them up to the
+#  leader as one plain TouchObjects, which the leader takes as
+#  heartbeats of its own (and ships to the other backups).  Otherwise
+#  the leader would expire a service that only ever talks to a backup.
+#
+#  Leased objects are noted on registration and on every LeaseKeepAlive
+#  with last_seen = lease deadline - ttl_seconds (never before now), so
+#  a backup's plain-TTL sweep keeps them exactly as long as the lease.
+# ==============================================================
+
+import threading, time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import object_repository_pb2 as pb
+
+from metrics import RollingStat
+
+
+class LivenessSync:
+
+    def __init__(self, reg, stubs: dict, interval_ms: float = 1000, batch_max: int = 20000,
+                 timeout: float = 1.0):
+        self.reg       = reg
+        self.stubs     = stubs
+        self.interval  = interval_ms / 1000.0
+        self.batch_max = batch_max
+        self.timeout   = timeout
+        self.enabled   = interval_ms > 0 and bool(stubs)
+        self._new      = {}                             # name -> last_seen, since last flush
+        self.pending   = {pid: {} for pid in stubs}     # per peer, not yet delivered
+        self.upward    = {}                             # backup: not yet relayed to the leader
+        self._pool     = ThreadPoolExecutor(max(1, len(stubs)), thread_name_prefix="liveness")
+        # metrics ------------------------------------------------------------
+        self.flushes   = 0
+        self.sent      = {pid: 0 for pid in stubs}      # names delivered
+        self.sent_b    = {pid: 0 for pid in stubs}      # request bytes delivered
+        self.errors    = {pid: 0 for pid in stubs}
+        self.batch     = RollingStat(scale=1)           # names per flush
+        self.relayed   = 0                              # backup: names sent up
+        self.relay_err = 0
+        self.flush_dur = RollingStat()
+        if self.enabled:
+            threading.Thread(target=self._loop, daemon=True, name="liveness-sync").start()
+
+    def touch(self, name, ts):
+        """Heartbeat hot path; a plain dict store is atomic under the GIL."""
+        if self.enabled:
+            self._new[name]=ts
+
+    # =============== flush ==================================================
+    def _loop(self):
+        while True:
+            time.sleep(self.interval)
+            if not self.reg.is_leader:
+                for p in self.pending.values(): p.clear()
+                self.relay()
+                continue
+            self.upward.clear()
+            self.flush()
+
+    def flush(self):
+        t0=time.perf_counter()
+        new, self._new = self._new, {}
+        new=dict(new)          # a store racing the swap is dropped; the next ping carries it
+        if new:
+            for p in self.pending.values():
+                if not p: p.update(new); continue
+                for n, ts in new.items():
+                    if ts > p.get(n, 0): p[n]=ts
+        busy=[self._pool.submit(self._send, pid) for pid, p in self.pending.items() if p]
+        if not busy:
+            return
+        wait(busy)
+        self.flushes += 1; self.batch.add(len(new))
+        self.flush_dur.add(time.perf_counter()-t0)
+
+    def _send(self, pid):
+        p=self.pending[pid]; names=list(p); stub=self.stubs[pid]
+        for i in range(0, len(names), self.batch_max):
+            chunk=names[i:i+self.batch_max]
+            req=pb.TouchRequest(object_name=chunk, last_seen=[p[n] for n in chunk],
+                                is_replication=True)
+            try:
+                stub.TouchObjects(req, timeout=self.timeout)
+            except Exception:
+                self.errors[pid] += 1
+                return                      # the rest stays pending
+            for n in chunk: del p[n]
+            self.sent[pid] += len(chunk); self.sent_b[pid] += req.ByteSize()
+
+    # =============== backup -> leader =======================================
+    def relay(self):
+        """Backup: hand the heartbeats it took to the leader (newest wins on retry)."""
+        new, self._new = self._new, {}
+        up=self.upward
+        for n, ts in dict(new).items():
+            if ts > up.get(n, 0): up[n]=ts
+        pid=self.reg._leader_peer()
+        if not up or pid is None:
+            return
+        names=list(up); stub=self.stubs[pid]
+        for i in range(0, len(names), self.batch_max):
+            chunk=names[i:i+self.batch_max]
+            req=pb.TouchRequest(object_name=chunk, last_seen=[up[n] for n in chunk])
+            try:
+                stub.TouchObjects(req, timeout=self.timeout)
+            except Exception:
+                self.relay_err += 1
+                return                      # the rest stays for the next round
+            for n in chunk: del up[n]
+            self.relayed += len(chunk)
+
+    # =============== observability ===========================================
+    def stats(self) -> dict:
+        return dict(enabled=self.enabled, interval_ms=round(self.interval*1000),
+                    flushes=self.flushes, names_per_flush=self.batch.snapshot(),
+                    flush_ms=self.flush_dur.snapshot(), relayed=self.relayed,
+                    relay_pending=len(self.upward), relay_errors=self.relay_err,
+                    peers={pid: dict(pending=len(self.pending[pid]), sent=self.sent[pid],
+                                     bytes=self.sent_b[pid], errors=self.errors[pid])
+                           for pid in self.stubs})
@@ -0,0 +1,80 @@
+# ==============================================================
+#  metrics.py
+#  tiny in-process recorders behind ObjectRegistry.stats()
+# ==============================================================
+
+import threading, time
+from collections import deque
+
+
+class RollingStat:
+    """
+    Count / avg / p50 / p99 / max over a rolling window of samples.
+    Latencies are recorded in seconds and reported in ms (scale=1000);
+    plain quantities (batch sizes, depths) use scale=1.
+    """
+
+    def __init__(self, scale: float = 1000.0, window: int = 2048):
+        self._lock  = threading.Lock()
+        self._win   = deque(maxlen=window)
+        self.scale  = scale
+        self.count  = 0
+        self.total  = 0.0
+        self.max    = 0.0
+
+    def add(self, v: float):
+        with self._lock:
+            self._win.append(v); self.count += 1; self.total += v
+            if v > self.max: self.max = v
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            win = sorted(self._win); n = self.count; tot = self.total; mx = self.max
+        if not win:
+            return dict(count=n)
+        pick = lambda q: round(win[min(len(win)-1, int(q*len(win)))]*self.scale, 3)
+        return dict(count=n,
+                    avg=round(tot/n*self.scale, 3),
+                    p50=pick(0.50), p99=pick(0.99),
+                    max=round(mx*self.scale, 3))
+
+
+class TransferStat:
+    """
+    State transfers into this node: the one in progress (RESET .. SYNCED ..
+    caught up) and the last one finished.  copy = RESET to SYNCED, caught
+    up = RESET until the backlog queued behind the copy is applied too.
+    """
+
+    def __init__(self):
+        self.cur   = None
+        self.last  = {}
+        self.count = 0
+
+    def begin(self, source: str):
+        self.cur=dict(source=source, t0=time.perf_counter(), objects=0, bytes=0, chunks=0,
+                      copy_s=None)
+
+    def chunk(self, objects: int, nbytes: int):
+        if self.cur is not None:
+            self.cur["objects"] += objects; self.cur["bytes"] += nbytes; self.cur["chunks"] += 1
+
+    def copied(self):
+        if self.cur is not None and self.cur["copy_s"] is None:
+            self.cur["copy_s"]=time.perf_counter()-self.cur["t0"]
+
+    def caught_up(self):
+        x, self.cur=self.cur, None
+        if x is None: return
+        copy_s=x["copy_s"] if x["copy_s"] is not None else time.perf_counter()-x["t0"]
+        self.count += 1
+        self.last=dict(source=x["source"], objects=x["objects"], bytes=x["bytes"],
+                       chunks=x["chunks"], copy_ms=round(copy_s*1000, 3),
+                       mb_per_s=round(x["bytes"]/max(copy_s, 1e-9)/1e6, 3),
+                       caught_up_ms=round((time.perf_counter()-x["t0"])*1000, 3))
+
+    def snapshot(self) -> dict:
+        cur=self.cur
+        busy=None if cur is None else dict(source=cur["source"], objects=cur["objects"],
+                                           bytes=cur["bytes"], copying=cur["copy_s"] is None)
+        return dict(count=self.count, in_progress=busy, last=self.last)
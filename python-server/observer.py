@@ -0,0 +1,134 @@
+# ==============================================================
+#  observer.py
+#  non-voting read replicas  (config "role": "observer")
+#
+#  Adding a node to `peers` puts it in the election and in the write
+#  fan-out, so every read replica made writes slower.  An observer is
+#  in neither: voters do not list it, it never answers GetUptime or
+#  takes a lease, and the leader does not wait for it.  It finds the
+#  leader among its `peers` (the voters; only the leader answers Ping),
+#  follows the leader's WatchChanges feed and answers GetObject /
+#  ListObjects / Heartbeat locally, like a read worker (workers.py)
+#  whose owner is whichever node leads.  Everything else - writes,
+#  leases, revision-token reads - is forwarded to the leader.
+#
+#  The feed is a plain subscription on the leader: an observer that
+#  falls behind is cut off and resyncs from a snapshot, it never holds
+#  a write back.  Every observer_check_sec it asks who leads; when that
+#  moved it drops the stream and resyncs from the new leader.
+# ==============================================================
+
+import json, threading, time
+from concurrent.futures import ThreadPoolExecutor
+
+import grpc
+import object_repository_pb2       as pb
+import object_repository_pb2_grpc  as pb_grpc
+import heartbeat_service_pb2       as hb_pb
+import heartbeat_service_pb2_grpc  as hb_grpc
+from google.protobuf import empty_pb2
+
+from registry_server_wifi import PEER_CHANNEL_OPTS, RPC_TIMEOUT
+from admission import Admission, AdmissionInterceptor
+from workers   import ReadWorker
+
+
+class Observer(ReadWorker):
+
+    def __init__(self, cfg: dict):
+        self.biz     = {}
+        self.hb      = {}
+        for p in cfg["peers"]:
+            self.biz[p["id"]]=pb_grpc.ObjectRepositoryStub(grpc.insecure_channel(
+                f"{p['host']}:{p['biz_port']}", options=PEER_CHANNEL_OPTS))
+            self.hb[p["id"]]=hb_grpc.HeartbeatServiceStub(grpc.insecure_channel(
+                f"{p['host']}:{p['hb_port']}", options=PEER_CHANNEL_OPTS))
+        self.check_s = cfg.get("observer_check_sec", 2.0)
+        self.leader  = None                   # peer id being followed
+        self._call   = None                   # its WatchChanges stream
+        # metrics ------------------------------------------------------------
+        self.switches = 0
+        super().__init__(cfg, 0, name=cfg.get("node_id", "observer"))
+        threading.Thread(target=self._check_leader, daemon=True).start()
+
+    def _connect(self):
+        return None                           # set by _follow once a leader is known
+
+    def find_leader(self):
+        """-> peer id of the voter that answers Ping, or None."""
+        calls={pid: hb.Ping.future(empty_pb2.Empty(), timeout=RPC_TIMEOUT)
+               for pid, hb in self.hb.items()}
+        for pid, f in calls.items():
+            try:
+                f.result(); return pid
+            except grpc.RpcError:
+                pass
+        return None
+
+    # =============== replica maintenance ====================================
+    def _follow(self):
+        while True:
+            pid=self.find_leader()
+            if pid is None:
+                time.sleep(self._backoff); self._backoff=min(self._backoff*2, 5.0); continue
+            if pid != self.leader: print(f"[{self.name}] following {pid}")
+            self.leader=pid; self.owner=self.biz[pid]
+            self._call=self.owner.WatchChanges(pb.WatchRequest(subscriber=self.name))
+            try:
+                self._watch(self._call)
+            except grpc.RpcError as e:
+                if e.code() != grpc.StatusCode.CANCELLED:
+                    print(f"[{self.name}] feed from {pid} lost ({e.code().name})")
+            time.sleep(self._backoff); self._backoff=min(self._backoff*2, 5.0)
+
+    def _check_leader(self):
+        while True:
+            time.sleep(self.check_s)
+            pid=self.find_leader()
+            if pid is not None and self.leader is not None and pid != self.leader:
+                print(f"[{self.name}] leader moved {self.leader} -> {pid}, resyncing")
+                self.switches += 1
+                if self._call is not None: self._call.cancel()
+
+    # =============== observability ===========================================
+    def stats(self) -> dict:
+        return dict(role="observer", node_id=self.name, leader=self.leader,
+                    synced=self.synced.is_set(), objects=len(self.objects),
+                    applied_seq=self.applied, resyncs=self.resets, leader_switches=self.switches,
+                    staleness_ms=None if (s:=self.follower.staleness()) == float("inf")
+                    else round(s*1000, 3), too_stale=self.follower.too_stale,
+                    liveness_pending=len(self._touch))
+
+    # =============== main ===================================================
+    def serve(self):
+        self.synced.wait()
+        adm=Admission(self.cfg)
+        gate=dict(interceptors=[AdmissionInterceptor(adm)], maximum_concurrent_rpcs=adm.max_rpcs)
+        srv=grpc.server(ThreadPoolExecutor(max_workers=self.cfg.get("biz_workers", 10)), **gate)
+        pb_grpc.add_ObjectRepositoryServicer_to_server(self, srv)
+        srv.add_insecure_port(self.cfg["self_address"])
+        srv.start()
+        hb_srv=grpc.server(ThreadPoolExecutor(max_workers=self.cfg.get("hb_workers", 4)), **gate)
+        hb_grpc.add_HeartbeatServiceServicer_to_server(ObserverHeartbeat(self), hb_srv)
+        hb_srv.add_insecure_port(self.cfg["hb_address"])
+        hb_srv.start()
+        print(f"✅ observer {self.name} @ {self.cfg['self_address']}"
+              f" ({len(self.objects)} objects from {self.leader})")
+        srv.wait_for_termination()
+
+
+class ObserverHeartbeat(hb_grpc.HeartbeatServiceServicer):
+    """Never primary; GetUptime / LeaderBeat stay unimplemented so it cannot be elected."""
+
+    def __init__(self, obs: Observer):
+        self.obs = obs
+
+    def Ping(self, req, ctx):
+        ctx.abort(grpc.StatusCode.UNAVAILABLE, "observer")
+
+    def GetStats(self, req, ctx):
+        return hb_pb.StatsInfo(node_id=self.obs.name, json=json.dumps(self.obs.stats()))
+
+
+def serve_observer(cfg: dict):
+    Observer(cfg).serve()
@@ -0,0 +1,158 @@
+# ==============================================================
+#  outbox.py
+#  durable per-peer replication outbox  (unary transport)
+#
+#  A replicated write a backup did not take is not dropped: it goes
+#  into that peer's outbox, a sqlite table next to the registry
+#  database, and a per-peer drainer retries it with exponential
+#  backoff (outbox_backoff_ms .. outbox_backoff_max_ms, jittered).
+#
+#  One row per (peer, object name): a newer write to the same name
+#  replaces the queued one (register then deregister leaves only the
+#  deregister), so depth is bounded by the names touched during the
+#  outage, and rows can drain in any order.  While a peer has rows,
+#  new writes for it queue behind them instead of overtaking them.
+#
+#  Past outbox_snapshot_after rows the queue is dropped and the peer
+#  gets a full snapshot pushed over Replicate instead (RESET, chunks,
+#  SYNCED); writes made meanwhile queue as usual and drain after it.
+#  The stream transport does not need this: its feed subscription is
+#  the outbox and overflows into the same snapshot resync.
+# ==============================================================
+
+import random, sqlite3, threading, time
+
+import object_repository_pb2 as pb
+
+from metrics import RollingStat
+
+REQUEST = {"RegisterObject": pb.RegisterRequest, "DeregisterObject": pb.DeregisterRequest}
+SNAPSHOT = "\0snapshot"          # marker row: this peer needs a full copy first
+
+
+class Outbox:
+
+    def __init__(self, reg, stubs: dict, path: str, node_id: str, timeout: float = 1.0,
+                 backoff_ms: float = 100, backoff_max_ms: float = 30_000,
+                 snapshot_after: int = 10_000):
+        self.reg       = reg
+        self.stubs     = stubs
+        self.node_id   = node_id
+        self.timeout   = timeout
+        self.backoff   = (backoff_ms/1000.0, backoff_max_ms/1000.0)
+        self.snap_at   = snapshot_after
+        self.db        = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS outbox(peer TEXT, name TEXT, method TEXT,"
+                        " body BLOB, enq REAL, PRIMARY KEY(peer, name))")
+        self._lock     = threading.Lock()
+        self._wake     = {pid: threading.Event() for pid in stubs}
+        # in-memory mirror of the table: peer -> {name: (method, body, enq, ver)}
+        self.rows      = {pid: {} for pid in stubs}
+        self._ver      = 0                 # tells a replaced row from the one delivered
+        for pid, n, m, body, enq in self.db.execute("SELECT * FROM outbox"):
+            if pid in self.rows: self.rows[pid][n]=(m, body, enq, 0)
+        # metrics ------------------------------------------------------------
+        self.enqueued  = {pid: 0 for pid in stubs}
+        self.collapsed = {pid: 0 for pid in stubs}
+        self.delivered = {pid: 0 for pid in stubs}
+        self.retries   = {pid: 0 for pid in stubs}
+        self.snapshots = {pid: 0 for pid in stubs}
+        self.wait_s    = {pid: 0.0 for pid in stubs}     # current backoff
+        self.drain_lat = {pid: RollingStat() for pid in stubs}   # ms enqueue -> delivery
+        for pid in stubs:
+            threading.Thread(target=self._drain, args=(pid,), daemon=True,
+                             name=f"outbox-{pid}").start()
+            if self.rows[pid]: self._wake[pid].set()
+        if any(self.rows.values()):
+            print(f"✅ Outbox: {sum(map(len, self.rows.values()))} undelivered rows reloaded")
+
+    def busy(self, pid) -> bool:
+        """New writes for `pid` must queue behind what is already there."""
+        return bool(self.rows[pid])
+
+    # =============== enqueue ================================================
+    def put(self, pid, method, reqs):
+        now=time.time()
+        with self._lock:
+            rows=self.rows[pid]
+            if SNAPSHOT not in rows and len(rows)+len(reqs) > self.snap_at:
+                rows=self._to_snapshot(pid, now)
+            batch=[]
+            for r in reqs:
+                body=r.SerializeToString()
+                if r.object_name in rows: self.collapsed[pid] += 1
+                self._ver += 1; rows[r.object_name]=(method, body, now, self._ver)
+                batch.append((pid, r.object_name, method, body, now))
+            self.db.executemany("INSERT OR REPLACE INTO outbox VALUES (?,?,?,?,?)", batch)
+            self.enqueued[pid] += len(reqs)
+        self._wake[pid].set()
+
+    def _to_snapshot(self, pid, now):
+        """Backlog too deep: forget it, the peer gets a full copy instead."""
+        print(f"[OUTBOX] {pid}: {len(self.rows[pid])} queued -> snapshot transfer")
+        self._ver += 1; rows=self.rows[pid]={SNAPSHOT: ("", b"", now, self._ver)}
+        self.db.execute("DELETE FROM outbox WHERE peer=?", (pid,))
+        self.db.execute("INSERT INTO outbox VALUES (?,?,?,?,?)", (pid, SNAPSHOT, "", b"", now))
+        return rows
+
+    def _done(self, pid, name, ver):
+        """Delivered: drop the row unless a newer write replaced it meanwhile."""
+        with self._lock:
+            rows=self.rows[pid]
+            if name in rows and rows[name][3] == ver:
+                del rows[name]
+                self.db.execute("DELETE FROM outbox WHERE peer=? AND name=?", (pid, name))
+
+    def clear(self):
+        """Another node leads now; what we queued is no longer ours to send."""
+        with self._lock:
+            for pid in self.rows: self.rows[pid]={}
+            self.db.execute("DELETE FROM outbox")
+
+    # =============== drain ==================================================
+    def _drain(self, pid):
+        stub=self.stubs[pid]; lo, hi=self.backoff
+        while True:
+            self._wake[pid].wait(1.0); self._wake[pid].clear()
+            while self.rows[pid] and self.reg.is_leader:
+                try:
+                    self._deliver(pid, stub)
+                    self.wait_s[pid]=0.0
+                except Exception as e:
+                    self.retries[pid] += 1
+                    w=self.wait_s[pid]=min(hi, max(lo, self.wait_s[pid]*2))
+                    if self.retries[pid] % 10 == 1:
+                        print(f"[OUTBOX] {pid}: {type(e).__name__}, {len(self.rows[pid])}"
+                              f" queued, retry in {w:.1f}s")
+                    time.sleep(w*random.uniform(0.5, 1.0))
+
+    def _deliver(self, pid, stub):
+        rows=self.rows[pid]
+        if SNAPSHOT in rows:
+            ver=rows[SNAPSHOT][3]
+            self._push_snapshot(stub)
+            self.snapshots[pid] += 1; self._done(pid, SNAPSHOT, ver)
+            return
+        for name, (m, body, enq, ver) in list(rows.items())[:256]:
+            getattr(stub, m)(REQUEST[m].FromString(body), timeout=self.timeout)
+            self._done(pid, name, ver)
+            self.delivered[pid] += 1; self.drain_lat[pid].add(time.time()-enq)
+
+    def _push_snapshot(self, stub):
+        reg=self.reg
+        batches=(pb.ReplBatch(leader_id=self.node_id, events=b.events)
+                 for b in reg._feed_snapshot())
+        for _ in stub.Replicate(batches, timeout=reg.cfg.get("snapshot_timeout_sec", 300)):
+            pass
+
+    # =============== observability ===========================================
+    def stats(self, pid) -> dict:
+        rows=self.rows[pid]; now=time.time()
+        oldest=min((r[2] for r in list(rows.values())), default=None)
+        return dict(depth=len(rows), oldest_age_s=round(now-oldest, 3) if oldest else 0,
+                    snapshot_pending=SNAPSHOT in rows, enqueued=self.enqueued[pid],
+                    collapsed=self.collapsed[pid], delivered=self.delivered[pid],
+                    retries=self.retries[pid], snapshots=self.snapshots[pid],
+                    backoff_s=round(self.wait_s[pid], 3), drain_ms=self.drain_lat[pid].snapshot())
@@ -4,7 +4,7 @@
 #  Bully-style leader election by longest-uptime
 # ==============================================================
 
-import grpc, time, json, sqlite3, threading, schedule, uuid
+import grpc, time, json, threading, schedule, uuid
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
@@ -14,11 +14,39 @@ import heartbeat_service_pb2        as hb_pb
 import heartbeat_service_pb2_grpc   as hb_grpc
 from google.protobuf import empty_pb2
 
+from storage import open_store
+from expiry  import ExpiryQueue
+from lease   import LeaseTable
+from shards  import ShardedMap
+from metrics import RollingStat, TransferStat
+from admission import Admission, AdmissionInterceptor
+from changefeed import ChangeFeed
+from replication import Replicator
+from shipping    import LogShipper
+from antientropy import AntiEntropy
+from liveness    import LivenessSync
+from outbox      import Outbox
+from election    import Breaker, UptimePoller, LeaderLease
+from forwarding  import WriteForwarder
+from follower    import FollowerReads, min_revision
+
 # ---------- run-time constants --------------------------------
 NODE_ID     = str(uuid.uuid4())[:8]
 START_TS    = time.time()
 ELECT_INT   = 2.0         # seconds
 RPC_TIMEOUT = 1.0
+# a peer that was down for a while must be reachable again within a
+# second of coming back, not after gRPC's default 120 s reconnect backoff
+PEER_CHANNEL_OPTS = [("grpc.initial_reconnect_backoff_ms", 100),
+                     ("grpc.min_reconnect_backoff_ms",     100),
+                     ("grpc.max_reconnect_backoff_ms",     1000)]
+# unary transport: several changes to a peer travel as one batch RPC
+REPL_BATCH = {
+    "RegisterObject"  : ("BatchRegister",   lambda rs: pb.BatchRegisterRequest(
+                             items=rs, is_replication=True)),
+    "DeregisterObject": ("BatchDeregister", lambda rs: pb.BatchDeregisterRequest(
+                             object_name=[r.object_name for r in rs], is_replication=True)),
+}
 
 # ==============================================================
 
@@ -36,55 +64,194 @@ class ObjectRegistry(pb_grpc.ObjectRepositoryServicer):
         hb_servicer.bind_registry(self)      # give heartbeat layer a pointer
 
         # local store ---------------------------------------------------------
-        self.objects = {}
-        self.lock    = threading.Lock()
-        self.conn    = sqlite3.connect(cfg["database"], check_same_thread=False)
-        self._init_db(); self._load_state()
+        # name space is hash-partitioned; each shard has its own writer lock,
+        # dirty set and revision (see shards.py) - there is no global lock
+        self.objects = ShardedMap(cfg.get("shards", 16))
+
+        # read path: writers bump their shard's rev, readers publish an
+        # immutable ListObjects response per set of revisions (RCU-style)
+        self._list_snap  = ((), 0.0, None)  # (revs, built_at, ObjectListResponse)
+        self.lockfree_reads = cfg.get("lockfree_reads", True)
+        self.list_max_age   = cfg.get("list_snapshot_max_age_sec", 1.0)
+        self.ttl_seconds = cfg.get("ttl_seconds", 300)
+        self.expiry  = ExpiryQueue()
+        self.expiry_tick = cfg.get("expiry_tick_sec", 0.25)
+        self.expiry_cost = RollingStat()
+        self.expired_total = 0
+        self.leases  = LeaseTable(default_ttl=cfg.get("lease_default_ttl_sec", self.ttl_seconds),
+                                  max_ttl    =cfg.get("lease_max_ttl_sec", 3600))
+        self.store   = open_store(cfg)
+        self._load_state()
+        self.admission = Admission(cfg)      # shared by both servers' interceptors
+        self.feed    = ChangeFeed(cfg.get("feed_max_queue", 100_000))   # read workers
+        self.watch_keep_s = cfg.get("watch_keepalive_ms", 250) / 1000.0  # idle feed beat
 
         # stubs to peers ------------------------------------------------------
         self.peer_biz = {
             p["id"]: pb_grpc.ObjectRepositoryStub(
-                grpc.insecure_channel(f"{p['host']}:{p['biz_port']}"))
+                grpc.insecure_channel(f"{p['host']}:{p['biz_port']}",
+                                      options=PEER_CHANNEL_OPTS))
             for p in self.peers_cfg
         }
         self.peer_hb = {
             p["id"]: hb_grpc.HeartbeatServiceStub(
-                grpc.insecure_channel(f"{p['host']}:{p['hb_port']}"))
+                grpc.insecure_channel(f"{p['host']}:{p['hb_port']}",
+                                      options=PEER_CHANNEL_OPTS))
             for p in self.peers_cfg
         }
+        # election polls every peer at once; dead ones sit behind a breaker
+        self.elect_int = cfg.get("elect_interval_sec", ELECT_INT)
+        self.poller    = UptimePoller(self.peer_hb, timeout=RPC_TIMEOUT,
+                                      fail_max    =cfg.get("elect_breaker_failures", 3),
+                                      open_sec    =cfg.get("elect_breaker_open_sec", 2.0),
+                                      open_max_sec=cfg.get("elect_breaker_open_max_sec", 30.0))
+        # ... but only once the lease on the current leader lapsed (lease_ms 0:
+        # poll every elect_interval_sec as before)
+        self.lease     = LeaderLease(self.peer_hb, NODE_ID, cfg.get("node_id", ""),
+                                     lease_ms=cfg.get("lease_ms", 900),
+                                     renew_ms=cfg.get("lease_renew_ms", cfg.get("lease_ms", 900)/2))
+        self._role_lock= threading.Lock()
+        # client writes that land on a backup are relayed to the leader
+        self.fwd       = WriteForwarder(self, cfg.get("forward_writes", True),
+                                        cfg.get("forward_timeout_sec", 5.0))
+        # ... and reads are served here unless this backup is too far behind
+        self.follower  = FollowerReads(self, cfg.get("follower_max_staleness_ms", 1000),
+                                       cfg.get("follower_stale_action", "forward"))
+        if self.lease.enabled:                 # a lapsed lease polls; keep it short
+            self.poller.timeout=min(RPC_TIMEOUT, self.lease.lease_s)
+        # writes fan out to every backup at once; replication_ack picks how
+        # many of them a client waits for.  "unary" re-sends each change as
+        # its own RPC (replication.py), "stream" ships the change feed as
+        # sequence-numbered batches (shipping.py)
+        ack=cfg.get("replication_ack", "all")
+        self.replicator = self.shipper = None
+        if cfg.get("replication_transport", "unary") == "stream":
+            self.shipper = LogShipper(self, self.peer_biz, NODE_ID, mode=ack, timeout=RPC_TIMEOUT,
+                                      batch_ms    =cfg.get("repl_batch_ms", 2),
+                                      batch_max   =cfg.get("repl_batch_max", 512),
+                                      max_inflight=cfg.get("repl_max_inflight", 8))
+        else:
+            self.replicator = Replicator(self.peer_biz, mode=ack, timeout=RPC_TIMEOUT,
+                                         lanes=cfg.get("replication_lanes", 4))
+        # backup side of the stream: what this node has applied, and from whom
+        self.repl_leader  = ""
+        self.repl_applied = 0
+        self._repl_lock   = threading.Lock()
+        self._resync      = None              # names seen since RESET
+        self.repl_apply   = RollingStat()
+        # state transfer: snapshots go out in chunks of at most chunk_bytes.
+        # With the unary transport a backup pulls one (FetchSnapshot) from
+        # every leader it has not copied yet; the stream resyncs by itself
+        self.chunk_bytes  = cfg.get("snapshot_chunk_kb", 256)*1024
+        self.transfer     = TransferStat()
+        self.peer_node    = {}                # peer id -> its NODE_ID, from election
+        self._synced_from = None              # leader whose snapshot we hold
+        self._pulling     = False
+        self._live        = None              # names written live during a pull
+        # a failed pull waits snapshot_retry_sec, doubling (jittered) up to
+        # snapshot_retry_max_sec, before the leader is asked again
+        self._pull_brk    = Breaker(1, cfg.get("snapshot_retry_sec", 1.0),
+                                    cfg.get("snapshot_retry_max_sec", 30.0))
+        self._pull_from   = None              # leader the backoff is for
+        # backups compare Merkle digests with the leader and repair the
+        # buckets that drifted (antientropy.py)
+        self.ae           = AntiEntropy(self, cfg)
+        # unary transport: what a backup misses is queued on disk and retried
+        if self.replicator and self.peer_biz and cfg.get("replication_outbox", True):
+            path=cfg.get("outbox_path") or (cfg["database"]+".outbox"
+                                             if self.store.persistent else ":memory:")
+            self.replicator.outbox = Outbox(
+                self, self.peer_biz, path, NODE_ID, timeout=RPC_TIMEOUT,
+                backoff_ms    =cfg.get("outbox_backoff_ms", 100),
+                backoff_max_ms=cfg.get("outbox_backoff_max_ms", 30_000),
+                snapshot_after=cfg.get("outbox_snapshot_after", 10_000))
 
-        self.ttl_seconds = cfg.get("ttl_seconds", 300)
+        # heartbeat fast path: last_seen lives in memory, disk sees it lazily
+        self.hb_fast     = cfg.get("heartbeat_fast_path", True)
+        # ... and reaches the backups in batches, so their TTL sweep agrees
+        self.liveness    = LivenessSync(self, self.peer_biz, cfg.get("liveness_sync_ms", 1000),
+                                        cfg.get("liveness_batch_max", 20000), RPC_TIMEOUT)
+        self.live_applied = 0                 # backup: refreshes received
+
+        # incremental checkpoints: register / deregister / expiry are written
+        # through; the shards' dirty sets hold names whose in-memory state is
+        # ahead of disk.  heartbeat_flush_sec is the older name for the same
+        # cadence (it only flushed last_seen then) and is still honoured.
+        self.ckpt_s      = cfg.get("checkpoint_sec",
+                                   cfg.get("heartbeat_flush_sec", 5))    # 0 = never persist
+        self.ckpt_dur    = RollingStat()
+        self.ckpt_rows   = RollingStat(scale=1)
+        self.ckpt_hold   = RollingStat(scale=1e6)   # lock hold, microseconds
 
         # background threads --------------------------------------------------
-        schedule.every(5).minutes.do(self.save_state)
+        if cfg.get("stats_interval_sec", 0) > 0:
+            schedule.every(cfg["stats_interval_sec"]).seconds.do(
+                lambda: print("[STATS]", json.dumps(self.stats())))
         threading.Thread(target=self._schedule_loop, daemon=True).start()
         threading.Thread(target=self._ttl_gc,       daemon=True).start()
         threading.Thread(target=self._elect_loop,   daemon=True).start()
+        if self.ckpt_s > 0:
+            threading.Thread(target=self._checkpoint_loop, daemon=True).start()
 
     # =============== DB helpers =============================================
-    def _init_db(self):
-        cur=self.conn.cursor()
-        cur.execute("""CREATE TABLE IF NOT EXISTS objects(
-                       name TEXT PRIMARY KEY, address TEXT, language TEXT,
-                       version TEXT, region TEXT, last_seen REAL)""")
-        self.conn.commit()
-
     def _load_state(self):
-        cur=self.conn.cursor(); cur.execute("SELECT * FROM objects")
-        for n,a,l,v,r,ts in cur.fetchall():
+        t0=time.perf_counter()
+        rows=self.store.load(min_last_seen=time.time()-self.ttl_seconds)
+        for n,a,l,v,r,ts in rows:
             self.objects[n]=dict(address=a,language=l,version=v,
                                  region=r,last_seen=ts,source="local")
-        print(f"✅ Loaded {len(self.objects)} snapshot rows")
-
-    def save_state(self):
-        with self.lock:
-            cur=self.conn.cursor()
-            for n,inf in self.objects.items():
-                cur.execute("REPLACE INTO objects VALUES (?,?,?,?,?,?)",
-                            (n,inf["address"],inf["language"],
-                             inf["version"],inf["region"],inf["last_seen"]))
-            self.conn.commit()
-            print("✅ Periodic state saved")
+            self.expiry.arm(n, ts+self.ttl_seconds)
+        self.load_ms=round((time.perf_counter()-t0)*1000, 3)
+        print(f"✅ Loaded {len(self.objects)} snapshot rows in {self.load_ms} ms")
+
+    def checkpoint(self):
+        """
+        Write only what changed since the previous checkpoint.  No writer
+        lock is taken; each shard's dirty set is swapped under its own small
+        lock, which is all the point-in-time view costs.
+        """
+        t0=time.perf_counter()
+        names, held=self.objects.take_dirty()
+        rows=[(inf["last_seen"], n) for n in names
+              if (inf:=self.objects.get(n)) is not None]
+        if rows:
+            self.store.wait(self.store.touch(rows))
+        self.store.checkpoint()
+        self.ckpt_hold.add(held); self.ckpt_rows.add(len(rows))
+        self.ckpt_dur.add(time.perf_counter()-t0)
+        return len(rows)
+
+    def _mark_dirty(self, n):
+        if self.ckpt_s > 0:
+            self.objects.mark_dirty(n)
+
+    def stats(self) -> dict:
+        return dict(node_id=NODE_ID, is_leader=self.is_leader,
+                    objects=len(self.objects), load_ms=self.load_ms,
+                    storage=self.store.stats(),
+                    heartbeat_fast_path=self.hb_fast,
+                    expiry=dict(armed=len(self.expiry), expired=self.expired_total,
+                                tick_ms=self.expiry_cost.snapshot()),
+                    leases=dict(active=len(self.leases), attached=self.leases.attached(),
+                                keepalives=self.leases.keepalives),
+                    shards=self.objects.stats(),
+                    admission=self.admission.stats(),
+                    feed=self.feed.stats(),
+                    election=dict(self.poller.stats(), lease=self.lease.stats()),
+                    forwarding=self.fwd.stats(),
+                    follower_reads=self.follower.stats(),
+                    replication=(self.shipper or self.replicator).stats(),
+                    anti_entropy=self.ae.stats(),
+                    liveness=dict(self.liveness.stats(), applied=self.live_applied),
+                    replica=dict(leader=self.repl_leader, applied_seq=self.repl_applied,
+                                 apply_ms=self.repl_apply.snapshot(),
+                                 transfer=self.transfer.snapshot(),
+                                 pull_failures=self._pull_brk.trips,
+                                 pull_backoff=self._pull_brk.state),
+                    checkpoint=dict(dirty=self.objects.dirty_count(),
+                                    duration_ms=self.ckpt_dur.snapshot(),
+                                    rows=self.ckpt_rows.snapshot(),
+                                    lock_hold_us=self.ckpt_hold.snapshot()))
 
     # =============== background loops =======================================
     def _schedule_loop(self):
@@ -92,122 +259,693 @@ class ObjectRegistry(pb_grpc.ObjectRepositoryServicer):
 
     def _ttl_gc(self):
         while True:
-            now=time.time(); exp=[]
-            with self.lock:
-                for n,inf in self.objects.items():
-                    if inf["source"]=="local" and now-inf["last_seen"]>self.ttl_seconds:
-                        exp.append(n)
-                for n in exp:
-                    print(f"⚠ TTL expired -> {n}")
-                    self._delete_db(n); del self.objects[n]
-            time.sleep(5)
+            try:
+                self.expire_due()
+            except Exception as e:
+                print("[TTL] error:", e)
+            time.sleep(self.expiry_tick)
+
+    def _deadline(self, n):
+        inf=self.objects.get(n)
+        if inf is None or inf["source"]!="local":
+            return None
+        if inf.get("lease") and self.leases.deadline(inf["lease"]) is not None:
+            return None                           # expires with its lease
+        return inf["last_seen"]+self.ttl_seconds
+
+    def expire_due(self):
+        """One expiry tick: cost follows the entries due, not registry size."""
+        t0=time.perf_counter(); now=time.time()
+        due=self.expiry.due(now, self._deadline)
+        lapsed=self.leases.due(now)
+        if due or lapsed:
+            owner={n: lid for lid, names in lapsed for n in names}
+            # lock only the shards that hold candidates; re-check under them,
+            # a heartbeat may have raced us.  All deletes go out as one batch.
+            with self.objects.locked_many(due+list(owner)) as groups:
+                exp=[]
+                for sh, names in groups.items():
+                    hit=[n for n in names
+                         if ((d:=self._deadline(n)) is not None and d<=now)
+                         or ((inf:=sh.objects.get(n)) and n in owner
+                             and inf.get("lease")==owner[n])]
+                    for n in hit: del sh.objects[n]
+                    if hit: sh.rev += 1
+                    exp += hit
+                self.store.apply([("del", n) for n in exp])
+                self.feed.publish([("del", n, None) for n in exp])
+            gone=set(exp)
+            for n in due:
+                if n not in gone and (d:=self._deadline(n)) is not None:
+                    self.expiry.arm(n, d)
+            self.expired_total += len(exp)
+            if exp: print(f"⚠ TTL expired -> {', '.join(exp[:10])}"
+                          + (f" (+{len(exp)-10} more)" if len(exp)>10 else ""))
+        self.expiry_cost.add(time.perf_counter()-t0)
+        return exp if (due or lapsed) else []
+
+    def _checkpoint_loop(self):
+        while True:
+            time.sleep(self.ckpt_s)
+            try:
+                self.checkpoint()
+            except Exception as e:
+                print("[CHECKPOINT] error:", e)
 
     # ---------------- leader election loop ----------------------------------
     def _elect_loop(self):
+        lease=self.lease
         while True:
+            t0=time.monotonic()
             try:
-                stats=[(NODE_ID, time.time()-START_TS)]
-                for p in self.peers_cfg:
-                    try:
-                        r=self.peer_hb[p["id"]].GetUptime(
-                            empty_pb2.Empty(), timeout=RPC_TIMEOUT)
-                        stats.append((r.node_id, r.uptime_sec))
-                    except Exception:
-                        pass
-                stats.sort(key=lambda x: -x[1])
-                new_leader=stats[0][0]
-
-                if new_leader!=self.leader_id:        # role change
-                    self.leader_id=new_leader
-                    self.is_leader=(NODE_ID==new_leader)
-                    role="PRIMARY" if self.is_leader else "BACKUP"
-                    print(f"[ROLE] now {role}  (leader={self.leader_id})")
+                if lease.enabled and self.is_leader:
+                    lease.push(time.time()-START_TS, self.feed.seq, self._on_beat_ack)
+                elif not lease.enabled or not lease.valid():
+                    if lease.enabled: lease.lapse()
+                    self._elect_round()
+                self._maybe_pull()
             except Exception as e:
                 print("[ELECT] error:", e)
-            time.sleep(ELECT_INT)
+            tick=lease.renew_s if lease.enabled else self.elect_int
+            time.sleep(max(0.0, tick-(time.monotonic()-t0)))
+
+    def _elect_round(self):
+        """Longest uptime among the nodes that answer leads."""
+        stats=[(NODE_ID, time.time()-START_TS)]
+        for pid, r in self.poller.poll().items():
+            stats.append((r.node_id, r.uptime_sec))
+            self.peer_node[pid]=r.node_id
+        stats.sort(key=lambda x: -x[1])
+        self._set_leader(stats[0][0])
+        if self.lease.enabled:                 # its beats take over from here
+            self.lease.grant(stats[0][0], beat=False)
+
+    def _set_leader(self, new_leader):
+        with self._role_lock:
+            if new_leader==self.leader_id:
+                return
+            self.leader_id=new_leader                 # role change
+            self.is_leader=(NODE_ID==new_leader)
+        role="PRIMARY" if self.is_leader else "BACKUP"
+        print(f"[ROLE] now {role}  (leader={self.leader_id})")
+        if not self.is_leader and self.replicator and self.replicator.outbox:
+            self.replicator.outbox.clear()
+
+    def _outranks(self, uptime, node_id):
+        return (time.time()-START_TS, NODE_ID) > (uptime, node_id)
+
+    def on_leader_beat(self, req):
+        """Follower end of LeaderBeat."""
+        mine=time.time()-START_TS
+        if req.node_id != NODE_ID and self.is_leader and self._outranks(req.uptime_sec, req.node_id):
+            self.lease.refused += 1
+            return hb_pb.LeaderBeatAck(node_id=NODE_ID, peer_id=self.lease.peer_id,
+                                       accepted=False, uptime_sec=mine)
+        if req.peer_id: self.peer_node[req.peer_id]=req.node_id
+        self.lease.grant(req.node_id, (req.lease_ms or self.lease.lease_ms)/1000.0)
+        self._set_leader(req.node_id)
+        self.follower.note_head(req.node_id, req.head_seq)
+        return hb_pb.LeaderBeatAck(node_id=NODE_ID, peer_id=self.lease.peer_id,
+                                   accepted=True, uptime_sec=mine)
+
+    def _on_beat_ack(self, pid, ack):
+        self.peer_node[pid]=ack.node_id
+        if not ack.accepted and self.is_leader and not self._outranks(ack.uptime_sec, ack.node_id):
+            print(f"[LEASE] {pid} leads with a longer uptime, stepping down")
+            self.lease.grant(ack.node_id, beat=False)
+            self._set_leader(ack.node_id)
 
     # =============== CRUD RPC  (only leader accepts) ========================
     def _reject_if_backup(self, ctx):
         ctx.set_code(grpc.StatusCode.FAILED_PRECONDITION)
         ctx.set_details("not leader")
 
+    def _forward(self, method, req, ctx, empty):
+        """Backup: hand a client write to the leader, or reject it without one."""
+        pid=self.fwd.target(ctx)
+        if pid is None:
+            return self._reject_if_backup(ctx) or empty
+        return self.fwd.call(pid, method, req, ctx, empty)
+
     def RegisterObject(self, req, ctx):
         if not self.is_leader and not req.is_replication:
-            return self._reject_if_backup(ctx) or pb.RegisterResponse(success=False)
+            return self._forward("RegisterObject", req, ctx, pb.RegisterResponse(success=False))
 
-        info=dict(address=req.object_address,language=req.language,
-                  version=req.version,region=req.region,
-                  last_seen=time.time(),source="local")
-        with self.lock:
-            self.objects[req.object_name]=info; self._save_row(req.object_name,info)
+        t, err=self._register_local(req)
+        if err:
+            ctx.set_code(grpc.StatusCode.NOT_FOUND); ctx.set_details(err)
+            return pb.RegisterResponse(success=False)
+        self.store.wait(t)
         print(f"[REGISTER] {req.object_name}")
 
         # replicate to backups
         if self.is_leader and not req.is_replication:
-            for sid,stub in self.peer_biz.items():
-                try:
-                    stub.RegisterObject(pb.RegisterRequest(
-                        object_name=req.object_name,
-                        object_address=req.object_address,
-                        language=req.language,version=req.version,
-                        region=req.region,is_replication=True), timeout=RPC_TIMEOUT)
-                except Exception: pass
-        return pb.RegisterResponse(success=True)
+            self._replicate("RegisterObject", [self._replica(req)])
+        return pb.RegisterResponse(success=True, revision=self.feed.seq)
+
+    def _register_local(self, req):
+        """Apply a registration in memory and submit it; -> (ticket, error)."""
+        info=dict(address=req.object_address,language=req.language,
+                  version=req.version,region=req.region,
+                  last_seen=time.time(),source="local")
+        with self.objects.locked(req.object_name) as sh:
+            old=sh.objects.get(req.object_name)
+            if req.lease_id:
+                if self.leases.attach(req.lease_id, req.object_name):
+                    info["lease"]=req.lease_id
+                elif not req.is_replication:      # backups may not know the lease: plain TTL
+                    return None, f"lease {req.lease_id} not found"
+            if old and old.get("lease") and old["lease"]!=info.get("lease"):
+                self.leases.detach(old["lease"], req.object_name)
+            sh.objects[req.object_name]=info; sh.rev += 1
+            if self._live is not None: self._live.add(req.object_name)
+            t=self.store.put(req.object_name,info)
+            self.feed.publish([("put", req.object_name, info)])
+        if "lease" not in info:
+            self.expiry.arm(req.object_name, info["last_seen"]+self.ttl_seconds)
+        else:
+            self._lease_liveness(info["lease"], [req.object_name])
+        return t, None
+
+    @staticmethod
+    def _replica(req):
+        return pb.RegisterRequest(object_name=req.object_name,
+                                  object_address=req.object_address,
+                                  language=req.language,version=req.version,
+                                  region=req.region,lease_id=req.lease_id,
+                                  is_replication=True)
 
     def DeregisterObject(self, req, ctx):
         if not self.is_leader and not req.is_replication:
-            return self._reject_if_backup(ctx) or pb.DeregisterResponse(success=False)
+            return self._forward("DeregisterObject", req, ctx, pb.DeregisterResponse(success=False))
 
-        with self.lock:
-            if req.object_name in self.objects:
-                self._delete_db(req.object_name); del self.objects[req.object_name]
+        self.store.wait(self._deregister_local(req.object_name))
         print(f"[DEREGISTER] {req.object_name}")
 
         if self.is_leader and not req.is_replication:
-            for sid,stub in self.peer_biz.items():
-                try:
-                    stub.DeregisterObject(pb.DeregisterRequest(
-                        object_name=req.object_name,is_replication=True),
-                        timeout=RPC_TIMEOUT)
-                except Exception: pass
-        return pb.DeregisterResponse(success=True)
+            self._replicate_deregister([req.object_name])
+        return pb.DeregisterResponse(success=True, revision=self.feed.seq)
+
+    def _deregister_local(self, name):
+        t=None
+        with self.objects.locked(name) as sh:
+            inf=sh.objects.pop(name, None)
+            if self._live is not None: self._live.add(name)
+            if inf is not None:
+                sh.rev += 1
+                if inf.get("lease"): self.leases.detach(inf["lease"], name)
+                t=self.store.delete(name)
+                self.feed.publish([("del", name, None)])
+        return t
+
+    def _replicate_deregister(self, names):
+        self._replicate("DeregisterObject", [pb.DeregisterRequest(
+            object_name=n,is_replication=True) for n in names])
+
+    def _replicate(self, method, reqs):
+        if self.shipper is not None:
+            self.shipper.wait(self.feed.seq)      # our change is at or before this seq
+        else:
+            self.replicator.send(method, reqs, REPL_BATCH[method] if len(reqs) > 1 else None)
+
+    # =============== batches  (one lock round, one commit, one message) =====
+    def BatchRegister(self, req, ctx):
+        if not self.is_leader and not req.is_replication:
+            return self._forward("BatchRegister", req, ctx, pb.BatchRegisterResponse())
+        t, results=self._register_many(req.items, req.is_replication)
+        self.store.wait(t)
+        print(f"[REGISTER] batch of {len(req.items)}")
+        if self.is_leader and not req.is_replication:
+            self._replicate("RegisterObject", [self._replica(r) for r, res
+                                               in zip(req.items, results) if res.success])
+        return pb.BatchRegisterResponse(results=results, revision=self.feed.seq)
+
+    def _register_many(self, reqs, replica=False):
+        """_register_local for a batch; -> (ticket, [ItemResult])."""
+        now=time.time(); results=[]; ops=[]; arm=[]; leased={}
+        with self.objects.locked_many([r.object_name for r in reqs]):
+            for r in reqs:
+                n=r.object_name; sh=self.objects.shard(n)
+                info=dict(address=r.object_address,language=r.language,
+                          version=r.version,region=r.region,last_seen=now,source="local")
+                if r.lease_id:
+                    if self.leases.attach(r.lease_id, n):
+                        info["lease"]=r.lease_id
+                    elif not replica:
+                        results.append(pb.ItemResult(error=f"lease {r.lease_id} not found"))
+                        continue
+                old=sh.objects.get(n)
+                if old and old.get("lease") and old["lease"]!=info.get("lease"):
+                    self.leases.detach(old["lease"], n)
+                sh.objects[n]=info; sh.rev += 1
+                if self._live is not None: self._live.add(n)
+                ops.append(("put", n, info)); results.append(pb.ItemResult(success=True))
+                if "lease" not in info: arm.append(n)
+                else: leased.setdefault(info["lease"], []).append(n)
+            t=self.store.apply(ops) if ops else None
+            self.feed.publish([("put", n, info) for _, n, info in ops])
+        for n in arm:
+            self.expiry.arm(n, now+self.ttl_seconds)
+        for lid, names in leased.items():
+            self._lease_liveness(lid, names)
+        return t, results
+
+    def BatchDeregister(self, req, ctx):
+        if not self.is_leader and not req.is_replication:
+            return self._forward("BatchDeregister", req, ctx, pb.BatchDeregisterResponse())
+        gone, t=self._deregister_many(req.object_name)
+        self.store.wait(t)
+        print(f"[DEREGISTER] batch of {len(req.object_name)}")
+        if self.is_leader and not req.is_replication and gone:
+            self._replicate_deregister(gone)
+        return pb.BatchDeregisterResponse(results=[pb.ItemResult(success=True)
+                                                   for _ in req.object_name],
+                                          revision=self.feed.seq)
+
+    def _deregister_many(self, names):
+        """-> (names actually removed, ticket)."""
+        with self.objects.locked_many(names) as groups:
+            gone=[]
+            for sh, ns in groups.items():
+                hit=[]
+                for n in ns:
+                    inf=sh.objects.pop(n, None)
+                    if self._live is not None: self._live.add(n)
+                    if inf is None: continue
+                    if inf.get("lease"): self.leases.detach(inf["lease"], n)
+                    hit.append(n)
+                if hit: sh.rev += 1
+                gone += hit
+            t=self.store.apply([("del", n) for n in gone]) if gone else None
+            self.feed.publish([("del", n, None) for n in gone])
+        return gone, t
+
+    def BatchGet(self, req, ctx):
+        if why:=self.follower.check(req.min_revision):
+            return self._stale_read("BatchGet", req, ctx, pb.BatchGetResponse(), why)
+        return self._batch_get_local(req)
+
+    def _batch_get_local(self, req):
+        rev=self.follower.revision(); get=self.objects.get
+        if not self.lockfree_reads:
+            with self.objects.locked_many(req.object_name):
+                infs=[get(n) for n in req.object_name]
+        else:
+            infs=[get(n) for n in req.object_name]
+        return pb.BatchGetResponse(object_address=[i["address"] if i else "" for i in infs],
+                                   revision=rev)
+
+    def BatchHeartbeat(self, req, ctx):
+        ok, t=self._heartbeat_many(req.object_name)
+        self.store.wait(t)
+        return pb.BatchHeartbeatResponse(ok=ok)
+
+    def _heartbeat_many(self, names):
+        """-> ([ok per name], ticket); only the locked path writes rows."""
+        now=time.time(); get=self.objects.get
+        if self.hb_fast:
+            ok=[]
+            for n in names:
+                inf=get(n)
+                if inf is not None:
+                    inf["last_seen"]=now; self._mark_dirty(n); self.liveness.touch(n, now)
+                ok.append(inf is not None)
+            return ok, None
+        with self.objects.locked_many(names):
+            ok=[]; ops=[]
+            for n in names:
+                inf=get(n)
+                if inf is not None:
+                    inf["last_seen"]=now; ops.append(("put", n, inf))
+                    self.liveness.touch(n, now)
+                ok.append(inf is not None)
+            return ok, self.store.apply(ops) if ops else None
+
+    # =============== shared leases (leader only) ============================
+    def LeaseGrant(self, req, ctx):
+        if not self.is_leader:
+            return self._reject_if_backup(ctx) or pb.LeaseGrantResponse()
+        lease=self.leases.grant(req.ttl_sec)
+        print(f"[LEASE] grant {lease.id} ttl={lease.ttl}s")
+        return pb.LeaseGrantResponse(lease_id=lease.id, ttl_sec=lease.ttl)
+
+    def LeaseKeepAlive(self, req, ctx):
+        if not self.is_leader:
+            return self._reject_if_backup(ctx) or pb.LeaseKeepAliveResponse(ok=False)
+        lease, t=self._keepalive_local(req.lease_id)
+        self.store.wait(t)
+        return pb.LeaseKeepAliveResponse(ok=lease is not None,
+                                         ttl_sec=lease.ttl if lease else 0)
+
+    def _keepalive_local(self, lid):
+        """Renew a lease and refresh last_seen on its objects; -> (lease|None, ticket)."""
+        lease=self.leases.keepalive(lid)
+        if lease is None:
+            return None, None
+        names=self.leases.names(lid)
+        _, t=self._heartbeat_many(names)
+        self._lease_liveness(lid, names)
+        return lease, t
+
+    def _lease_liveness(self, lid, names):
+        """
+        Backups have no lease table and expire leased objects by plain TTL:
+        ship them a last_seen that keeps each object until the lease runs out.
+        """
+        d=self.leases.deadline(lid)
+        if d is None: return
+        ts=max(time.time(), d-self.ttl_seconds)
+        for n in names: self.liveness.touch(n, ts)
+
+    def LeaseRevoke(self, req, ctx):
+        if not self.is_leader:
+            return self._reject_if_backup(ctx) or pb.LeaseRevokeResponse(success=False)
+        r=self._revoke_local(req.lease_id)
+        if r is None:
+            return pb.LeaseRevokeResponse(success=False)
+        gone, t=r
+        self.store.wait(t)
+        print(f"[LEASE] revoke {req.lease_id} -> {len(gone)} objects")
+        self._replicate_deregister(gone)
+        return pb.LeaseRevokeResponse(success=True, removed=len(gone))
+
+    def _revoke_local(self, lid):
+        """Drop a lease and its objects; -> (removed names, ticket) or None."""
+        names=self.leases.revoke(lid)
+        if names is None:
+            return None
+        with self.objects.locked_many(names) as groups:
+            gone=[]
+            for sh, ns in groups.items():
+                hit=[n for n in ns
+                     if (inf:=sh.objects.get(n)) and inf.get("lease")==lid]
+                for n in hit: del sh.objects[n]
+                if hit: sh.rev += 1
+                gone += hit
+            t=self.store.apply([("del", n) for n in gone])
+            self.feed.publish([("del", n, None) for n in gone])
+        return gone, t
+
+    # =============== reads (any node, no lock) ==============================
+    # a backup answers within follower_max_staleness_ms (follower.py)
+    def _stale_read(self, method, req, ctx, empty, why):
+        if self.follower.action == "forward" and (pid:=self.fwd.target(ctx, writes=False)):
+            return self.fwd.call(pid, method, req, ctx, empty)
+        self.follower.refused += 1
+        ctx.set_code(grpc.StatusCode.UNAVAILABLE); ctx.set_details(f"follower read: {why}")
+        return empty
 
     def GetObject(self, req, ctx):
-        with self.lock:
-            inf=self.objects.get(req.object_name)
-            return pb.GetResponse(object_address=inf["address"] if inf else "")
+        if why:=self.follower.check(req.min_revision):
+            return self._stale_read("GetObject", req, ctx, pb.GetResponse(), why)
+        return self._get_local(req)
+
+    def _get_local(self, req):
+        rev=self.follower.revision()                  # before the read: data is at least this
+        if not self.lockfree_reads:
+            with self.objects.locked(req.object_name) as sh:
+                inf=sh.objects.get(req.object_name)
+        else:
+            inf=self.objects.get(req.object_name)     # dict.get is atomic under the GIL
+        return pb.GetResponse(object_address=inf["address"] if inf else "", revision=rev)
 
     def ListObjects(self, req, ctx):
-        with self.lock:
-            return pb.ObjectListResponse(objects=[
-                pb.ObjectInfo(object_name=n,
+        if why:=self.follower.check(min_revision(req, ctx)):
+            return self._stale_read("ListObjects", req, ctx, pb.ObjectListResponse(), why)
+        return self._list_local()
+
+    def _list_local(self):
+        shards=self.objects.shards; seq=self.follower.revision()
+        if not self.lockfree_reads:
+            out=[]
+            for sh in shards:
+                with sh.lock: out += self._build_infos(sh.objects)
+            return pb.ObjectListResponse(objects=out, revision=seq)
+        revs, built, resp=self._list_snap
+        now=time.monotonic()
+        if revs == tuple(sh.rev for sh in shards) and now-built < self.list_max_age:
+            return resp
+        # rebuild only the shards whose revision moved; each is a C-level copy
+        revs=[]; out=[]
+        for sh in shards:
+            rev, at, infos=sh.list_cache
+            if rev != sh.rev or now-at >= self.list_max_age:
+                rev=sh.rev; infos=self._build_infos(sh.objects.copy())
+                sh.list_cache=(rev, now, infos)           # single reference swap
+            revs.append(rev); out += infos
+        resp=pb.ObjectListResponse(objects=out, revision=seq)
+        self._list_snap=(tuple(revs), now, resp)
+        return resp
+
+    @staticmethod
+    def _build_infos(view):
+        return [pb.ObjectInfo(object_name=n,
                               object_address=inf["address"],
                               language=inf["language"],
                               version =inf["version"],
                               region  =inf["region"],
                               last_seen=inf["last_seen"])
-                for n,inf in self.objects.items()])
+                for n,inf in view.items()]
 
     def Heartbeat(self, req, ctx):
-        with self.lock:
-            if req.object_name in self.objects:
-                self.objects[req.object_name]["last_seen"]=time.time()
-                self._save_row(req.object_name,self.objects[req.object_name])
-                print("[HEARTBEAT]", req.object_name, "ok")
-                return pb.HeartbeatAck(ok=True)
-        return pb.HeartbeatAck(ok=False)
-
-    # db helpers -------------------------------------------------------------
-    def _save_row(self, n, inf):
-        cur=self.conn.cursor()
-        cur.execute("REPLACE INTO objects VALUES (?,?,?,?,?,?)",
-                    (n,inf["address"],inf["language"],inf["version"],
-                     inf["region"],inf["last_seen"]))
-        self.conn.commit()
-
-    def _delete_db(self, n):
-        cur=self.conn.cursor(); cur.execute("DELETE FROM objects WHERE name=?", (n,))
-        self.conn.commit()
+        if not self.hb_fast:
+            return self._heartbeat_locked(req)
+        # dict.get and the float store are atomic under the GIL, so liveness
+        # never queues behind writers, the sweeper or a commit
+        inf=self.objects.get(req.object_name)
+        if inf is None:
+            return pb.HeartbeatAck(ok=False)
+        inf["last_seen"]=now=time.time(); self._mark_dirty(req.object_name)
+        self.liveness.touch(req.object_name, now)
+        return pb.HeartbeatAck(ok=True)
+
+    def TouchObjects(self, req, ctx):
+        """Bulk heartbeat fast path (read workers' pings, the leader's liveness sync)."""
+        k=0; fwd=not req.is_replication
+        for n, ts in zip(req.object_name, req.last_seen):
+            inf=self.objects.get(n)
+            if inf is None: continue
+            if ts > inf["last_seen"]: inf["last_seen"]=ts
+            self._mark_dirty(n); k += 1
+            if fwd: self.liveness.touch(n, inf["last_seen"])
+        if req.is_replication: self.live_applied += k
+        return pb.TouchResponse(refreshed=k)
+
+    # =============== change feed  (read workers follow the owner) ===========
+    def WatchChanges(self, req, ctx):
+        sub=self.feed.subscribe(req.subscriber or ctx.peer())
+        try:
+            for b in self._feed_snapshot():
+                yield self._stamped(b)
+            while ctx.is_active() and not sub.overflowed:
+                evs=sub.take(timeout=self.watch_keep_s)      # none: an empty keep-alive
+                yield self._stamped(pb.ChangeBatch(events=[self._change_event(*e) for e in evs]))
+        finally:
+            self.feed.unsubscribe(sub)
+
+    def _stamped(self, b):
+        """A feed batch carries our staleness, so workers can bound theirs."""
+        b.staleness_ms=self.follower.staleness()*1000
+        return b
+
+    def _feed_snapshot(self, chunk_bytes=0):
+        """
+        RESET, every object as a PUT, SYNCED, in batches of at most
+        chunk_bytes (well under gRPC's 4 MB message cap).  Taken after
+        subscribing, so changes racing the copy arrive again as live events.
+        """
+        E=pb.ChangeEvent; mark=self.feed.seq      # every change <= mark is in the copy
+        limit=chunk_bytes or self.chunk_bytes
+        yield pb.ChangeBatch(events=[E(kind=E.RESET, seq=mark)])
+        batch=[]; size=0
+        for n, inf in self.objects.items():
+            ev=self._change_event(0, "put", n, inf); k=ev.ByteSize()+4   # + tag, length
+            if batch and size+k > limit:
+                yield pb.ChangeBatch(events=batch); batch=[]; size=0
+            batch.append(ev); size += k
+        batch.append(E(kind=E.SYNCED, seq=mark))
+        yield pb.ChangeBatch(events=batch)
+
+    @staticmethod
+    def _change_event(seq, kind, n, inf):
+        E=pb.ChangeEvent
+        if kind == "del":
+            return E(kind=E.DELETE, seq=seq, object=pb.ObjectInfo(object_name=n))
+        return E(kind=E.PUT, seq=seq, object=pb.ObjectInfo(
+            object_name=n, object_address=inf["address"], language=inf["language"],
+            version=inf["version"], region=inf["region"], last_seen=inf["last_seen"]))
+
+    # =============== state transfer =========================================
+    def FetchSnapshot(self, req, ctx):
+        """Leader: the whole registry for a joining backup, chunk by chunk."""
+        if not self.is_leader:
+            ctx.abort(grpc.StatusCode.FAILED_PRECONDITION, "not leader")
+        mark=None
+        for b in self._feed_snapshot(req.chunk_bytes):
+            if mark is None: mark=b.events[0].seq
+            yield pb.ReplBatch(leader_id=NODE_ID, events=b.events, head_seq=mark)
+        print(f"[SYNC] snapshot -> {req.node_id or ctx.peer()}")
+
+    def SyncState(self, req, ctx):
+        """Push-style merge of a full list (the Java server's semantics); a leader write."""
+        if not self.is_leader:
+            return self._forward("SyncState", req, ctx, empty_pb2.Empty())
+        self._sync_local(req)
+        print(f"[SYNC] Received {len(req.objects)} objects.")
+        self._replicate("RegisterObject", [self._synced(o) for o in req.objects])
+        return empty_pb2.Empty()
+
+    def _sync_local(self, req):
+        E=pb.ChangeEvent          # one replica batch: one lock round, one commit, on the feed
+        self._apply_replica(pb.ReplBatch(events=[E(kind=E.PUT, object=o) for o in req.objects]))
+
+    @staticmethod
+    def _synced(o):
+        return pb.RegisterRequest(object_name=o.object_name,object_address=o.object_address,
+                                  language=o.language,version=o.version,region=o.region,
+                                  is_replication=True)
+
+    def _maybe_pull(self):
+        """Unary transport: copy each new leader's state once, in the background."""
+        if self.is_leader:
+            self._synced_from=None            # we may diverge from it from here on
+        if (self.shipper is not None or self.is_leader or self._pulling
+                or self.leader_id in (None, self._synced_from)):
+            return
+        pid=self._leader_peer()
+        if pid is None:
+            return
+        if self._pull_from != self.leader_id:  # a new leader starts without backoff
+            self._pull_brk.success(); self._pull_from=self.leader_id
+        if not self._pull_brk.allow():
+            return
+        self._pulling=True
+        threading.Thread(target=self._pull_snapshot, args=(pid, self.leader_id),
+                         daemon=True).start()
+
+    def _leader_peer(self):
+        """Config id of the current leader, once election has seen it."""
+        return next((p for p, nid in self.peer_node.items() if nid == self.leader_id), None)
+
+    def _pull_snapshot(self, pid, leader):
+        self._live=set()        # replicated writes landing meanwhile beat the copy
+        try:
+            for b in self.peer_biz[pid].FetchSnapshot(
+                    pb.SnapshotRequest(node_id=NODE_ID, chunk_bytes=self.chunk_bytes),
+                    timeout=self.cfg.get("snapshot_timeout_sec", 300)):
+                self._apply_replica(b, source="pull")
+            self._synced_from=leader; self._pull_brk.success()
+            x=self.transfer.last
+            print(f"[SYNC] {x['objects']} objects from {pid}: {x['bytes']} B in"
+                  f" {x['chunks']} chunks, {x['copy_ms']} ms ({x['mb_per_s']} MB/s)")
+        except grpc.RpcError as e:
+            b=self._pull_brk; b.failure()
+            print(f"[SYNC] snapshot from {pid} failed ({e.code().name});"
+                  f" retry in ~{b.until-time.monotonic():.1f}s")
+            with self._repl_lock:
+                self._resync=None; self.transfer.cur=None
+        finally:
+            self._live=None; self._pulling=False
+
+    # =============== anti-entropy (any node serves its own tree) ============
+    def GetDigests(self, req, ctx):
+        resp, err=self.ae.digests(req)
+        if err: ctx.abort(*err)
+        return resp
+
+    def FetchBuckets(self, req, ctx):
+        yield from self.ae.bucket_contents(req)
+
+    # =============== log shipping: backup side =============================
+    def Replicate(self, batches, ctx):
+        for b in batches:
+            if b.events:
+                self._apply_replica(b)
+            yield pb.ReplAck(applied_seq=self.repl_applied, leader_id=self.repl_leader)
+
+    def _apply_replica(self, b, source="stream"):
+        """One shipped batch: in seq order, one lock round, one store transaction."""
+        E=pb.ChangeEvent; t0=time.perf_counter(); leader, events=b.leader_id, b.events
+        if leader and b.head_seq: self.follower.note_head(leader, b.head_seq)
+        with self._repl_lock:
+            ops=[]; pub=[]; arm=[]; synced=None
+            applied=self.repl_applied if self.repl_leader == leader else 0
+            names=[ev.object.object_name for ev in events if ev.kind in (E.PUT, E.DELETE)]
+            with self.objects.locked_many(names):
+                for ev in events:
+                    if ev.kind == E.RESET:
+                        self.repl_leader=""; self.repl_applied=applied=0
+                        self._resync=set(); self.transfer.begin(source); continue
+                    if ev.kind == E.SYNCED:
+                        synced=ev.seq; continue
+                    if ev.seq and ev.seq <= applied:
+                        continue                              # already have it
+                    n=ev.object.object_name; sh=self.objects.shard(n)
+                    if self._resync is not None: self._resync.add(n)
+                    if not ev.seq and self._live and n in self._live:
+                        continue                              # a live write beat the copy
+                    old=sh.objects.get(n)
+                    if old and old.get("lease"): self.leases.detach(old["lease"], n)
+                    if ev.kind == E.PUT:
+                        o=ev.object
+                        info=dict(address=o.object_address,language=o.language,
+                                  version=o.version,region=o.region,
+                                  last_seen=o.last_seen or time.time(),source="local")
+                        sh.objects[n]=info; ops.append(("put", n, info))
+                        pub.append(("put", n, info)); arm.append((n, info["last_seen"]))
+                    elif sh.objects.pop(n, None) is not None:
+                        ops.append(("del", n)); pub.append(("del", n, None))
+                    sh.rev += 1
+                    if ev.seq: applied=ev.seq
+                t=self.store.apply(ops); self.feed.publish(pub)
+            if self._resync is not None:
+                self.transfer.chunk(len(names), b.ByteSize())
+            if synced is not None:
+                if self._resync is not None:          # None: a second copy raced this one
+                    self._drop_unseen(self._resync | (self._live or set())); self._resync=None
+                self.repl_leader=leader; applied=synced; self.transfer.copied()
+            if self.repl_leader == leader:
+                self.repl_applied=applied
+                x=self.transfer.cur             # caught up: the backlog behind the copy is in
+                if x and x["copy_s"] is not None and applied >= b.head_seq:
+                    self.transfer.caught_up()
+        for n, ts in arm:
+            self.expiry.arm(n, ts+self.ttl_seconds)
+        self.store.wait(t)
+        self.repl_apply.add(time.perf_counter()-t0)
+
+    def _drop_unseen(self, seen):
+        """End of a snapshot: whatever the leader did not send is gone there."""
+        stale=[n for n, _ in self.objects.items() if n not in seen]
+        with self.objects.locked_many(stale) as groups:
+            gone=[]
+            for sh, ns in groups.items():
+                hit=[n for n in ns if n in sh.objects]
+                for n in hit:
+                    inf=sh.objects.pop(n)
+                    if inf.get("lease"): self.leases.detach(inf["lease"], n)
+                if hit: sh.rev += 1
+                gone += hit
+            self.store.wait(self.store.apply([("del", n) for n in gone]))
+            self.feed.publish([("del", n, None) for n in gone])
+
+    def _heartbeat_locked(self, req):
+        """Original path: row rewrite + commit per heartbeat."""
+        ok, t=self._heartbeat_put(req.object_name)
+        if not ok:
+            return pb.HeartbeatAck(ok=False)
+        self.store.wait(t)
+        print("[HEARTBEAT]", req.object_name, "ok")
+        return pb.HeartbeatAck(ok=True)
+
+    def _heartbeat_put(self, name):
+        with self.objects.locked(name) as sh:
+            inf=sh.objects.get(name)
+            if inf is None:
+                return False, None
+            inf["last_seen"]=time.time()
+            self.liveness.touch(name, inf["last_seen"])
+            return True, self.store.put(name,inf)
 
 
 # ==========================================================================
@@ -218,6 +956,7 @@ class HeartbeatServicer(hb_grpc.HeartbeatServiceServicer):
     Separate lightweight service on :50052
     - Ping     : used by clients (only leader replies OK)
     - GetUptime: used among servers for leader election
+    - LeaderBeat: leader -> followers lease renewal
     """
 
     def __init__(self):
@@ -241,24 +980,50 @@ class HeartbeatServicer(hb_grpc.HeartbeatServiceServicer):
         return hb_pb.UptimeInfo(node_id=NODE_ID,
                                 uptime_sec=time.time()-START_TS)
 
+    def LeaderBeat(self, req, ctx):
+        if self._registry is None:
+            ctx.abort(grpc.StatusCode.UNAVAILABLE, "starting")
+        return self._registry.on_leader_beat(req)
+
+    # -------- operator stats -----------------------------------------------
+    def GetStats(self, req, ctx):
+        body=self._registry.stats() if self._registry else {}
+        return hb_pb.StatsInfo(node_id=NODE_ID, json=json.dumps(body))
+
 
 # ============================ main =========================================
-def serve():
-    with open("config.json", encoding="utf-8") as f:
-        cfg=json.load(f)
+def serve(cfg: dict | None = None):
+    if cfg is None:
+        with open("config.json", encoding="utf-8") as f:
+            cfg=json.load(f)
+    if cfg.get("role", "voter") == "observer":
+        from observer import serve_observer   # read replica outside election and write path
+        return serve_observer(cfg)
+    if cfg.get("server_mode", "thread") == "aio":
+        from aio_server import serve_aio      # coroutine handlers on one event loop
+        return serve_aio(cfg)
 
     hb_servicer = HeartbeatServicer()
     reg         = ObjectRegistry(cfg, hb_servicer)
 
     # business :50051
-    biz_srv = grpc.server(ThreadPoolExecutor(max_workers=10))
+    gate    = dict(interceptors=[AdmissionInterceptor(reg.admission)],
+                   maximum_concurrent_rpcs=reg.admission.max_rpcs)
+    workers = cfg.get("read_workers", 0)
+    if workers:                               # port is shared with the read workers
+        gate["options"]=[("grpc.so_reuseport", 1)]
+    biz_srv = grpc.server(ThreadPoolExecutor(max_workers=cfg.get("biz_workers", 10)), **gate)
     pb_grpc.add_ObjectRepositoryServicer_to_server(reg, biz_srv)
     biz_srv.add_insecure_port(cfg["self_address"])
     biz_srv.start()
     print("✅ biz @", cfg["self_address"])
+    if workers:
+        from workers import owner_server, start_read_workers
+        own_srv = owner_server(reg, cfg)
+        start_read_workers(cfg)
 
     # heartbeat :50052
-    hb_srv = grpc.server(ThreadPoolExecutor(max_workers=4))
+    hb_srv = grpc.server(ThreadPoolExecutor(max_workers=cfg.get("hb_workers", 4)), **gate)
     hb_grpc.add_HeartbeatServiceServicer_to_server(hb_servicer, hb_srv)
     hb_srv.add_insecure_port(cfg["hb_address"])
     hb_srv.start()
@@ -0,0 +1,178 @@
+# ==============================================================
+#  replication.py
+#  leader -> backups fan-out with a selectable acknowledgement mode
+#
+#  Every peer gets the same requests concurrently.  Per peer, requests
+#  go through `lanes` single-thread queues picked by object name, so two
+#  writes to one name always reach a backup in the order they were made
+#  while unrelated names replicate in parallel.  A batch write goes to
+#  each peer as one batch RPC: it takes its place in every lane its names
+#  hash to, and those lanes hold there until it is sent, so it neither
+#  overtakes nor is overtaken by single writes to the same names.
+#
+#  ack modes  (config key "replication_ack")
+#    async    : return at once, replication runs behind the response
+#    one      : wait for the first backup to apply it
+#    majority : wait until leader + backups form a majority
+#    all      : wait for every backup (the old sequential semantics)
+#  A write whose quorum is not reached still succeeds locally; the miss
+#  is counted as a shortfall, and with an outbox attached (outbox.py)
+#  whatever a peer did not take is queued and retried for it.
+# ==============================================================
+
+import threading, time
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import RollingStat
+
+ACK_MODES = ("async", "one", "majority", "all")
+
+
+def needed_acks(mode: str, peers: int) -> int:
+    """Backup acks `mode` requires; the leader itself is one vote."""
+    return {"async": 0, "one": min(1, peers), "majority": (peers+1)//2, "all": peers}[mode]
+
+
+class _Joint:
+    """One batch RPC queued in several lanes: the last lane to reach it sends it."""
+
+    def __init__(self, lanes: int):
+        self.left = lanes
+        self.lock = threading.Lock()
+        self.sent = threading.Event()
+
+    def arrive(self) -> bool:
+        with self.lock:
+            self.left -= 1
+            return self.left == 0
+
+
+class _Round:
+    """Acks for one send(): a peer acks once all of its lane batches succeeded."""
+
+    def __init__(self, parts: dict):
+        self.left  = dict(parts)           # peer -> lane batches outstanding
+        self.ok    = {p: True for p in parts}
+        self.acked = 0
+        self.done  = 0
+        self.cv    = threading.Condition()
+
+    def finish(self, pid, ok):
+        with self.cv:
+            self.ok[pid] &= ok; self.left[pid] -= 1
+            if self.left[pid] == 0:
+                self.done += 1; self.acked += self.ok[pid]
+                self.cv.notify_all()
+
+    def wait(self, need):
+        with self.cv:
+            self.cv.wait_for(lambda: self.acked >= need or self.done == len(self.left))
+            return self.acked >= need
+
+
+class Replicator:
+
+    def __init__(self, stubs: dict, mode: str = "all", timeout: float = 1.0, lanes: int = 4):
+        if mode not in ACK_MODES:
+            raise ValueError(f"unknown replication_ack {mode!r} (want one of {ACK_MODES})")
+        self.stubs   = stubs
+        self.mode    = mode
+        self.timeout = timeout
+        self.outbox  = None                # outbox.Outbox, set by the registry
+        self._submit = threading.Lock()    # joints take the same spot in every lane
+        self._lanes  = {pid: [ThreadPoolExecutor(1, thread_name_prefix=f"repl-{pid}-{k}")
+                              for k in range(max(1, lanes))] for pid in stubs}
+        # metrics ------------------------------------------------------------
+        self.peer_lat  = {pid: RollingStat() for pid in stubs}    # ms per RPC
+        self.peer_err  = {pid: 0 for pid in stubs}
+        self.ack_wait  = RollingStat()                            # ms a writer waited
+        self.shortfall = 0
+
+    def needed(self) -> int:
+        return needed_acks(self.mode, len(self.stubs))
+
+    def record(self, pid, seconds):
+        """One RPC to `pid`: its latency, or None if it failed."""
+        if seconds is None: self.peer_err[pid] += 1
+        else:               self.peer_lat[pid].add(seconds)
+
+    # =============== send ===================================================
+    def send(self, method: str, reqs, batch=None) -> bool:
+        """
+        Replicate `reqs` (each has object_name) to every peer; -> quorum reached.
+        batch=(rpc, build): each peer gets the lot as one rpc(build(reqs)).
+        """
+        if not self.stubs or not reqs:
+            return True
+        t0=time.perf_counter(); lanes=len(next(iter(self._lanes.values())))
+        groups={}
+        for r in reqs:
+            groups.setdefault(hash(r.object_name) % lanes, []).append(r)
+        rnd=_Round({pid: 1 if batch else len(groups) for pid in self.stubs})
+        with self._submit:
+            for pid, stub in self.stubs.items():
+                if batch:
+                    j=_Joint(len(groups)); call=getattr(stub, batch[0])
+                    for k in groups:
+                        self._lanes[pid][k].submit(self._join, j, rnd, pid, method, call,
+                                                   reqs, batch[1])
+                    continue
+                call=getattr(stub, method)
+                for k, rs in groups.items():
+                    self._lanes[pid][k].submit(self._run, rnd, pid, method, call, rs)
+        need=self.needed()
+        if need == 0:
+            return True
+        ok=rnd.wait(need)
+        self.ack_wait.add(time.perf_counter()-t0)
+        if not ok: self.shortfall += 1
+        return ok
+
+    def _run(self, rnd, pid, method, call, reqs):
+        ok=True; ob=self.outbox
+        for i, r in enumerate(reqs):
+            if ob is not None and ob.busy(pid):       # never overtake queued writes
+                ob.put(pid, method, reqs[i:]); ok=False; break
+            t0=time.perf_counter()
+            try:
+                call(r, timeout=self.timeout)
+                self.record(pid, time.perf_counter()-t0)
+            except Exception:
+                self.record(pid, None); ok=False
+                if ob is not None:
+                    ob.put(pid, method, reqs[i:]); break
+        rnd.finish(pid, ok)
+
+    def _join(self, j, *args):
+        """Hold this lane until the batch is sent; the last lane in sends it."""
+        if not j.arrive():
+            j.sent.wait(); return
+        try:
+            self._run_batch(*args)
+        finally:
+            j.sent.set()
+
+    def _run_batch(self, rnd, pid, method, call, reqs, build):
+        """One message for the lot; the outbox still queues it per object (`method`)."""
+        ob=self.outbox
+        if ob is not None and ob.busy(pid):
+            ob.put(pid, method, reqs); rnd.finish(pid, False); return
+        t0=time.perf_counter(); ok=True
+        try:
+            call(build(reqs), timeout=self.timeout)
+            self.record(pid, time.perf_counter()-t0)
+        except Exception:
+            self.record(pid, None); ok=False
+            if ob is not None: ob.put(pid, method, reqs)
+        rnd.finish(pid, ok)
+
+    # =============== observability ===========================================
+    def stats(self) -> dict:
+        return dict(ack=self.mode, needed=self.needed(), shortfall=self.shortfall,
+                    ack_wait_ms=self.ack_wait.snapshot(),
+                    peers={pid: dict(latency_ms=self.peer_lat[pid].snapshot(),
+                                     errors=self.peer_err[pid],
+                                     queued=sum(ex._work_queue.qsize()
+                                                for ex in self._lanes[pid]),
+                                     outbox=self.outbox.stats(pid) if self.outbox else None)
+                           for pid in self.stubs})
@@ -0,0 +1,126 @@
+# ==============================================================
+#  shards.py
+#  hash-partitioned object map for ObjectRegistry
+#
+#  Each shard owns its dict, its writer lock, its dirty set and a
+#  revision counter.  Single-name operations lock one shard; whole-
+#  registry work (list, checkpoint, expiry) walks shard by shard and
+#  never holds more than the shards it is actually changing.
+# ==============================================================
+
+import threading, time
+from contextlib import contextmanager
+
+from metrics import RollingStat
+
+
+class Shard:
+    __slots__ = ("objects", "lock", "dirty", "dirty_lock", "rev", "list_cache",
+                 "acquired", "contended", "wait")
+
+    def __init__(self):
+        self.objects    = {}
+        self.lock       = threading.Lock()     # writers of this shard
+        self.dirty      = set()
+        self.dirty_lock = threading.Lock()     # heartbeats never take self.lock
+        self.rev        = 0                    # bumped by every write, under lock
+        self.list_cache = (-1, 0.0, ())        # (rev, built_at, [ObjectInfo])
+        self.acquired   = 0
+        self.contended  = 0
+        self.wait       = RollingStat(window=512)
+
+
+class ShardedMap:
+    """dict-like facade; reads are lock-free, writers go through locked()."""
+
+    def __init__(self, n: int = 16):
+        self.shards = [Shard() for _ in range(max(1, n))]
+
+    def shard(self, name) -> Shard:
+        return self.shards[hash(name) % len(self.shards)]
+
+    # =============== dict facade =============================================
+    def get(self, name, default=None):
+        return self.shard(name).objects.get(name, default)
+
+    def __contains__(self, name):
+        return name in self.shard(name).objects
+
+    def __getitem__(self, name):
+        return self.shard(name).objects[name]
+
+    def __setitem__(self, name, inf):
+        self.shard(name).objects[name]=inf
+
+    def __delitem__(self, name):
+        del self.shard(name).objects[name]
+
+    def pop(self, name, default=None):
+        return self.shard(name).objects.pop(name, default)
+
+    def __len__(self):
+        return sum(len(s.objects) for s in self.shards)
+
+    def items(self):
+        """Shard-by-shard view; each shard is copied atomically, not the whole map."""
+        for s in self.shards:
+            yield from s.objects.copy().items()
+
+    # =============== locking =================================================
+    def _acquire(self, s: Shard):
+        if not s.lock.acquire(blocking=False):
+            t0=time.perf_counter(); s.lock.acquire()
+            s.contended += 1; s.wait.add(time.perf_counter()-t0)
+        s.acquired += 1
+
+    @contextmanager
+    def locked(self, name):
+        s=self.shard(name); self._acquire(s)
+        try:
+            yield s
+        finally:
+            s.lock.release()
+
+    @contextmanager
+    def locked_many(self, names):
+        """
+        Lock every shard touched by `names` (in shard order, so two callers
+        can never deadlock) and yield {shard: [names]}.
+        """
+        groups={}
+        for n in names:
+            groups.setdefault(self.shard(n), []).append(n)
+        order=sorted(groups, key=self.shards.index)
+        for s in order: self._acquire(s)
+        try:
+            yield groups
+        finally:
+            for s in reversed(order): s.lock.release()
+
+    # =============== dirty tracking ==========================================
+    def mark_dirty(self, name):
+        s=self.shard(name)
+        with s.dirty_lock:
+            s.dirty.add(name)
+
+    def take_dirty(self):
+        """Swap out every shard's dirty set; -> (names, longest single hold in s)."""
+        names=[]; hold=0.0
+        for s in self.shards:
+            t0=time.perf_counter()
+            with s.dirty_lock:
+                d, s.dirty = s.dirty, set()
+            hold=max(hold, time.perf_counter()-t0); names.extend(d)
+        return names, hold
+
+    def dirty_count(self):
+        return sum(len(s.dirty) for s in self.shards)
+
+    # =============== observability ===========================================
+    def stats(self) -> dict:
+        acq=[s.acquired for s in self.shards]; con=[s.contended for s in self.shards]
+        return dict(count=len(self.shards),
+                    sizes=[len(s.objects) for s in self.shards],
+                    acquired=acq, contended=con,
+                    contention_ratio=round(sum(con)/max(1, sum(acq)), 4),
+                    wait_ms_p99=[s.wait.snapshot().get("p99", 0) for s in self.shards])
@@ -0,0 +1,227 @@
+# ==============================================================
+#  shipping.py
+#  streaming log shipping  (config "replication_transport": "stream")
+#
+#  The leader's change feed is already a sequence-numbered log of every
+#  mutation (changefeed.py).  Each backup gets one long-lived Replicate
+#  stream fed from its own feed subscription:
+#
+#    leader -> backup : ReplBatch, a run of ChangeEvents in seq order
+#    backup -> leader : ReplAck, the highest seq it has applied (cumulative)
+#
+#  A batch leaves immediately when nothing is in flight to that peer;
+#  while one is, new changes coalesce for up to repl_batch_ms /
+#  repl_batch_max events, and at most repl_max_inflight unacked batches
+#  are outstanding.  On (re)connect the backup's first ack says what it
+#  already has; the leader resumes after that seq if its subscription
+#  still covers the gap and otherwise resends a full snapshot
+#  (RESET, PUTs in snapshot_chunk_kb chunks, SYNCED) before going live
+#  again.  Every batch carries the leader's head seq so the backup can
+#  tell when it has caught up.
+#
+#  Writers wait for replication_ack backups to ack their seq, exactly
+#  like the unary fan-out in replication.py.
+# ==============================================================
+
+import asyncio, queue, threading, time
+from collections import deque
+
+import grpc
+import object_repository_pb2 as pb
+
+from metrics     import RollingStat
+from replication import ACK_MODES, needed_acks
+from storage     import _resolve
+
+
+class PeerStream:
+    """One backup: a feed subscription, its unacked batches and the stream."""
+
+    def __init__(self, shipper, pid, stub):
+        self.sh        = shipper
+        self.pid       = pid
+        self.stub      = stub
+        self.sub       = None
+        self.base      = 0                 # feed seq the subscription starts after
+        self.unacked   = deque()           # (last seq, sent_at, ReplBatch)
+        self.acked_seq = 0
+        self.connected = False
+        self._greeted  = False
+        self._hello    = queue.Queue(1)
+        self._cv       = threading.Condition()
+        # metrics ------------------------------------------------------------
+        self.batches    = 0
+        self.events     = 0
+        self.resyncs    = 0
+        self.snap_bytes = 0
+        self.resync_dur = RollingStat()     # ms to send RESET .. SYNCED
+        self.batch_rows = RollingStat(scale=1)
+        self.ack_lat    = RollingStat()     # ms from send to cumulative ack
+        threading.Thread(target=self._run, daemon=True, name=f"ship-{pid}").start()
+
+    def _reset(self):
+        if self.sub is not None:
+            self.sh.reg.feed.unsubscribe(self.sub)
+        self.sub=None; self.unacked.clear(); self.acked_seq=0
+
+    # =============== connection loop ========================================
+    def _run(self):
+        reg=self.sh.reg; backoff=0.1
+        while True:
+            if not reg.is_leader:
+                if self.sub is not None: self._reset()
+                time.sleep(0.2); continue
+            if self.sub is None or self.sub.overflowed:
+                self._reset()
+                self.sub=reg.feed.subscribe(f"repl-{self.pid}"); self.base=reg.feed.seq
+            self._greeted=False; self._hello=queue.Queue(1)
+            try:
+                for ack in self.stub.Replicate(self._requests()):
+                    self._on_ack(ack); backoff=0.1
+            except grpc.RpcError as e:
+                print(f"[REPL] stream to {self.pid} lost ({e.code().name}); retry in {backoff:.1f}s")
+            self.connected=False
+            with self._cv: self._cv.notify_all()
+            time.sleep(backoff); backoff=min(backoff*2, 5.0)
+
+    def _requests(self):
+        """Request iterator for one stream (runs on a gRPC thread)."""
+        reg, lid=self.sh.reg, self.sh.node_id
+        yield pb.ReplBatch(leader_id=lid)
+        try:
+            hello=self._hello.get(timeout=5.0)
+        except queue.Empty:
+            return
+        self.connected=True; floor=0                      # queued events the copy covers
+        if hello.leader_id == lid and hello.applied_seq >= self.base:
+            for last, _, b in list(self.unacked):         # resume after the gap
+                if last > hello.applied_seq: yield b
+        else:
+            self.resyncs += 1; self.unacked.clear(); t0=time.perf_counter()
+            for b in reg._feed_snapshot():                # bounded chunks (snapshot_chunk_kb)
+                floor=floor or b.events[0].seq
+                b=pb.ReplBatch(leader_id=lid, events=b.events, head_seq=reg.feed.seq)
+                self.snap_bytes += b.ByteSize()
+                yield b
+            self.resync_dur.add(time.perf_counter()-t0)
+        while reg.is_leader and not self.sub.overflowed:
+            with self._cv:                                # flow control
+                self._cv.wait_for(lambda: len(self.unacked) < self.sh.max_inflight
+                                  or not self.connected, timeout=1.0)
+            if not self.connected:
+                return
+            evs=self.sub.take(timeout=0.5, limit=self.sh.batch_max)
+            if evs and evs[0][0] <= floor:
+                evs=[e for e in evs if e[0] > floor]
+            if not evs:
+                continue
+            if self.unacked:                              # a batch is in flight: coalesce
+                end=time.monotonic()+self.sh.batch_s
+                while len(evs) < self.sh.batch_max and (left:=end-time.monotonic()) > 0:
+                    evs += self.sub.take(timeout=left, limit=self.sh.batch_max-len(evs))
+            b=pb.ReplBatch(leader_id=lid, events=[reg._change_event(*e) for e in evs],
+                           head_seq=reg.feed.seq)
+            self.unacked.append((evs[-1][0], time.time(), b))
+            self.batches += 1; self.events += len(evs); self.batch_rows.add(len(evs))
+            yield b
+
+    def _on_ack(self, ack):
+        if not self._greeted:
+            self._greeted=True; self._hello.put(ack); return
+        if ack.leader_id != self.sh.node_id or ack.applied_seq <= self.acked_seq:
+            return                                        # mid-snapshot / duplicate
+        self.acked_seq=ack.applied_seq; now=time.time()
+        with self._cv:
+            while self.unacked and self.unacked[0][0] <= ack.applied_seq:
+                self.ack_lat.add(now-self.unacked.popleft()[1])
+            self._cv.notify_all()
+        self.sh._acked()
+
+    def stats(self, seq) -> dict:
+        return dict(connected=self.connected, acked_seq=self.acked_seq,
+                    lag_events=max(0, seq-self.acked_seq),
+                    lag_ms=round((time.time()-self.unacked[0][1])*1000, 3) if self.unacked else 0,
+                    inflight_batches=len(self.unacked), queued=len(self.sub) if self.sub else 0,
+                    batches=self.batches, events=self.events, resyncs=self.resyncs,
+                    snapshot_bytes=self.snap_bytes, resync_ms=self.resync_dur.snapshot(),
+                    batch_rows=self.batch_rows.snapshot(), ack_ms=self.ack_lat.snapshot())
+
+
+class LogShipper:
+
+    def __init__(self, reg, stubs: dict, node_id: str, mode: str = "all", timeout: float = 1.0,
+                 batch_ms: float = 2.0, batch_max: int = 512, max_inflight: int = 8):
+        if mode not in ACK_MODES:
+            raise ValueError(f"unknown replication_ack {mode!r} (want one of {ACK_MODES})")
+        self.reg          = reg
+        self.node_id      = node_id
+        self.mode         = mode
+        self.timeout      = timeout
+        self.batch_s      = batch_ms / 1000.0
+        self.batch_max    = batch_max
+        self.max_inflight = max_inflight
+        self._wlock       = threading.Lock()
+        self._waiters     = []             # [seq, need, callback]
+        self.ack_wait     = RollingStat()
+        self.shortfall    = 0
+        self.peers        = {pid: PeerStream(self, pid, stub) for pid, stub in stubs.items()}
+
+    def needed(self) -> int:
+        return needed_acks(self.mode, len(self.peers))
+
+    def _count(self, seq):
+        return sum(p.acked_seq >= seq for p in self.peers.values())
+
+    def _acked(self):
+        with self._wlock:
+            if not self._waiters: return
+            keep=[]; fire=[]
+            for w in self._waiters:
+                (fire if self._count(w[0]) >= w[1] else keep).append(w)
+            self._waiters=keep
+        for w in fire: w[2]()
+
+    def _park(self, seq, need, cb):
+        """-> waiter entry, or None when the quorum is already there."""
+        with self._wlock:
+            if self._count(seq) >= need: return None
+            w=[seq, need, cb]; self._waiters.append(w); return w
+
+    def _unpark(self, w):
+        with self._wlock:
+            self._waiters=[x for x in self._waiters if x is not w]
+
+    # =============== writer side ============================================
+    def wait(self, seq) -> bool:
+        """Block until replication_ack backups applied `seq` (or timeout)."""
+        need=self.needed()
+        if need == 0:
+            return True
+        t0=time.perf_counter(); ev=threading.Event()
+        w=self._park(seq, need, ev.set)
+        ok=w is None or ev.wait(self.timeout)
+        if not ok: self._unpark(w); self.shortfall += 1
+        self.ack_wait.add(time.perf_counter()-t0)
+        return ok
+
+    async def wait_async(self, seq) -> bool:
+        need=self.needed()
+        if need == 0:
+            return True
+        t0=time.perf_counter(); loop=asyncio.get_running_loop(); fut=loop.create_future()
+        w=self._park(seq, need, lambda: loop.call_soon_threadsafe(_resolve, fut))
+        ok=True
+        if w is not None:
+            try:
+                await asyncio.wait_for(fut, self.timeout)
+            except asyncio.TimeoutError:
+                self._unpark(w); self.shortfall += 1; ok=False
+        self.ack_wait.add(time.perf_counter()-t0)
+        return ok
+
+    # =============== observability ===========================================
+    def stats(self) -> dict:
+        seq=self.reg.feed.seq
+        return dict(transport="stream", ack=self.mode, needed=self.needed(), seq=seq,
+                    shortfall=self.shortfall, ack_wait_ms=self.ack_wait.snapshot(),
+                    peers={pid: p.stats(seq) for pid, p in self.peers.items()})
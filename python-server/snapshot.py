@@ -0,0 +1,98 @@
+# ==============================================================
+#  snapshot.py
+#  compact, mmap-able registry snapshot  (format EDCSSNP2)
+#
+#  header    : magic[8] <u32 gen> <u32 count>
+#  last_seen : count x <f64>              one column, scanned on load
+#  offsets   : (count+1) x <u64>          byte offsets into data
+#  data      : utf-8, every row is name\0address\0language\0version\0region
+#              and rows are \0-separated too, so the whole section splits
+#              into 5*count fields with one call
+#
+#  All numbers little-endian.  NUL cannot appear inside a field and is
+#  written as U+FFFD.
+# ==============================================================
+
+import mmap, os, struct, sys
+from array import array
+
+MAGIC   = b"EDCSSNP2"
+_HEADER = struct.Struct("<8sII")
+_FIELDS = 5
+_BIG    = sys.byteorder != "little"
+
+
+def _col(typecode, buf):
+    a=array(typecode); a.frombytes(buf)
+    if _BIG: a.byteswap()
+    return a
+
+
+def write_snapshot(path: str, gen: int, rows):
+    """rows: iterable of (name,address,language,version,region,last_seen)."""
+    ts=array("d"); offs=array("Q", [0]); parts=[]; pos=0
+    for r in rows:
+        rec="\0".join(f.replace("\0", "\ufffd") for f in r[:_FIELDS]).encode()
+        parts.append(rec); ts.append(r[5])
+        pos += len(rec)+1; offs.append(pos)
+    if _BIG:
+        ts.byteswap(); offs.byteswap()
+    tmp=path+".tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(_HEADER.pack(MAGIC, gen, len(ts)))
+        fh.write(ts.tobytes()); fh.write(offs.tobytes())
+        fh.write(b"\0".join(parts))
+        fh.flush(); os.fsync(fh.fileno())
+    os.replace(tmp, path)
+
+
+class SnapshotReader:
+    """
+    Memory-mapped view of a snapshot.  row(i) decodes a single entry on
+    demand; rows(min_last_seen) decodes in bulk and drops entries last seen
+    before the cutoff without ever decoding their strings (only the names,
+    when a `keep` set asks for some of them).
+    """
+
+    def __init__(self, path: str):
+        self._fh=open(path, "rb")
+        size=os.fstat(self._fh.fileno()).st_size
+        self._mm=mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        if size < _HEADER.size:
+            raise ValueError(f"{path}: truncated snapshot")
+        magic, self.gen, self.count=_HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not an {MAGIC.decode()} snapshot")
+        n=self.count; p=_HEADER.size
+        self.last_seen=_col("d", self._mm[p:p+8*n]);      p += 8*n
+        self._offs    =_col("Q", self._mm[p:p+8*(n+1)]);  p += 8*(n+1)
+        self._data    =p
+
+    def __len__(self):
+        return self.count
+
+    def row(self, i: int):
+        a=self._data+self._offs[i]; b=self._data+self._offs[i+1]-1
+        return (*self._mm[a:b].decode().split("\0"), self.last_seen[i])
+
+    def rows(self, min_last_seen: float | None = None, keep=()):
+        """`keep`: names returned even when last seen before the cutoff."""
+        ts=self.last_seen
+        if min_last_seen is None:
+            idx=range(self.count)
+        elif not keep:
+            idx=[i for i in range(self.count) if ts[i] >= min_last_seen]
+        else:                                          # names read for old rows only
+            kb={n.encode() for n in keep}; mm=self._mm; d=self._data; offs=self._offs
+            idx=[i for i in range(self.count)
+                 if ts[i] >= min_last_seen or mm[d+offs[i]:mm.find(b"\0", d+offs[i])] in kb]
+        if not idx:
+            return []
+        if len(idx)*4 < self.count:                    # mostly expired: go lazy
+            return [self.row(i) for i in idx]
+        f=self._mm[self._data:].decode().split("\0")
+        return [(*f[5*i:5*i+5], ts[i]) for i in idx]
+
+    def close(self):
+        if isinstance(self._mm, mmap.mmap): self._mm.close()
+        self._fh.close()
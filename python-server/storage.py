@@ -0,0 +1,372 @@
+# ==============================================================
+#  storage.py
+#  persistence for ObjectRegistry
+#
+#  engines  (config key "storage")
+#    sqlite     : one row per object in the "objects" table
+#    sqlite-wal : same table, WAL journal + synchronous=NORMAL
+#    journal    : append-only operation log + compacted snapshots
+#                 (see journal.py)
+#    memory     : nothing on disk - for nodes that rebuild from peers
+#
+#  Every engine implements the Store interface below:
+#    load / put / put_many / delete / touch / apply / checkpoint / close
+#  bench_registry.py storage runs the shared conformance checks and a
+#  throughput comparison over all of them.
+#
+#  durability modes  (config key "persistence")
+#    sync  : every mutation commits before the RPC returns
+#    group : writers queue their rows and block on one shared
+#            commit issued every group_commit_ms / group_commit_rows
+#    async : write-behind - a writer thread drains the queue,
+#            the RPC returns as soon as the row is queued
+# ==============================================================
+
+import asyncio, sqlite3, threading, time
+from collections import deque
+
+from metrics import RollingStat
+
+MODES = ("sync", "group", "async")
+
+
+def _row(n, inf):
+    return (n, inf["address"], inf["language"], inf["version"],
+            inf["region"], inf["last_seen"])
+
+
+def _resolve(fut, err=None):
+    if fut.done(): return                        # the awaiting RPC may be cancelled
+    if err is None: fut.set_result(None)
+    else:           fut.set_exception(err)
+
+
+class CommitError(RuntimeError):
+    """A group / async commit failed; the tickets it covered are not durable."""
+
+
+def open_store(cfg: dict):
+    """Build the engine named by cfg["storage"] with the configured durability."""
+    kind=cfg.get("storage", "sqlite")
+    opts=dict(mode      =cfg.get("persistence", "sync"),
+              group_ms  =cfg.get("group_commit_ms", 5),
+              group_rows=cfg.get("group_commit_rows", 256))
+    if kind == "sqlite":
+        return SqliteStore(cfg["database"], **opts)
+    if kind == "sqlite-wal":
+        return WalSqliteStore(cfg["database"], **opts)
+    if kind == "journal":
+        from journal import JournalStore
+        return JournalStore(cfg.get("journal_dir", cfg["database"]+".journal"),
+                            compact_bytes=int(cfg.get("journal_compact_mb", 64)*(1<<20)),
+                            **opts)
+    if kind == "memory":
+        return MemoryStore(**opts)
+    raise ValueError(f"unknown storage engine {kind!r} "
+                     f"(want sqlite | sqlite-wal | journal | memory)")
+
+
+class Store:
+    """
+    Commit pipeline shared by the engines.  Mutations are submitted in call
+    order; put()/delete() return a ticket that wait() blocks on in "group"
+    mode and ignores otherwise.  Engines implement load() and _write(ops),
+    which runs under self._wlock (never the registry lock) and must make the
+    whole batch durable before returning.  A batch whose commit fails is
+    never reported durable: wait() raises CommitError for its tickets.
+    """
+
+    engine     = "abstract"
+    persistent = True        # False: load() after a restart is always empty
+
+    def __init__(self, mode: str = "sync",
+                 group_ms: float = 5.0, group_rows: int = 256,
+                 max_queue: int = 100_000):
+        if mode not in MODES:
+            raise ValueError(f"unknown persistence mode {mode!r} (want one of {MODES})")
+        self.mode       = mode
+        self.group_s    = group_ms / 1000.0
+        self.group_rows = group_rows
+        self.max_queue  = max_queue
+
+        self._wlock = threading.Lock()          # serialises _write()
+
+        # commit metrics ----------------------------------------------------
+        self.commit_lat = RollingStat()          # ms per commit
+        self.batch_rows = RollingStat(scale=1)   # rows per commit
+        self.wait_lat   = RollingStat()          # ms a writer spent in wait()
+
+        # queue for group / async -------------------------------------------
+        self._cv      = threading.Condition()
+        self._pending = []                       # [(op, args)]
+        self._seq     = 0                        # last ticket handed out
+        self._done    = 0                        # last ticket the writer finished with
+        self._failed  = deque()                  # [first, last ticket, error] per failure run
+        self._lost    = 0                        # tickets <= this raise (failure runs trimmed)
+        self.commit_errors = 0
+        self._aio     = []                       # [(ticket, loop, future)] from wait_async()
+        if mode != "sync":
+            threading.Thread(target=self._writer_loop, daemon=True).start()
+
+    def load(self, min_last_seen=None):
+        """
+        Persisted rows as (name,address,language,version,region,last_seen).
+        Rows last seen before `min_last_seen` are already expired: they are
+        dropped while loading rather than handed to the registry, and the
+        engine is free to discard them for good.
+        """
+        raise NotImplementedError
+
+    def _write(self, ops):
+        raise NotImplementedError
+
+    def checkpoint(self):
+        """Engine housekeeping at a durability point (WAL fold-in, compaction)."""
+
+    def close(self):
+        self.flush()
+
+    # =============== mutations ===============================================
+    def put(self, n, inf):
+        return self._submit([("put", _row(n, inf))])
+
+    def put_many(self, items):
+        return self._submit([("put", _row(n, inf)) for n, inf in items])
+
+    def delete(self, n):
+        return self._submit([("del", (n,))])
+
+    def touch(self, rows):
+        """Batch liveness refresh: rows of (last_seen, name); never creates rows."""
+        return self._submit([("touch", r) for r in rows])
+
+    def apply(self, ops):
+        """
+        Several mutations as one batch / one commit:
+          ("put", name, info) | ("del", name) | ("touch", last_seen, name)
+        """
+        out=[]
+        for op in ops:
+            if op[0] == "put":     out.append(("put", _row(op[1], op[2])))
+            elif op[0] == "del":   out.append(("del", (op[1],)))
+            elif op[0] == "touch": out.append(("touch", (op[1], op[2])))
+            else: raise ValueError(f"unknown store op {op[0]!r}")
+        return self._submit(out)
+
+    def wait(self, ticket):
+        """Block until `ticket` is durable (group mode only); CommitError if it never will be."""
+        if self.mode != "group" or ticket is None:
+            return
+        t0=time.perf_counter()
+        with self._cv:
+            while self._done < ticket:
+                self._cv.wait()
+            err=self._error(ticket)
+        self.wait_lat.add(time.perf_counter()-t0)
+        if err is not None: raise err
+
+    def _error(self, ticket):
+        for lo, hi, err in self._failed:
+            if lo <= ticket <= hi: return err
+        if ticket <= self._lost:
+            return CommitError(f"ticket {ticket}: commit outcome no longer known,"
+                               f" counted as failed")
+        return None
+
+    async def wait_async(self, ticket):
+        """
+        wait() for asyncio callers: parks a future that the writer thread
+        resolves, so an event loop can hold any number of pending commits
+        without a thread per waiter.
+        """
+        if self.mode != "group" or ticket is None:
+            return
+        t0=time.perf_counter(); loop=asyncio.get_running_loop()
+        with self._cv:
+            if self._done >= ticket:
+                err=self._error(ticket)
+                if err is not None: raise err
+                return
+            fut=loop.create_future(); self._aio.append((ticket, loop, fut))
+        await fut
+        self.wait_lat.add(time.perf_counter()-t0)
+
+    def flush(self):
+        """Block until everything submitted so far is committed (any mode)."""
+        if self.mode == "sync":
+            return
+        with self._cv:
+            target=self._seq
+            while self._done < target:
+                self._cv.wait()
+
+    def _submit(self, ops):
+        if not ops:
+            return None                           # nothing would ever commit it
+        if self.mode == "sync":
+            self._apply(ops)
+            return None
+        with self._cv:
+            while len(self._pending) >= self.max_queue:   # write-behind backpressure
+                self._cv.wait()
+            self._pending.extend(ops); self._seq += 1
+            self._cv.notify_all()
+            return self._seq
+
+    # =============== commit path =============================================
+    def _apply(self, ops):
+        t0=time.perf_counter()
+        with self._wlock:
+            self._write(ops)
+        self.commit_lat.add(time.perf_counter()-t0)
+        self.batch_rows.add(len(ops))
+
+    def _writer_loop(self):
+        while True:
+            with self._cv:
+                while not self._pending:
+                    self._cv.wait()
+                # let the batch fill up to group_rows or group_ms
+                deadline=time.monotonic()+self.group_s
+                while len(self._pending) < self.group_rows:
+                    left=deadline-time.monotonic()
+                    if left <= 0: break
+                    self._cv.wait(left)
+                batch, self._pending = self._pending, []
+                first, upto = self._done+1, self._seq
+            err=None
+            try:
+                self._apply(batch)
+            except Exception as e:
+                print(f"[STORE] commit error (tickets {first}..{upto}):", e)
+                err=CommitError(f"commit of tickets {first}..{upto} failed: {e}")
+            with self._cv:
+                if err is not None:
+                    self.commit_errors += 1
+                    f=self._failed
+                    if f and f[-1][1] == first-1:       # back-to-back failures: one run
+                        f[-1][1:]=[upto, err]
+                    else:
+                        f.append([first, upto, err])
+                        if len(f) > 1024:                # bounded: older runs fail closed
+                            self._lost=f.popleft()[1]
+                self._done = upto
+                self._cv.notify_all()
+                ready=[w for w in self._aio if w[0] <= upto]
+                if ready: self._aio=[w for w in self._aio if w[0] > upto]
+            for _, loop, fut in ready:
+                try:
+                    loop.call_soon_threadsafe(_resolve, fut, err)
+                except RuntimeError:                     # loop already closed
+                    pass
+
+    # =============== observability ===========================================
+    def stats(self) -> dict:
+        with self._cv:
+            queued=len(self._pending); lag=self._seq-self._done
+        return dict(engine=self.engine, mode=self.mode,
+                    queued_rows=queued, uncommitted_tickets=lag,
+                    commit_errors=self.commit_errors,
+                    commit_ms=self.commit_lat.snapshot(),
+                    batch_rows=self.batch_rows.snapshot(),
+                    writer_wait_ms=self.wait_lat.snapshot())
+
+
+# ==========================================================================
+
+
+class SqliteStore(Store):
+    """One row per object; each batch is a single SQLite transaction."""
+
+    engine = "sqlite"
+
+    def __init__(self, path: str, **opts):
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        super().__init__(**opts)
+        self._init_db()
+
+    def _init_db(self):
+        with self._wlock:
+            cur=self.conn.cursor()
+            cur.execute("""CREATE TABLE IF NOT EXISTS objects(
+                           name TEXT PRIMARY KEY, address TEXT, language TEXT,
+                           version TEXT, region TEXT, last_seen REAL)""")
+            cur.execute("CREATE INDEX IF NOT EXISTS objects_last_seen ON objects(last_seen)")
+            self.conn.commit()
+
+    def close(self):
+        super().close()
+        with self._wlock:
+            self.conn.close()
+
+    def load(self, min_last_seen=None):
+        with self._wlock:
+            cur=self.conn.cursor()
+            if min_last_seen is None:
+                cur.execute("SELECT * FROM objects")
+                return cur.fetchall()
+            cur.execute("DELETE FROM objects WHERE last_seen < ?", (min_last_seen,))
+            self.conn.commit()
+            cur.execute("SELECT * FROM objects WHERE last_seen >= ?", (min_last_seen,))
+            return cur.fetchall()
+
+    def _write(self, ops):
+        cur=self.conn.cursor()
+        for op, args in ops:
+            if op == "put":
+                cur.execute("REPLACE INTO objects VALUES (?,?,?,?,?,?)", args)
+            elif op == "touch":
+                cur.execute("UPDATE objects SET last_seen=max(last_seen,?) WHERE name=?", args)
+            else:
+                cur.execute("DELETE FROM objects WHERE name=?", args)
+        self.conn.commit()
+
+
+class WalSqliteStore(SqliteStore):
+    """
+    Same schema, tuned for write throughput: readers never block the writer
+    and a commit appends to the WAL instead of rewriting pages.  With
+    synchronous=NORMAL a power cut can lose the last commits, but the file
+    is never corrupted.
+    """
+
+    engine = "sqlite-wal"
+
+    def _init_db(self):
+        with self._wlock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute("PRAGMA temp_store=MEMORY")
+            self.conn.execute("PRAGMA wal_autocheckpoint=10000")
+        super()._init_db()
+
+    def checkpoint(self):
+        with self._wlock:
+            self.conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+
+class MemoryStore(Store):
+    """Rows live only in this process; a restarted node starts empty."""
+
+    engine     = "memory"
+    persistent = False
+
+    def __init__(self, **opts):
+        self._rows = {}
+        super().__init__(**opts)
+
+    def load(self, min_last_seen=None):
+        with self._wlock:
+            return [r for r in self._rows.values()
+                    if min_last_seen is None or r[5] >= min_last_seen]
+
+    def _write(self, ops):
+        for op, args in ops:
+            if op == "put":
+                self._rows[args[0]]=args
+            elif op == "touch":
+                r=self._rows.get(args[1])
+                if r is not None and args[0] > r[5]:
+                    self._rows[args[1]]=r[:5]+(args[0],)
+            else:
+                self._rows.pop(args[0], None)
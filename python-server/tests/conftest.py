@@ -0,0 +1,91 @@
+# ==============================================================
+#  tests/conftest.py
+#  shared fixtures for the python-server behaviour tests
+#
+#    cd python-server && python -m pytest -q tests
+#
+#  The modules are flat (no package), so the server directory goes on
+#  sys.path.  `cluster` starts real servers in spawned processes on
+#  loopback ports, like bench_registry.py's server scenarios.
+# ==============================================================
+
+import json, multiprocessing, os, sys, tempfile, time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import grpc
+import object_repository_pb2_grpc  as pb_grpc
+import heartbeat_service_pb2_grpc  as hb_grpc
+from google.protobuf import empty_pb2
+
+from bench_registry import _free_port, _serve_quiet, make_registry
+
+
+@pytest.fixture
+def registry():
+    """Stand-alone in-process leader (bench_registry.make_registry)."""
+    made=[]
+    def make(**over):
+        reg=make_registry(**over); made.append(reg); return reg
+    yield make
+    for reg in made: reg.store.close()
+
+
+class Cluster:
+    """n voters on loopback; node 0 starts first so it leads."""
+
+    def __init__(self, n=2, **cfg):
+        ports=[(_free_port(), _free_port()) for _ in range(n)]
+        self.cfgs=[]
+        for i, (bp, hp) in enumerate(ports):
+            c=dict(node_id=f"n{i}", bootstrap_primary=(i == 0), ttl_seconds=3600,
+                   self_address=f"127.0.0.1:{bp}", hb_address=f"127.0.0.1:{hp}",
+                   database=os.path.join(tempfile.mkdtemp(prefix="edcs-test-"), "t.db"),
+                   peers=[dict(id=f"n{j}", host="127.0.0.1", biz_port=ports[j][0],
+                               hb_port=ports[j][1]) for j in range(n) if j != i])
+            c.update(cfg); self.cfgs.append(c)
+        self._ctx =multiprocessing.get_context("spawn")
+        self.procs=[]
+
+    def start(self):
+        for i, c in enumerate(self.cfgs):
+            p=self._ctx.Process(target=_serve_quiet, args=(c,), daemon=True)
+            p.start(); self.procs.append(p)
+            self.biz(i, wait=True)
+            if i == 0: self.wait_for(lambda: self.stats(0)["is_leader"])
+        return self
+
+    def stop(self):
+        for p in self.procs:
+            p.kill(); p.join()
+
+    def biz(self, i, wait=False):
+        ch=grpc.insecure_channel(self.cfgs[i]["self_address"])
+        if wait: grpc.channel_ready_future(ch).result(30)
+        return pb_grpc.ObjectRepositoryStub(ch)
+
+    def stats(self, i):
+        hb=hb_grpc.HeartbeatServiceStub(grpc.insecure_channel(self.cfgs[i]["hb_address"]))
+        return json.loads(hb.GetStats(empty_pb2.Empty(), timeout=5).json)
+
+    @staticmethod
+    def wait_for(cond, timeout=20.0):
+        stop=time.time()+timeout
+        while time.time() < stop:
+            try:
+                if cond(): return
+            except grpc.RpcError:
+                pass
+            time.sleep(0.1)
+        raise AssertionError(f"condition not met within {timeout:.0f}s")
+
+
+@pytest.fixture
+def cluster():
+    made=[]
+    def make(n=2, **cfg):
+        c=Cluster(n, **cfg).start(); made.append(c); return c
+    yield make
+    for c in made: c.stop()
@@ -0,0 +1,65 @@
+# admission control: deadline shedding, per-method caps, pushback trailer
+
+import threading
+from concurrent import futures
+
+import grpc
+import pytest
+
+from admission import PUSHBACK_KEY, Admission, AdmissionInterceptor
+from bench_registry import _free_port
+
+
+class _Ctx:
+    def __init__(self, rem=None): self.rem=rem
+    def time_remaining(self): return self.rem
+
+
+def test_nearly_expired_deadline_is_shed():
+    adm=Admission(dict(min_deadline_ms=50))
+    assert adm.enter("GetObject", _Ctx(0.01)).startswith("deadline too close")
+    assert adm.enter("GetObject", _Ctx(1.0)) is None
+    assert adm.enter("GetObject", _Ctx(None)) is None       # no deadline set
+    assert adm.shed["deadline"] == 1 and adm.admitted == 2
+
+
+def test_method_limit_caps_only_that_method():
+    adm=Admission(dict(method_limits={"ListObjects": 2}))
+    assert adm.enter("ListObjects", _Ctx()) is None
+    assert adm.enter("ListObjects", _Ctx()) is None
+    assert "at its limit of 2" in adm.enter("ListObjects", _Ctx())
+    assert adm.enter("GetObject", _Ctx()) is None
+    adm.leave("ListObjects")
+    assert adm.enter("ListObjects", _Ctx()) is None
+    assert adm.stats()["shed"]["method_limit"] == 1 and adm.stats()["inflight"] == {"ListObjects": 2}
+
+
+def test_pushback_is_jittered_around_the_configured_delay():
+    adm=Admission(dict(retry_pushback_ms=200))
+    for _ in range(50):
+        md, ms=adm.pushback()
+        assert 100 <= ms <= 300 and md == ((PUSHBACK_KEY, str(ms)),)
+
+
+def test_interceptor_rejects_over_the_limit_with_trailer():
+    inside=threading.Event(); release=threading.Event()
+    def slow(req, ctx):
+        inside.set(); release.wait(10); return req
+    ident=lambda b: b
+    handler=grpc.method_handlers_generic_handler("t.S", {"Slow": grpc.unary_unary_rpc_method_handler(
+        slow, request_deserializer=ident, response_serializer=ident)})
+    adm=Admission(dict(method_limits={"Slow": 1}, retry_pushback_ms=100))
+    srv=grpc.server(futures.ThreadPoolExecutor(4), interceptors=[AdmissionInterceptor(adm)])
+    srv.add_generic_rpc_handlers((handler,)); port=_free_port()
+    srv.add_insecure_port(f"127.0.0.1:{port}"); srv.start()
+    try:
+        call=grpc.insecure_channel(f"127.0.0.1:{port}").unary_unary("/t.S/Slow")
+        first=call.future(b"a", timeout=10); assert inside.wait(5)
+        with pytest.raises(grpc.RpcError) as e:
+            call(b"b", timeout=5)
+        assert e.value.code() == grpc.StatusCode.RESOURCE_EXHAUSTED
+        assert PUSHBACK_KEY in dict(e.value.trailing_metadata())
+        release.set(); assert first.result() == b"a"
+        assert call(b"c", timeout=5) == b"c"                # slot freed by leave()
+    finally:
+        release.set(); srv.stop(None)
@@ -0,0 +1,58 @@
+# anti-entropy: Merkle digest walk, two-round confirmation, bucket repair
+
+import object_repository_pb2 as pb
+
+from antientropy import bucket_of
+from bench_registry import _Direct, populate, quiet
+
+
+def _pair(registry, n=200):
+    lead=registry(ae_interval_sec=0, ae_buckets=64, ae_fanout=4)
+    back=registry(ae_interval_sec=0, ae_buckets=64, ae_fanout=4)
+    populate(lead, n); populate(back, n)
+    return lead, back, _Direct(lead.ae)
+
+
+def _content(reg):
+    return {n: inf["address"] for n, inf in reg.objects.items()}
+
+
+def test_clean_round_is_a_single_root_compare(registry):
+    lead, back, stub=_pair(registry)
+    assert back.ae.round(stub) == []
+    assert back.ae.clean == 1 and back.ae.divergent == 0
+
+
+def test_drift_is_repaired_on_the_second_round(registry):
+    lead, back, stub=_pair(registry)
+    with quiet():
+        back._register_local(pb.RegisterRequest(object_name="svc-1", object_address="drifted"))
+        back._register_local(pb.RegisterRequest(object_name="extra", object_address="x:1"))
+        back._deregister_local("svc-2")
+    assert back.ae.round(stub) == []                  # suspect only: may be in flight
+    with quiet(): fixed=back.ae.round(stub)
+    assert sorted(fixed) == sorted({bucket_of(n, 64) for n in ("svc-1", "extra", "svc-2")})
+    assert _content(back) == _content(lead)
+    assert back.ae.puts == 2 and back.ae.deletes == 1
+    assert back.ae.round(stub) == [] and back.ae.divergent == 0
+
+
+def test_a_difference_that_moves_is_not_repaired(registry):
+    lead, back, stub=_pair(registry)
+    with quiet():
+        lead._register_local(pb.RegisterRequest(object_name="svc-1", object_address="v2"))
+        assert back.ae.round(stub) == []
+        lead._register_local(pb.RegisterRequest(object_name="svc-1", object_address="v3"))
+        lead.ae.tree._tree=(None, 0.0, None)          # next walk sees the new digest
+        assert back.ae.round(stub) == []              # the pair changed: still in flight
+    assert back.objects.get("svc-1")["address"] != "v3"
+
+
+def test_backup_repairs_itself_over_rpc(cluster):
+    c=cluster(2, ae_interval_sec=0.3, replication_transport="unary",
+              follower_max_staleness_ms=0)
+    back=c.biz(1)
+    back.RegisterObject(pb.RegisterRequest(object_name="ghost", object_address="g:1",
+                                           is_replication=True), timeout=5)   # never on the leader
+    c.wait_for(lambda: c.stats(1)["anti_entropy"]["repaired_deletes"] >= 1, timeout=15)
+    assert back.GetObject(pb.GetRequest(object_name="ghost"), timeout=5).object_address == ""
@@ -0,0 +1,58 @@
+# batch RPCs: one lock round, one commit and one replication message per batch
+
+import time
+
+import pytest
+import object_repository_pb2 as pb
+from google.protobuf import empty_pb2
+
+from bench_registry import quiet
+
+
+def _items(*names, lease=0):
+    return [pb.RegisterRequest(object_name=n, object_address=f"{n}:1", lease_id=lease)
+            for n in names]
+
+
+def test_batch_register_reports_each_item(registry):
+    reg=registry()
+    with quiet():
+        r=reg.BatchRegister(pb.BatchRegisterRequest(
+            items=_items("a", "b")+_items("c", lease=999)), None)
+    assert [x.success for x in r.results] == [True, True, False]
+    assert "lease 999" in r.results[2].error and r.revision == 2
+    assert sorted(n for n, _ in reg.objects.items()) == ["a", "b"]
+
+
+def test_batch_get_heartbeat_and_deregister(registry):
+    reg=registry()
+    with quiet():
+        reg.BatchRegister(pb.BatchRegisterRequest(items=_items("a", "b")), None)
+    got=reg.BatchGet(pb.BatchGetRequest(object_name=["a", "x", "b"]), None)
+    assert list(got.object_address) == ["a:1", "", "b:1"]
+    reg.objects.get("a")["last_seen"]-=100
+    ok=reg.BatchHeartbeat(pb.BatchHeartbeatRequest(object_name=["a", "x"]), None).ok
+    assert list(ok) == [True, False] and reg.objects.get("a")["last_seen"] > time.time()-5
+    with quiet():
+        r=reg.BatchDeregister(pb.BatchDeregisterRequest(object_name=["a", "x"]), None)
+    assert all(x.success for x in r.results) and sorted(n for n, _ in reg.objects.items()) == ["b"]
+
+
+@pytest.mark.parametrize("mode", ["thread", "aio"])
+@pytest.mark.parametrize("transport", ["unary", "stream"])
+def test_batches_reach_the_backup(cluster, mode, transport):
+    c=cluster(2, server_mode=mode, replication_transport=transport, replication_ack="all",
+              follower_max_staleness_ms=0)
+    lead, back=c.biz(0), c.biz(1)
+    if transport == "stream":                            # acks count once the stream is up
+        c.wait_for(lambda: c.stats(0)["replication"]["peers"]["n1"]["connected"])
+    names=[f"b{i}" for i in range(50)]
+    r=lead.BatchRegister(pb.BatchRegisterRequest(items=_items(*names)), timeout=10)
+    assert all(x.success for x in r.results)
+    assert list(back.BatchGet(pb.BatchGetRequest(object_name=names[:3]), timeout=5)
+                .object_address) == ["b0:1", "b1:1", "b2:1"]
+    lead.BatchDeregister(pb.BatchDeregisterRequest(object_name=names[:10]), timeout=10)
+    listed={o.object_name for o in back.ListObjects(empty_pb2.Empty(), timeout=5).objects}
+    assert listed == set(names[10:])
+    if transport == "unary":                             # one message per peer per batch
+        assert c.stats(0)["replication"]["peers"]["n1"]["latency_ms"]["count"] == 2
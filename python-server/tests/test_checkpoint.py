@@ -0,0 +1,41 @@
+# incremental checkpoints: only dirty names reach disk
+
+import time
+
+import object_repository_pb2 as pb
+
+from bench_registry import populate
+
+
+def test_checkpoint_writes_only_dirty_rows(registry):
+    reg=registry(checkpoint_sec=3600); populate(reg, 20)
+    time.sleep(0.01)
+    for n in ("svc-1", "svc-2"):
+        reg.Heartbeat(pb.HeartbeatPing(object_name=n), None)
+    assert reg.checkpoint() == 2
+    disk={r[0]: r[5] for r in reg.store.load()}
+    for n in ("svc-1", "svc-2"):
+        assert disk[n] == reg.objects.get(n)["last_seen"]
+    assert reg.objects.dirty_count() == 0 and reg.checkpoint() == 0
+
+
+def test_deleted_dirty_name_is_skipped(registry):
+    reg=registry(checkpoint_sec=3600); populate(reg, 3)
+    reg.Heartbeat(pb.HeartbeatPing(object_name="svc-0"), None)
+    reg.DeregisterObject(pb.DeregisterRequest(object_name="svc-0"), None)
+    assert reg.checkpoint() == 0
+    assert "svc-0" not in {r[0] for r in reg.store.load()}
+
+
+def test_checkpoint_survives_a_restart(registry, tmp_path):
+    db=str(tmp_path/"r.db")
+    reg=registry(database=db, checkpoint_sec=3600); populate(reg, 3)
+    time.sleep(0.01); reg.Heartbeat(pb.HeartbeatPing(object_name="svc-2"), None)
+    seen=reg.objects.get("svc-2")["last_seen"]; reg.checkpoint(); reg.store.close()
+    again=registry(database=db)
+    assert again.objects.get("svc-2")["last_seen"] == seen
+
+
+def test_heartbeat_flush_sec_still_sets_the_checkpoint_cadence(registry):
+    assert registry(heartbeat_flush_sec=0).ckpt_s == 0
+    assert registry(heartbeat_flush_sec=0, checkpoint_sec=7).ckpt_s == 7
@@ -0,0 +1,67 @@
+# durability modes: sync / group / async commits and failed group commits
+
+import asyncio
+
+import pytest
+
+from bench_registry import _inf
+from storage import MODES, CommitError, MemoryStore
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_every_mode_commits_in_order(mode):
+    st=MemoryStore(mode=mode, group_ms=1)
+    for k in range(50):
+        st.wait(st.put("a", _inf(f"{k}:1", float(k))))
+    st.wait(st.delete("a")); st.wait(st.put("b", _inf("b:1", 1.0)))
+    st.flush()
+    assert [r[0] for r in st.load()] == ["b"]
+    assert st.stats()["uncommitted_tickets"] == 0
+
+
+def test_group_wait_returns_after_the_commit():
+    st=MemoryStore(mode="group", group_ms=50)
+    st.wait(st.put("a", _inf("1:1", 1.0)))
+    assert [r[0] for r in st.load()] == ["a"]         # visible to load() = committed
+    assert st.stats()["batch_rows"]["count"] >= 1
+
+
+def _disk_full(ops):
+    raise OSError("disk full")
+
+
+def _failing_store():
+    st=MemoryStore(mode="group", group_ms=1)
+    st.wait(st.put("ok", _inf("1:1", 1.0)))
+    good, st._write = st._write, _disk_full
+    return st, good
+
+
+def test_failed_group_commit_raises_in_wait():
+    st, good=_failing_store()
+    with pytest.raises(CommitError):
+        st.wait(st.put("lost", _inf("2:2", 1.0)))
+    st._write=good                                   # later batches commit again
+    st.wait(st.put("next", _inf("3:3", 1.0)))
+    assert {r[0] for r in st.load()} == {"ok", "next"}
+    assert st.stats()["commit_errors"] == 1
+
+
+def test_failed_group_commit_raises_in_wait_async():
+    st, _=_failing_store()
+
+    async def write():
+        await st.wait_async(st.put("lost", _inf("2:2", 1.0)))
+
+    with pytest.raises(CommitError):
+        asyncio.run(write())
+
+
+def test_failure_stays_visible_after_many_more_failures():
+    st, good=_failing_store()
+    first=st.put("lost-0", _inf("2:2", 1.0)); st.flush()
+    for k in range(1100):                            # > the runs kept in memory
+        st._write=_disk_full; st.put(f"lost-{k}", _inf("2:2", 1.0)); st.flush()
+        st._write=good; st.wait(st.put(f"ok-{k}", _inf("3:3", 1.0)))
+    with pytest.raises(CommitError):
+        st.wait(first)
@@ -0,0 +1,86 @@
+# election: per-peer circuit breakers around the concurrent uptime poll
+
+import time
+
+import grpc
+
+from election import Breaker, UptimePoller
+
+
+def test_breaker_opens_after_fail_max_and_doubles():
+    b=Breaker(fail_max=2, open_sec=0.05, open_max_sec=0.15)
+    assert not b.failure() and b.state == "closed"
+    assert b.failure() and b.state == "open" and not b.allow()
+    assert b.skipped == 1 and b.trips == 1 and b.wait == 0.1
+    time.sleep(0.07)
+    assert b.state == "half_open" and b.allow()          # one probe goes through
+    assert b.failure() and b.wait == 0.15                # failed probe: open again, capped
+    b.success()
+    assert b.state == "closed" and b.fails == 0 and b.wait == 0.05
+
+
+class _Future:
+    def __init__(self, value, err): self.value, self.err=value, err
+    def add_done_callback(self, cb): cb(self)
+    def result(self):
+        if self.err: raise self.err
+        return self.value
+
+
+class _Err(grpc.RpcError):
+    def code(self): return grpc.StatusCode.UNAVAILABLE
+
+
+class _Peer:
+    def __init__(self, up=True):
+        self.up=up; self.calls=0
+        peer=self
+        class GetUptime:
+            @staticmethod
+            def future(req, timeout=None):
+                peer.calls += 1
+                return _Future("info", None if peer.up else _Err())
+        self.GetUptime=GetUptime
+
+
+def test_dead_peer_is_skipped_while_its_breaker_is_open():
+    live, dead=_Peer(), _Peer(up=False)
+    p=UptimePoller(dict(live=live, dead=dead), fail_max=2, open_sec=60)
+    assert p.poll() == {"live": "info"}
+    assert p.poll() == {"live": "info"}                   # second failure opens it
+    for _ in range(3): p.poll()
+    assert dead.calls == 2 and live.calls == 5
+    st=p.stats()["peers"]["dead"]
+    assert st["breaker"] == "open" and st["skipped"] == 3 and st["errors"] == 2
+
+
+def test_peer_that_answers_again_closes_its_breaker():
+    peer=_Peer(up=False); p=UptimePoller(dict(x=peer), fail_max=1, open_sec=0.01)
+    assert p.poll() == {}
+    time.sleep(0.03); peer.up=True
+    assert p.poll() == {"x": "info"} and p.breakers["x"].state == "closed"
+
+
+def test_polling_cluster_opens_the_breaker_of_a_dead_peer(cluster):
+    c=cluster(3, lease_ms=0, elect_interval_sec=0.2, elect_breaker_failures=2,
+              elect_breaker_open_sec=30)
+    c.procs[2].kill(); c.procs[2].join()
+    peer=lambda: c.stats(0)["election"]["peers"]["n2"]
+    c.wait_for(lambda: peer()["breaker"] == "open", timeout=15)
+    skipped=peer()["skipped"]; time.sleep(1)
+    assert peer()["skipped"] > skipped and peer()["trips"] == 1
+    assert c.stats(0)["is_leader"]
+
+
+def test_followers_take_over_within_the_lease(cluster):
+    c=cluster(3)                                          # default lease_ms / lease_renew_ms
+    c.wait_for(lambda: all(c.stats(i)["election"]["lease"]["beats_received"] > 0 for i in (1, 2)))
+    polls=[c.stats(i)["election"]["rounds"] for i in (1, 2)]
+    time.sleep(1)                                         # a live leader: nobody polls
+    assert [c.stats(i)["election"]["rounds"] for i in (1, 2)] == polls
+    c.procs[0].kill(); c.procs[0].join(); t0=time.monotonic()
+    c.wait_for(lambda: c.stats(1)["is_leader"] or c.stats(2)["is_leader"], timeout=10)
+    assert time.monotonic()-t0 < 2.5
+    lead=1 if c.stats(1)["is_leader"] else 2; other=3-lead
+    c.wait_for(lambda: c.stats(other)["election"]["lease"]["failover_ms"].get("count", 0) >= 1)
+    assert c.stats(other)["election"]["lease"]["failover_ms"]["max"] < 2000
@@ -0,0 +1,35 @@
+# deadline-heap expiry: lazy re-arming instead of full scans
+
+import time
+
+import object_repository_pb2 as pb
+
+from bench_registry import populate
+from expiry import ExpiryQueue
+
+
+def test_due_reports_expired_and_rearms_refreshed():
+    q=ExpiryQueue(); live={"a": 5.0, "b": 20.0, "c": None}
+    for n in live: q.arm(n, 5.0)
+    assert q.due(10.0, live.get) == ["a"]            # b refreshed, c gone
+    assert len(q) == 1                               # only b, at its live deadline
+    assert q.due(19.0, live.get) == []
+    assert q.due(20.0, live.get) == ["b"] and len(q) == 0
+
+
+def test_earlier_arm_supersedes():
+    q=ExpiryQueue()
+    q.arm("a", 50.0); q.arm("a", 10.0); q.arm("a", 30.0)   # the later one is ignored
+    assert q.due(10.0, lambda n: 10.0) == ["a"]
+    assert q.due(100.0, lambda n: 10.0) == []              # stale heap entries skipped
+
+
+def test_registry_expires_only_silent_objects(registry):
+    reg=registry(ttl_seconds=0.3, expiry_tick_sec=3600); populate(reg, 4)
+    time.sleep(0.2)
+    reg.Heartbeat(pb.HeartbeatPing(object_name="svc-1"), None)
+    time.sleep(0.2)
+    gone=reg.expire_due()
+    assert sorted(gone) == ["svc-0", "svc-2", "svc-3"]
+    assert reg.objects.get("svc-1") and len(reg.expiry) == 1
+    assert {r[0] for r in reg.store.load()} == {"svc-1"}
@@ -0,0 +1,107 @@
+# follower reads: revision tokens and the staleness bound
+
+from types import SimpleNamespace
+
+import grpc
+import pytest
+
+import object_repository_pb2 as pb
+from changefeed import ChangeFeed
+from follower import MIN_REVISION, FollowerReads, min_revision
+
+
+def _backup(applied=0, stream=True):
+    reg=SimpleNamespace(is_leader=False, leader_id="L", repl_leader="L", repl_applied=applied,
+                        shipper=object() if stream else None, feed=SimpleNamespace(seq=0))
+    return reg, FollowerReads(reg, max_staleness_ms=1000)
+
+
+class _Ctx:
+    def __init__(self, md=()): self.md=md
+    def invocation_metadata(self): return self.md
+
+
+def test_min_revision_sources():
+    assert min_revision(pb.GetRequest(min_revision=7), _Ctx()) == 7
+    assert min_revision(pb.GetRequest(), _Ctx(((MIN_REVISION, "9"),))) == 9
+    assert min_revision(pb.GetRequest(), _Ctx(((MIN_REVISION, "x"),))) == 0
+    assert min_revision(pb.GetRequest(), None) == 0          # in-process callers
+
+
+def test_feed_seq_moves_without_subscribers():
+    feed=ChangeFeed()
+    feed.publish([("put", "a", {}), ("del", "b", None)]); feed.publish([])
+    assert feed.seq == 2
+    sub=feed.subscribe("s"); feed.publish([("put", "c", {})])
+    assert feed.seq == 3 and [e[0] for e in sub.take(0)] == [3]
+
+
+def test_leader_serves_everything():
+    reg, f=_backup(); reg.is_leader=True; reg.feed.seq=5
+    assert f.check(100) is None and f.revision() == 5
+
+
+def test_backup_fresh_once_it_applied_the_beat_head():
+    reg, f=_backup(applied=3)
+    f.note_head("L", 5)
+    assert f.check(0) == "staleness unknown"                 # the leader had more
+    reg.repl_applied=5
+    assert f.check(0) is None and f.check(5) is None
+    assert "revision 5 < 6" == f.check(6)
+    assert (f.served, f.too_stale, f.too_old) == (2, 1, 1)
+
+
+def test_unary_backup_is_never_fresh():
+    reg, f=_backup(applied=5, stream=False)
+    f.note_head("L", 5)
+    assert f.revision() == 0 and f.check(0) == "staleness unknown"
+
+
+def test_new_leader_invalidates_heads():
+    reg, f=_backup(applied=5)
+    f.note_head("L", 5); assert f.check(0) is None
+    reg.leader_id="M"
+    assert f.check(0) == "staleness unknown"
+
+
+def _register(stub, name):
+    r=stub.RegisterObject(pb.RegisterRequest(object_name=name, object_address=f"{name}:1",
+                                             language="py", version="1", region="r"), timeout=5)
+    assert r.success
+    return r.revision
+
+
+def test_read_your_writes_on_a_backup(cluster):
+    c=cluster(2, replication_transport="stream", follower_stale_action="reject")
+    lead, back=c.biz(0), c.biz(1)
+    rev=_register(lead, "svc"); assert rev > 0
+    c.wait_for(lambda: back.GetObject(pb.GetRequest(object_name="svc", min_revision=rev),
+                                      timeout=5).object_address == "svc:1")
+    got=back.GetObject(pb.GetRequest(object_name="svc", min_revision=rev), timeout=5)
+    assert got.revision >= rev
+    with pytest.raises(grpc.RpcError) as e:               # a token from the future
+        back.GetObject(pb.GetRequest(object_name="svc", min_revision=rev+1000), timeout=5)
+    assert e.value.code() == grpc.StatusCode.UNAVAILABLE
+    fr=c.stats(1)["follower_reads"]
+    assert fr["served"] >= 1 and fr["below_revision"] >= 1
+
+
+@pytest.mark.parametrize("mode", ["thread", "aio"])
+def test_unary_writes_return_a_usable_token(cluster, mode):
+    c=cluster(2, server_mode=mode, replication_transport="unary", follower_max_staleness_ms=0)
+    lead, back=c.biz(0), c.biz(1)
+    r1=_register(lead, "a"); r2=_register(back, "b")        # the second one forwarded
+    assert 0 < r1 < r2
+    got=back.GetObject(pb.GetRequest(object_name="b", min_revision=r2), timeout=5)
+    assert got.object_address == "b:1" and got.revision >= r2     # answered by the leader
+    assert c.stats(1)["forwarding"]["forwarded"].get("GetObject", 0) == 1
+
+
+def test_unary_backup_forwards_bounded_reads(cluster):
+    c=cluster(2, replication_transport="unary")             # no seq reaches the backup
+    _register(c.biz(0), "svc"); back=c.biz(1)
+    read=lambda: back.GetObject(pb.GetRequest(object_name="svc"), timeout=5)
+    c.wait_for(lambda: read().object_address == "svc:1")
+    st=c.stats(1)
+    assert st["forwarding"]["forwarded"].get("GetObject", 0) >= 1
+    assert st["follower_reads"]["served"] == 0
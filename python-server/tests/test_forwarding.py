@@ -0,0 +1,51 @@
+# backups forward client writes to the leader and relay its heartbeats
+
+import time
+
+import grpc
+import pytest
+import object_repository_pb2 as pb
+from google.protobuf import empty_pb2
+
+
+def _names(stub):
+    return sorted(o.object_name for o in stub.ListObjects(empty_pb2.Empty(), timeout=5).objects)
+
+
+@pytest.mark.parametrize("mode", ["thread", "aio"])
+def test_write_on_a_backup_lands_on_the_leader(cluster, mode):
+    c=cluster(2, server_mode=mode, replication_ack="all", follower_max_staleness_ms=0)
+    back=c.biz(1)
+    r=back.RegisterObject(pb.RegisterRequest(object_name="f", object_address="f:1"), timeout=10)
+    assert r.success
+    assert _names(c.biz(0)) == ["f"]
+    assert back.DeregisterObject(pb.DeregisterRequest(object_name="f"), timeout=10).success
+    assert _names(c.biz(0)) == []
+    fw=c.stats(1)["forwarding"]
+    assert fw["forwarded"] == {"RegisterObject": 1, "DeregisterObject": 1}
+
+
+def test_backup_without_forwarding_refuses_writes(cluster):
+    c=cluster(2, forward_writes=False)
+    with pytest.raises(grpc.RpcError) as e:
+        c.biz(1).RegisterObject(pb.RegisterRequest(object_name="f", object_address="f:1"),
+                                timeout=10)
+    assert e.value.code() == grpc.StatusCode.FAILED_PRECONDITION
+
+
+@pytest.mark.parametrize("mode", ["thread", "aio"])
+@pytest.mark.parametrize("transport", ["unary", "stream"])
+def test_heartbeats_through_a_backup_keep_the_service(cluster, mode, transport):
+    c=cluster(2, server_mode=mode, replication_transport=transport, ttl_seconds=2,
+              expiry_tick_sec=0.1, liveness_sync_ms=200, follower_max_staleness_ms=0)
+    lead, back=c.biz(0), c.biz(1)
+    back.RegisterObject(pb.RegisterRequest(object_name="a", object_address="a:1"), timeout=10)
+    back.RegisterObject(pb.RegisterRequest(object_name="b", object_address="b:1"), timeout=10)
+    stop=time.time()+5                                   # well past ttl_seconds
+    while time.time() < stop:
+        assert back.Heartbeat(pb.HeartbeatPing(object_name="a"), timeout=5).ok
+        assert back.BatchHeartbeat(pb.BatchHeartbeatRequest(object_name=["b"]), timeout=5).ok[0]
+        time.sleep(0.5)
+    assert _names(lead) == _names(back) == ["a", "b"]
+    assert c.stats(1)["liveness"]["relayed"] > 0
+    c.wait_for(lambda: _names(lead) == _names(back) == [], timeout=15)
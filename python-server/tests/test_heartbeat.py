@@ -0,0 +1,35 @@
+# heartbeat fast path: in-memory last_seen, no row rewrite per ping
+
+import time
+
+import object_repository_pb2 as pb
+
+from bench_registry import populate
+
+
+def _disk_last_seen(reg, name):
+    return {r[0]: r[5] for r in reg.store.load()}[name]
+
+
+def test_fast_path_moves_memory_not_disk(registry):
+    reg=registry(checkpoint_sec=3600); populate(reg, 3)
+    before=_disk_last_seen(reg, "svc-1"); commits=reg.store.commit_lat.count
+    time.sleep(0.01)
+    assert reg.Heartbeat(pb.HeartbeatPing(object_name="svc-1"), None).ok
+    assert reg.objects.get("svc-1")["last_seen"] > before
+    assert _disk_last_seen(reg, "svc-1") == before          # disk sees it lazily
+    assert reg.store.commit_lat.count == commits
+    assert reg.objects.dirty_count() == 1
+
+
+def test_unknown_name_is_refused(registry):
+    reg=registry()
+    assert not reg.Heartbeat(pb.HeartbeatPing(object_name="ghost"), None).ok
+    assert reg.objects.dirty_count() == 0
+
+
+def test_locked_path_rewrites_the_row(registry):
+    reg=registry(heartbeat_fast_path=False); populate(reg, 3)
+    before=_disk_last_seen(reg, "svc-1"); time.sleep(0.01)
+    assert reg.Heartbeat(pb.HeartbeatPing(object_name="svc-1"), None).ok
+    assert _disk_last_seen(reg, "svc-1") == reg.objects.get("svc-1")["last_seen"] > before
@@ -0,0 +1,59 @@
+# journal engine: append, replay, torn tails, compaction
+
+import os, time
+
+from bench_registry import _inf
+from journal import JournalStore
+
+
+def _reopen(path, **kw):
+    st=JournalStore(path); return st, st.load(**kw)
+
+
+def test_replay_after_restart(tmp_path):
+    st, _=_reopen(tmp_path); now=time.time()
+    st.put("a", _inf("1:1", now)); st.put("b", _inf("2:2", now))
+    st.compact()                                      # a, b in the snapshot
+    st.delete("b"); st.put("c", _inf("3:3", now)); st.touch([(now+5, "a")])
+    st.close()
+    st, rows=_reopen(tmp_path)
+    assert {r[0]: r[1:] for r in rows} == {"a": ("1:1", "Go", "2", "US", now+5),
+                                            "c": ("3:3", "Go", "2", "US", now)}
+    st.close()
+
+
+def test_torn_tail_is_cut(tmp_path):
+    st, _=_reopen(tmp_path); now=time.time()
+    st.put("a", _inf("1:1", now)); st.put("b", _inf("2:2", now))
+    seg=st._seg(st._gen); st.close()
+    with open(seg, "r+b") as fh:
+        fh.truncate(os.path.getsize(seg)-3)           # crash mid-record
+    st, rows=_reopen(tmp_path)
+    assert [r[0] for r in rows] == ["a"]
+    st.put("c", _inf("3:3", now)); st.close()         # appends after the cut
+    st, rows=_reopen(tmp_path)
+    assert sorted(r[0] for r in rows) == ["a", "c"]
+    st.close()
+
+
+def test_compaction_drops_covered_gens(tmp_path):
+    st, _=_reopen(tmp_path); now=time.time()
+    for k in range(100):
+        st.put(f"s{k}", _inf("1:1", now))
+    st.compact(); st.compact()
+    assert st._gens() == [st._gen] and st.compactions == 2
+    st.put("late", _inf("2:2", now)); st.close()
+    st, rows=_reopen(tmp_path)
+    assert len(rows) == 101
+    st.close()
+
+
+def test_size_triggers_compaction(tmp_path):
+    st=JournalStore(tmp_path, compact_bytes=4096); st.load(); now=time.time()
+    for k in range(200):
+        st.put(f"s{k}", _inf("1:1", now))
+    deadline=time.time()+5
+    while st.compactions == 0 and time.time() < deadline:
+        time.sleep(0.01)
+    assert st.compactions >= 1
+    st.close()
@@ -0,0 +1,49 @@
+# shared leases: one keep-alive for many registrations
+
+import time
+
+import object_repository_pb2 as pb
+
+from bench_registry import quiet
+
+
+def _leased(reg, ttl, names):
+    lid=reg.LeaseGrant(pb.LeaseGrantRequest(ttl_sec=ttl), None).lease_id
+    with quiet():
+        for n in names:
+            assert reg.RegisterObject(pb.RegisterRequest(object_name=n, object_address=f"{n}:1",
+                                                         lease_id=lid), None).success
+    return lid
+
+
+def test_keepalive_refreshes_attached_last_seen(registry):
+    reg=registry(); lid=_leased(reg, 30, ["a", "b"])
+    reg.objects.get("a")["last_seen"]-=100
+    assert reg.LeaseKeepAlive(pb.LeaseKeepAliveRequest(lease_id=lid), None).ok
+    assert time.time()-reg.objects.get("a")["last_seen"] < 5
+    assert reg.leases.keepalives == 1
+
+
+def test_unknown_lease_is_refused(registry):
+    reg=registry()
+    assert not reg.LeaseKeepAlive(pb.LeaseKeepAliveRequest(lease_id=12345), None).ok
+
+
+def test_revoke_removes_every_attached_object(registry):
+    reg=registry(); lid=_leased(reg, 30, ["a", "b"])
+    with quiet():
+        reg.RegisterObject(pb.RegisterRequest(object_name="plain", object_address="p:1"), None)
+        r=reg.LeaseRevoke(pb.LeaseRevokeRequest(lease_id=lid), None)
+    assert r.success and r.removed == 2
+    assert sorted(n for n, _ in reg.objects.items()) == ["plain"]
+
+
+def test_lapsed_lease_expires_its_objects_together(registry):
+    reg=registry(ttl_seconds=3600, expiry_tick_sec=3600); lid=_leased(reg, 0.3, ["a", "b"])
+    time.sleep(0.1)
+    reg.LeaseKeepAlive(pb.LeaseKeepAliveRequest(lease_id=lid), None)
+    time.sleep(0.25)
+    with quiet(): assert reg.expire_due() == []      # renewed: still inside the lease
+    time.sleep(0.2)
+    with quiet(): assert sorted(reg.expire_due()) == ["a", "b"]
+    assert len(reg.leases) == 0
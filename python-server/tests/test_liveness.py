@@ -0,0 +1,86 @@
+# liveness sync: the leader ships last_seen so backups do not expire live services
+
+import time
+from types import SimpleNamespace
+
+import object_repository_pb2 as pb
+from google.protobuf import empty_pb2
+
+from liveness import LivenessSync
+
+
+class _Stub:
+    def __init__(self): self.fail=False; self.got={}
+
+    def TouchObjects(self, req, timeout=None):
+        if self.fail: raise RuntimeError("peer down")
+        self.got.update(zip(req.object_name, req.last_seen))
+
+
+def _sync(**kw):
+    stubs=dict(a=_Stub(), b=_Stub())
+    return LivenessSync(SimpleNamespace(is_leader=True), stubs, interval_ms=0, **kw), stubs
+
+
+def test_flush_sends_newest_value_per_name():
+    ls, stubs=_sync(); ls.enabled=True
+    ls.touch("x", 1.0); ls.touch("x", 2.0); ls.touch("y", 1.5)
+    ls.flush()
+    assert stubs["a"].got == stubs["b"].got == {"x": 2.0, "y": 1.5}
+
+
+def test_unreachable_peer_keeps_its_pending_names():
+    ls, stubs=_sync(batch_max=1); ls.enabled=True
+    stubs["b"].fail=True
+    ls.touch("x", 1.0); ls.flush()
+    ls.touch("x", 3.0); ls.touch("z", 2.0); ls.flush()
+    assert ls.pending["b"] == {"x": 3.0, "z": 2.0} and ls.errors["b"] == 2
+    stubs["b"].fail=False; ls.flush()
+    assert stubs["b"].got == {"x": 3.0, "z": 2.0} and ls.pending["b"] == {}
+
+
+def test_backup_relays_its_heartbeats_to_the_leader():
+    ls, stubs=_sync(); ls.enabled=True
+    ls.reg.is_leader=False; ls.reg._leader_peer=lambda: "b"
+    stubs["b"].fail=True
+    ls.touch("x", 1.0); ls.relay()
+    ls.touch("x", 2.0); ls.relay()
+    assert ls.upward == {"x": 2.0} and ls.relay_err == 2
+    stubs["b"].fail=False; ls.relay()
+    assert stubs["b"].got == {"x": 2.0} and stubs["a"].got == {} and ls.relayed == 1
+
+
+def _names(stub):
+    return sorted(o.object_name for o in stub.ListObjects(empty_pb2.Empty(), timeout=5).objects)
+
+
+def test_backup_keeps_a_heartbeating_service(cluster):
+    c=cluster(2, ttl_seconds=2, liveness_sync_ms=200, expiry_tick_sec=0.1,
+              follower_max_staleness_ms=0)          # read the backup's own copy
+    lead, back=c.biz(0), c.biz(1)
+    lead.RegisterObject(pb.RegisterRequest(object_name="hb", object_address="h:1"), timeout=5)
+    stop=time.time()+5
+    while time.time() < stop:
+        assert lead.Heartbeat(pb.HeartbeatPing(object_name="hb"), timeout=5).ok
+        time.sleep(0.5)
+    assert _names(back) == ["hb"]
+    c.wait_for(lambda: _names(back) == [], timeout=15)
+
+
+def test_backups_keep_leased_objects_for_the_lease(cluster):
+    # the lease outlives ttl_seconds between keep-alives: backups must not
+    # fall back to plain TTL from the registration
+    c=cluster(2, ttl_seconds=2, liveness_sync_ms=200, expiry_tick_sec=0.1,
+              follower_max_staleness_ms=0)
+    lead, back=c.biz(0), c.biz(1)
+    lid=lead.LeaseGrant(pb.LeaseGrantRequest(ttl_sec=6), timeout=5).lease_id
+    for n in ("x", "y"):
+        assert lead.RegisterObject(pb.RegisterRequest(object_name=n, object_address=f"{n}:1",
+                                                      lease_id=lid), timeout=5).success
+    stop=time.time()+5
+    while time.time() < stop:
+        assert lead.LeaseKeepAlive(pb.LeaseKeepAliveRequest(lease_id=lid), timeout=5).ok
+        time.sleep(3)                               # longer than ttl_seconds
+    assert _names(back) == ["x", "y"]
+    # keep-alives stop: the backup drops them once the lease would have run out
+    c.wait_for(lambda: _names(back) == [], timeout=15)
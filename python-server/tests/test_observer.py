@@ -0,0 +1,55 @@
+# observers: read replicas outside the election and the write quorum
+
+import json
+
+import grpc
+import object_repository_pb2       as pb
+import object_repository_pb2_grpc  as pb_grpc
+import heartbeat_service_pb2_grpc  as hb_grpc
+from google.protobuf import empty_pb2
+
+from bench_registry import _free_port, _serve_quiet
+
+
+def _observer(c, **cfg):
+    """Start an observer on `c`'s voters; -> (biz stub, stats())."""
+    voters=[dict(id=x["node_id"], host="127.0.0.1", biz_port=int(x["self_address"].rsplit(":")[1]),
+                 hb_port=int(x["hb_address"].rsplit(":")[1])) for x in c.cfgs]
+    o=dict(role="observer", node_id="obs", self_address=f"127.0.0.1:{_free_port()}",
+           hb_address=f"127.0.0.1:{_free_port()}", peers=voters, observer_check_sec=0.3)
+    o.update(cfg)
+    p=c._ctx.Process(target=_serve_quiet, args=(o,), daemon=True)
+    p.start(); c.procs.append(p)
+    ch=grpc.insecure_channel(o["self_address"]); grpc.channel_ready_future(ch).result(30)
+    hb=hb_grpc.HeartbeatServiceStub(grpc.insecure_channel(o["hb_address"]))
+    return pb_grpc.ObjectRepositoryStub(ch), lambda: json.loads(hb.GetStats(empty_pb2.Empty(),
+                                                                            timeout=5).json)
+
+
+def _get(stub, name):
+    return stub.GetObject(pb.GetRequest(object_name=name), timeout=5).object_address
+
+
+def test_observer_serves_reads_and_forwards_writes(cluster):
+    c=cluster(2, replication_ack="all")
+    c.biz(0).RegisterObject(pb.RegisterRequest(object_name="a", object_address="a:1"), timeout=10)
+    obs, stats=_observer(c)
+    assert _get(obs, "a") == "a:1" and stats()["leader"] == "n0"
+    assert obs.RegisterObject(pb.RegisterRequest(object_name="b", object_address="b:1"),
+                              timeout=10).success
+    assert _get(c.biz(0), "b") == "b:1"
+    c.wait_for(lambda: _get(obs, "b") == "b:1", timeout=5)
+    # not a voter: nobody polls or beats it, the leader waits for n1 only
+    assert set(c.stats(0)["election"]["peers"]) == {"n1"}
+    assert c.stats(0)["replication"]["needed"] == 1
+
+
+def test_observer_follows_the_next_leader(cluster):
+    c=cluster(2)
+    obs, stats=_observer(c)
+    c.procs[0].kill(); c.procs[0].join()
+    c.wait_for(lambda: c.stats(1)["is_leader"], timeout=10)
+    c.biz(1).RegisterObject(pb.RegisterRequest(object_name="after", object_address="x:1"),
+                            timeout=10)
+    c.wait_for(lambda: stats()["leader"] == "n1" and _get(obs, "after") == "x:1", timeout=15)
+    assert stats()["resyncs"] >= 2                          # a fresh copy from n1
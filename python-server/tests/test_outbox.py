@@ -0,0 +1,79 @@
+# replication outbox: per-name collapse, durable rows, backoff and drain
+
+import time
+from types import SimpleNamespace
+
+import object_repository_pb2 as pb
+
+from bench_registry import _serve_quiet
+from outbox import SNAPSHOT, Outbox
+
+
+class _Stub:
+    def __init__(self, fail=False): self.fail=fail; self.got=[]
+
+    def _call(self, req, timeout=None):
+        if self.fail: raise RuntimeError("peer down")
+        self.got.append(req)
+    RegisterObject=DeregisterObject=_call
+
+
+def _box(tmp_path, stub, leader=True, **kw):
+    reg=SimpleNamespace(is_leader=leader, cfg={})
+    return Outbox(reg, dict(p=stub), str(tmp_path/"ob.db"), "n0", backoff_ms=10,
+                  backoff_max_ms=50, **kw)
+
+
+def _until(cond, timeout=5.0):
+    stop=time.time()+timeout
+    while not cond():
+        assert time.time() < stop, "condition not met"
+        time.sleep(0.01)
+
+
+def test_newer_write_replaces_the_queued_one(tmp_path):
+    ob=_box(tmp_path, _Stub(), leader=False)          # not leader: nothing drains
+    ob.put("p", "RegisterObject", [pb.RegisterRequest(object_name="a", object_address="1")])
+    ob.put("p", "DeregisterObject", [pb.DeregisterRequest(object_name="a")])
+    assert ob.busy("p") and ob.rows["p"]["a"][0] == "DeregisterObject"
+    assert ob.stats("p")["depth"] == 1 and ob.collapsed["p"] == 1
+
+
+def test_rows_survive_a_restart(tmp_path):
+    ob=_box(tmp_path, _Stub(), leader=False)
+    ob.put("p", "RegisterObject", [pb.RegisterRequest(object_name=n) for n in "abc"])
+    again=_box(tmp_path, _Stub(), leader=False)
+    assert sorted(again.rows["p"]) == ["a", "b", "c"]
+
+
+def test_unreachable_peer_backs_off_then_drains(tmp_path):
+    st=_Stub(fail=True); ob=_box(tmp_path, st)
+    ob.put("p", "RegisterObject", [pb.RegisterRequest(object_name="a", object_address="1")])
+    _until(lambda: ob.retries["p"] >= 2)
+    assert ob.stats("p")["backoff_s"] > 0
+    st.fail=False
+    _until(lambda: not ob.busy("p"))
+    assert [r.object_name for r in st.got] == ["a"] and ob.delivered["p"] == 1
+    assert ob.stats("p")["depth"] == 0
+
+
+def test_deep_backlog_turns_into_a_snapshot(tmp_path):
+    ob=_box(tmp_path, _Stub(), leader=False, snapshot_after=5)
+    ob.put("p", "RegisterObject", [pb.RegisterRequest(object_name=f"o{i}") for i in range(4)])
+    ob.put("p", "RegisterObject", [pb.RegisterRequest(object_name=f"x{i}") for i in range(3)])
+    assert SNAPSHOT in ob.rows["p"] and ob.stats("p")["snapshot_pending"]
+    assert sorted(n for n in ob.rows["p"] if n != SNAPSHOT) == ["x0", "x1", "x2"]
+
+
+def test_write_made_while_a_backup_was_down_reaches_it(cluster):
+    c=cluster(2, replication_transport="unary", replication_ack="one",
+              follower_max_staleness_ms=0, outbox_backoff_max_ms=500)
+    c.procs[1].kill(); c.procs[1].join()
+    c.biz(0).RegisterObject(pb.RegisterRequest(object_name="late", object_address="l:1"),
+                            timeout=10)
+    ob=lambda: c.stats(0)["replication"]["peers"]["n1"]["outbox"]
+    assert ob()["depth"] == 1
+    p=c._ctx.Process(target=_serve_quiet, args=(c.cfgs[1],), daemon=True)
+    p.start(); c.procs[1]=p
+    c.wait_for(lambda: ob()["delivered"] == 1 and ob()["depth"] == 0, timeout=30)
+    assert c.biz(1).GetObject(pb.GetRequest(object_name="late"), timeout=5).object_address == "l:1"
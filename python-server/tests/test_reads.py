@@ -0,0 +1,50 @@
+# lock-free read path: snapshot reads beside concurrent writers
+
+import threading
+
+import pytest
+
+import object_repository_pb2 as pb
+from google.protobuf import empty_pb2
+
+from bench_registry import populate, quiet
+
+
+@pytest.mark.parametrize("lockfree", (True, False))
+def test_in_process_reads_without_context(registry, lockfree):
+    reg=registry(lockfree_reads=lockfree); populate(reg, 10)   # what bench_registry.py reads does
+    assert reg.GetObject(pb.GetRequest(object_name="svc-3"), None).object_address
+    assert reg.GetObject(pb.GetRequest(object_name="nope"), None).object_address == ""
+    assert len(reg.ListObjects(empty_pb2.Empty(), None).objects) == 10
+
+
+def test_list_snapshot_follows_writes(registry):
+    reg=registry(list_snapshot_max_age_sec=60); populate(reg, 5)
+    assert len(reg.ListObjects(empty_pb2.Empty(), None).objects) == 5
+    with quiet():
+        reg.DeregisterObject(pb.DeregisterRequest(object_name="svc-0"), None)
+    names={o.object_name for o in reg.ListObjects(empty_pb2.Empty(), None).objects}
+    assert names == {f"svc-{i}" for i in range(1, 5)}         # shard rev moved: rebuilt
+
+
+def test_reads_never_see_a_missing_object_under_writes(registry):
+    reg=registry(); populate(reg, 200); stop=threading.Event(); misses=[]
+
+    def writer():
+        k=0
+        while not stop.is_set():
+            reg.RegisterObject(pb.RegisterRequest(object_name=f"svc-{k % 200}",
+                                                  object_address="10.9.9.9:6000"), None)
+            k += 1
+
+    with quiet():
+        w=threading.Thread(target=writer); w.start()
+        try:
+            for i in range(3000):
+                if not reg.GetObject(pb.GetRequest(object_name=f"svc-{i % 200}"), None).object_address:
+                    misses.append(i)
+                if i % 500 == 0:
+                    assert len(reg.ListObjects(empty_pb2.Empty(), None).objects) == 200
+        finally:
+            stop.set(); w.join()
+    assert misses == []
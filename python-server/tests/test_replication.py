@@ -0,0 +1,104 @@
+# fan-out replication: concurrent peers, ack modes, per-name ordering
+
+import time
+from types import SimpleNamespace
+
+import pytest
+import object_repository_pb2 as pb
+
+from replication import Replicator, needed_acks
+
+
+class _Stub:
+    """Records RegisterObject calls; `delay` per call, `fail` raises."""
+
+    def __init__(self, delay=0.0, fail=False):
+        self.delay, self.fail, self.got=delay, fail, []
+
+    def RegisterObject(self, req, timeout=None):
+        time.sleep(self.delay)
+        if self.fail: raise RuntimeError("peer down")
+        self.got.append((req.object_name, getattr(req, "i", 0)))
+
+    def BatchRegister(self, req, timeout=None):
+        time.sleep(self.delay)
+        self.got.append(("batch", len(req)))
+        self.got += [(r.object_name, getattr(r, "i", 0)) for r in req]
+
+
+def _reqs(*names):
+    return [SimpleNamespace(object_name=n) for n in names]
+
+
+def test_needed_acks():
+    assert [needed_acks(m, 4) for m in ("async", "one", "majority", "all")] == [0, 1, 2, 4]
+    assert needed_acks("one", 0) == 0
+    with pytest.raises(ValueError):
+        Replicator({}, mode="quorum")
+
+
+def test_one_returns_with_the_fast_peer():
+    fast, slow=_Stub(), _Stub(delay=0.5)
+    r=Replicator(dict(a=fast, b=slow), mode="one")
+    t0=time.perf_counter()
+    assert r.send("RegisterObject", _reqs("x"))
+    assert time.perf_counter()-t0 < 0.4 and fast.got == [("x", 0)]
+
+
+def test_all_waits_for_every_peer():
+    a, b=_Stub(), _Stub(delay=0.2)
+    assert Replicator(dict(a=a, b=b), mode="all").send("RegisterObject", _reqs("x", "y"))
+    assert sorted(a.got) == sorted(b.got) == [("x", 0), ("y", 0)]
+
+
+def test_failed_peer_is_a_shortfall_not_an_error():
+    r=Replicator(dict(a=_Stub(), b=_Stub(fail=True)), mode="all")
+    assert not r.send("RegisterObject", _reqs("x"))
+    assert r.shortfall == 1 and r.stats()["peers"]["b"]["errors"] == 1
+    r.mode="majority"                       # leader + a out of 3
+    assert r.send("RegisterObject", _reqs("y"))
+
+
+def test_writes_to_one_name_keep_their_order():
+    st=_Stub(delay=0.001); r=Replicator(dict(a=st), mode="async", lanes=4)
+    for i in range(50):
+        r.send("RegisterObject", [SimpleNamespace(object_name="same", i=i),
+                                  SimpleNamespace(object_name=f"o{i}", i=i)])
+    deadline=time.time()+5
+    while len(st.got) < 100 and time.time() < deadline: time.sleep(0.01)
+    assert [i for n, i in st.got if n == "same"] == list(range(50))
+
+
+def test_unary_all_backup_has_the_write_on_return(cluster):
+    c=cluster(2, replication_transport="unary", replication_ack="all",
+              follower_max_staleness_ms=0)
+    assert c.biz(0).RegisterObject(pb.RegisterRequest(object_name="w", object_address="w:1"),
+                                   timeout=10).success
+    assert c.biz(1).GetObject(pb.GetRequest(object_name="w"), timeout=5).object_address == "w:1"
+
+
+_BATCH=("BatchRegister", lambda rs: list(rs))
+
+
+def test_batch_goes_to_each_peer_as_one_rpc():
+    a, b=_Stub(), _Stub()
+    r=Replicator(dict(a=a, b=b), mode="all", lanes=4)
+    assert r.send("RegisterObject", _reqs(*(f"o{i}" for i in range(40))), _BATCH)
+    assert a.got[0] == b.got[0] == ("batch", 40) and len(a.got) == 41
+    assert r.peer_lat["a"].snapshot()["count"] == 1
+
+
+def test_batch_keeps_its_place_among_single_writes():
+    st=_Stub(delay=0.002); r=Replicator(dict(a=st), mode="async", lanes=4)
+    names=[f"o{i}" for i in range(16)]
+    for i in range(30):
+        if i % 3 == 0:
+            r.send("RegisterObject", [SimpleNamespace(object_name=n, i=i) for n in names], _BATCH)
+        else:
+            r.send("RegisterObject", [SimpleNamespace(object_name=names[i % 16], i=i)])
+    deadline=time.time()+10
+    while sum(n != "batch" for n, _ in st.got) < 10*16+20 and time.time() < deadline:
+        time.sleep(0.01)
+    for n in names:
+        seen=[i for m, i in st.got if m == n]
+        assert seen == sorted(seen), n
@@ -0,0 +1,62 @@
+# hash-partitioned registry: per-shard locks, dirty sets and list cache
+
+import threading, time
+
+import object_repository_pb2 as pb
+from google.protobuf import empty_pb2
+
+from bench_registry import populate, quiet
+from shards import ShardedMap
+
+
+def test_locked_many_groups_names_by_shard():
+    m=ShardedMap(4); names=[f"o{i}" for i in range(40)]
+    with m.locked_many(names) as groups:
+        assert sorted(n for ns in groups.values() for n in ns) == sorted(names)
+        assert all(m.shard(n) is s for s, ns in groups.items() for n in ns)
+        assert all(s.lock.locked() for s in groups)
+    assert not any(s.lock.locked() for s in m.shards)
+
+
+def test_locked_many_in_opposite_orders_does_not_deadlock():
+    m=ShardedMap(8); names=[f"o{i}" for i in range(64)]
+    def run(ns):
+        for _ in range(500):
+            with m.locked_many(ns): pass
+    ts=[threading.Thread(target=run, args=(ns,)) for ns in (names, names[::-1])]
+    for t in ts: t.start()
+    for t in ts: t.join(10)
+    assert not any(t.is_alive() for t in ts)
+    assert sum(m.stats()["acquired"]) >= 1000
+
+
+def test_take_dirty_swaps_every_shard():
+    m=ShardedMap(4)
+    for i in range(20): m.mark_dirty(f"o{i}")
+    m.mark_dirty("o1")
+    assert m.dirty_count() == 20
+    names, _=m.take_dirty()
+    assert sorted(names) == sorted(f"o{i}" for i in range(20))
+    assert m.dirty_count() == 0 and m.take_dirty()[0] == []
+
+
+def test_contention_is_counted():
+    m=ShardedMap(1); s=m.shards[0]
+    def other():
+        with m.locked("b"): pass
+    with m.locked("a"):
+        t=threading.Thread(target=other); t.start(); time.sleep(0.05)
+    t.join(5)
+    st=m.stats()
+    assert st["contended"] == [1] and st["acquired"] == [2] and st["contention_ratio"] == 0.5
+
+
+def test_list_rebuilds_after_a_write_to_one_shard(registry):
+    reg=registry(shards=4); populate(reg, 40)
+    first=reg.ListObjects(empty_pb2.Empty(), None)
+    assert len(first.objects) == 40
+    with quiet():
+        reg.RegisterObject(pb.RegisterRequest(object_name="late", object_address="l:1"), None)
+    names={o.object_name for o in reg.ListObjects(empty_pb2.Empty(), None).objects}
+    assert "late" in names and len(names) == 41
+    assert len(reg.objects.stats()["sizes"]) == 4
@@ -0,0 +1,44 @@
+# stream replication: seq-numbered batches, cumulative acks, resync
+
+import object_repository_pb2 as pb
+from google.protobuf import empty_pb2
+
+from bench_registry import _serve_quiet
+
+
+def _names(stub):
+    return sorted(o.object_name for o in stub.ListObjects(empty_pb2.Empty(), timeout=5).objects)
+
+
+def _register(stub, names):
+    for n in names:
+        assert stub.RegisterObject(pb.RegisterRequest(object_name=n, object_address=f"{n}:1"),
+                                   timeout=10).success
+
+
+def test_backup_applies_and_acks_the_leaders_seq(cluster):
+    c=cluster(2, replication_transport="stream", replication_ack="all",
+              follower_max_staleness_ms=0)
+    lead, back=c.biz(0), c.biz(1)
+    _register(lead, [f"s{i}" for i in range(30)])
+    lead.DeregisterObject(pb.DeregisterRequest(object_name="s0"), timeout=10)
+    seq=c.stats(0)["replication"]["seq"]
+    assert seq >= 31
+    c.wait_for(lambda: c.stats(0)["replication"]["peers"]["n1"]["acked_seq"] == seq)
+    assert c.stats(1)["replica"]["applied_seq"] == seq
+    assert _names(back) == _names(lead) and "s0" not in _names(back)
+
+
+def test_restarted_backup_resyncs_from_a_snapshot(cluster):
+    c=cluster(2, replication_transport="stream", replication_ack="async",
+              follower_max_staleness_ms=0)
+    lead=c.biz(0)
+    _register(lead, ["a", "b"])
+    c.wait_for(lambda: c.stats(0)["replication"]["peers"]["n1"]["acked_seq"] == 2)
+    before=c.stats(0)["replication"]["peers"]["n1"]["resyncs"]
+    c.procs[1].kill(); c.procs[1].join()
+    _register(lead, ["c"])
+    p=c._ctx.Process(target=_serve_quiet, args=(c.cfgs[1],), daemon=True)
+    p.start(); c.procs[1]=p
+    c.wait_for(lambda: _names(c.biz(1, wait=True)) == ["a", "b", "c"], timeout=30)
+    assert c.stats(0)["replication"]["peers"]["n1"]["resyncs"] > before
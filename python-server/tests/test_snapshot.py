@@ -0,0 +1,71 @@
+# cold start: mmap snapshot and expiry filtering while loading
+
+import time
+
+from bench_registry import _inf
+from journal import SNAP_V1, JournalStore, _U32, _enc_put, _frame
+from snapshot import SnapshotReader, write_snapshot
+
+
+def _reopen(path, **kw):
+    st=JournalStore(path); return st, st.load(**kw)
+
+
+def _row(n, ts):
+    return (n, f"{n}:1", "Go", "2", "US", ts)
+
+
+def test_reader_filters_and_keeps(tmp_path):
+    p=str(tmp_path/"s.dat"); now=time.time()
+    write_snapshot(p, 4, [_row("a", now), _row("b", now-100), _row("c\0x", now-100)])
+    snap=SnapshotReader(p)
+    try:
+        assert snap.gen == 4 and len(snap) == 3
+        assert [r[0] for r in snap.rows()] == ["a", "b", "c�x"]
+        assert [r[0] for r in snap.rows(now-30)] == ["a"]
+        assert [r[0] for r in snap.rows(now-30, keep={"b"})] == ["a", "b"]
+        assert snap.row(1) == _row("b", now-100)
+    finally:
+        snap.close()
+
+
+def test_tail_touch_revives_an_old_snapshot_row(tmp_path):
+    st, _=_reopen(tmp_path); now=time.time()
+    st.put("a", _inf("1:1", now-100)); st.compact()
+    st.touch([(now, "a")]); st.close()
+    st, rows=_reopen(tmp_path, min_last_seen=now-30)
+    assert [r[0] for r in rows] == ["a"]
+    st.close()
+
+
+def test_expired_rows_dropped_on_load(tmp_path):
+    st, _=_reopen(tmp_path); now=time.time()
+    st.put("old", _inf("1:1", now-100)); st.compact()
+    st.put("new", _inf("2:2", now)); st.put("stale", _inf("3:3", now-100))
+    st.touch([(now-90, "old")])                       # touched, still expired
+    st.close()
+    st, rows=_reopen(tmp_path, min_last_seen=now-30)
+    assert [r[0] for r in rows] == ["new"]
+    st.close()
+
+
+def test_edcssnp1_snapshot_is_converted(tmp_path):
+    now=time.time()
+    rows=[_row("a", now), _row("b", now-100)]
+    snap=tmp_path/"snapshot.dat"
+    snap.write_bytes(SNAP_V1+_U32.pack(3)+b"".join(_frame(_enc_put(r)) for r in rows))
+    st, got=_reopen(tmp_path, min_last_seen=now-30)
+    assert [r[0] for r in got] == ["a"] and st._gen == 3
+    st.close()
+    assert snap.read_bytes()[:8] == b"EDCSSNP2"
+    st, got=_reopen(tmp_path)
+    assert sorted(r[0] for r in got) == ["a", "b"]
+    st.close()
+
+
+def test_registry_starts_without_expired_rows(registry, tmp_path):
+    now=time.time(); jd=tmp_path/"j"; jd.mkdir()
+    write_snapshot(str(jd/"snapshot.dat"), 1, [_row("live", now), _row("dead", now-7200)])
+    reg=registry(storage="journal", journal_dir=str(jd), ttl_seconds=3600)
+    assert reg.objects.get("live") and reg.objects.get("dead") is None
+    assert reg.load_ms is not None
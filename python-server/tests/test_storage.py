@@ -0,0 +1,26 @@
+# pluggable storage: every engine passes the same conformance checks
+
+import pytest
+
+from bench_registry import ENGINES, check_store, populate
+from storage import MODES, open_store
+
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize("engine", ENGINES)
+def test_conformance(engine, mode):
+    check_store(engine, mode)
+
+
+def test_unknown_engine_and_mode_are_refused(tmp_path):
+    with pytest.raises(ValueError):
+        open_store(dict(storage="tape", database=str(tmp_path/"x.db")))
+    with pytest.raises(ValueError):
+        open_store(dict(storage="memory", persistence="eventually"))
+
+
+def test_memory_registry_restarts_empty(registry, tmp_path):
+    db=str(tmp_path/"m.db")
+    reg=registry(storage="memory", database=db); populate(reg, 5)
+    assert len(reg.objects) == 5 and not reg.store.persistent
+    assert len(registry(storage="memory", database=db).objects) == 0
@@ -0,0 +1,47 @@
+# state transfer: SyncState merges on the leader, backups copy the leader
+
+import pytest
+import object_repository_pb2 as pb
+from google.protobuf import empty_pb2
+
+from bench_registry import _serve_quiet
+
+
+def _names(stub):
+    return {o.object_name for o in stub.ListObjects(empty_pb2.Empty(), timeout=5).objects}
+
+
+def _objs(*names):
+    return pb.ObjectListResponse(objects=[pb.ObjectInfo(object_name=n, object_address=f"{n}:1")
+                                          for n in names])
+
+
+@pytest.mark.parametrize("mode", ["thread", "aio"])
+@pytest.mark.parametrize("transport", ["unary", "stream"])
+def test_sync_state_is_replicated(cluster, mode, transport):
+    c=cluster(2, server_mode=mode, replication_transport=transport, replication_ack="all",
+              follower_max_staleness_ms=0)                   # list the backup itself
+    c.biz(0).SyncState(_objs("s0", "s1", "s2"), timeout=10)
+    assert {"s0", "s1", "s2"} <= _names(c.biz(0))
+    c.wait_for(lambda: {"s0", "s1", "s2"} <= _names(c.biz(1)), timeout=10)
+
+
+@pytest.mark.parametrize("mode", ["thread", "aio"])
+def test_sync_state_on_a_backup_goes_to_the_leader(cluster, mode):
+    c=cluster(2, server_mode=mode, replication_transport="unary", replication_ack="all",
+              follower_max_staleness_ms=0)
+    c.biz(1).SyncState(_objs("f"), timeout=10)
+    assert "f" in _names(c.biz(0))
+    c.wait_for(lambda: "f" in _names(c.biz(1)), timeout=10)
+
+
+def test_restarted_unary_backup_copies_the_leader(cluster):
+    c=cluster(2, replication_transport="unary", replication_ack="async",
+              follower_max_staleness_ms=0)
+    c.procs[1].kill(); c.procs[1].join()
+    c.biz(0).RegisterObject(pb.RegisterRequest(object_name="missed", object_address="m:1"),
+                            timeout=10)
+    p=c._ctx.Process(target=_serve_quiet, args=(c.cfgs[1],), daemon=True)
+    p.start(); c.procs[1]=p
+    c.wait_for(lambda: "missed" in _names(c.biz(1, wait=True)), timeout=30)
+    assert c.stats(1)["replica"]["pull_failures"] == 0
@@ -0,0 +1,92 @@
+# read workers: replica fed by WatchChanges, local reads, forwarded writes
+
+import threading, time
+
+import pytest
+import object_repository_pb2 as pb
+
+from bench_registry import _free_port, populate, quiet
+from workers import ReadWorker, _WorkerReads, owner_server
+
+
+class _Ctx:
+    def time_remaining(self): return 5.0
+    def invocation_metadata(self): return ()
+    def abort(self, code, details): raise AssertionError(f"{code}: {details}")
+
+
+def _until(cond, timeout):
+    stop=time.time()+timeout
+    while not cond():
+        assert time.time() < stop, "condition not met"
+        time.sleep(0.02)
+
+
+@pytest.fixture
+def owned(registry):
+    """In-process owner with one worker following it."""
+    reg=registry(read_workers=1, owner_address=f"127.0.0.1:{_free_port()}",
+                 liveness_flush_ms=50)
+    populate(reg, 20)
+    srv=owner_server(reg, reg.cfg)
+    with quiet():
+        w=ReadWorker(reg.cfg, 0)
+        assert w.synced.wait(10)
+    yield reg, w
+    w._watch=lambda stream: threading.Event().wait()   # park the feed thread, no resync
+    srv.stop(None)
+
+
+def test_worker_serves_lookups_from_its_replica(owned):
+    reg, w=owned
+    assert len(w.objects) == 20
+    r=w.GetObject(pb.GetRequest(object_name="svc-3"), _Ctx())
+    assert r.object_address == reg.objects.get("svc-3")["address"]
+
+
+def test_writes_are_forwarded_and_come_back_on_the_feed(owned):
+    reg, w=owned
+    with quiet():
+        assert w.RegisterObject(pb.RegisterRequest(object_name="new", object_address="n:1"),
+                                _Ctx()).success
+    assert "new" in reg.objects
+    _until(lambda: "new" in w.objects, timeout=5)
+    with quiet():
+        w.DeregisterObject(pb.DeregisterRequest(object_name="new"), _Ctx())
+    _until(lambda: "new" not in w.objects, timeout=5)
+
+
+def test_worker_heartbeats_reach_the_owner(owned):
+    reg, w=owned
+    reg.objects.get("svc-1")["last_seen"]-=100
+    old=reg.objects.get("svc-1")["last_seen"]
+    assert w.Heartbeat(pb.HeartbeatPing(object_name="svc-1"), _Ctx()).ok
+    assert not w.Heartbeat(pb.HeartbeatPing(object_name="nope"), _Ctx()).ok
+    _until(lambda: reg.objects.get("svc-1")["last_seen"] > old+50, timeout=5)
+
+
+def test_worker_staleness_is_its_owners_plus_the_time_since():
+    f=_WorkerReads(max_staleness_ms=100)
+    assert f.check(0) == "staleness unknown"              # nothing heard yet
+    f.note(0.0)
+    assert f.check(0) is None and f.check(7) == "revision token"
+    f.note(float("inf"))                                  # owner is a backup that cannot tell
+    assert f.check(0) == "staleness unknown"
+    f.note(20.0); time.sleep(0.1)
+    assert f.check(0).endswith("ms stale") and f.too_stale == 3
+    assert _WorkerReads(max_staleness_ms=0).check(0) is None
+
+
+def test_idle_feed_keeps_the_worker_fresh(owned):
+    reg, w=owned
+    time.sleep(1.5)                                       # past the 1 s default bound, no writes
+    assert w.follower.staleness() < 0.5
+    assert w.follower.check(0) is None
+
+
+def test_stale_worker_reads_through_its_owner(owned):
+    reg, w=owned
+    reg.objects.get("svc-4")["address"]="moved:1"         # owner-only change, not on the feed
+    w.follower.note(5000.0); w.follower.note=lambda ms: None   # keep-alives cannot undo it
+    r=w.GetObject(pb.GetRequest(object_name="svc-4"), _Ctx())
+    assert r.object_address == "moved:1" and w.follower.too_stale == 1
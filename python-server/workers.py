@@ -0,0 +1,256 @@
+# ==============================================================
+#  workers.py
+#  multi-process serving: SO_REUSEPORT read workers
+#
+#  "read_workers": N makes serve() the *owner* process and spawns N
+#  workers that bind the same self_address with SO_REUSEPORT, so the
+#  kernel spreads client connections over N+1 interpreters (N+1 GILs).
+#
+#    owner   : the full ObjectRegistry - election, storage, expiry,
+#              replication.  Also listens on owner_address (internal)
+#              for the workers.
+#    worker  : a read replica fed by the owner's WatchChanges stream.
+#              GetObject / ListObjects / Heartbeat and their batch forms
+#              are answered locally; heartbeats are batched to the owner
+#              as TouchObjects every liveness_flush_ms; every other RPC
+#              is forwarded as is.  Reads with a revision token, or
+#              while the worker may be more than follower_max_staleness_ms
+#              behind the leader (its owner's staleness, stamped on every
+#              feed batch, plus the time since), go to the owner as well.
+#
+#  A worker only binds the public port after its first full sync,
+#  resyncs from a fresh snapshot whenever its stream breaks and exits
+#  when the owner process does.
+# ==============================================================
+
+import multiprocessing, threading, time
+from concurrent.futures import ThreadPoolExecutor
+
+import grpc
+import object_repository_pb2       as pb
+import object_repository_pb2_grpc  as pb_grpc
+
+from registry_server_wifi import ObjectRegistry
+from admission import Admission, AdmissionInterceptor
+from shards    import ShardedMap
+
+REUSEPORT = [("grpc.so_reuseport", 1)]
+FWD_TIMEOUT = 30.0        # cap; a shorter client deadline is passed through
+
+
+def start_read_workers(cfg: dict):
+    """Spawn (not fork: gRPC is already running in the owner) the read workers."""
+    ctx=multiprocessing.get_context("spawn")
+    procs=[ctx.Process(target=run_worker, args=(cfg, k), daemon=True, name=f"read-worker-{k}")
+           for k in range(cfg.get("read_workers", 0))]
+    for p in procs: p.start()
+    print(f"✅ {len(procs)} read workers -> owner @ {cfg['owner_address']}")
+    return procs
+
+
+def owner_server(reg, cfg: dict):
+    """Internal endpoint for the workers: feed streams, forwarded writes, liveness."""
+    srv=grpc.server(ThreadPoolExecutor(max_workers=2*cfg["read_workers"]+4))
+    pb_grpc.add_ObjectRepositoryServicer_to_server(reg, srv)
+    srv.add_insecure_port(cfg["owner_address"])
+    srv.start()
+    return srv
+
+
+def run_worker(cfg: dict, k: int):
+    ReadWorker(cfg, k).serve()
+
+
+def _forwarded(method):
+    def call(self, req, ctx):
+        try:
+            return getattr(self.owner, method)(req, timeout=min(ctx.time_remaining(), FWD_TIMEOUT))
+        except grpc.RpcError as e:
+            ctx.abort(e.code(), e.details())
+    call.__name__=method
+    return call
+
+
+def _forwarded_stream(method):
+    def call(self, req, ctx):
+        try:
+            yield from getattr(self.owner, method)(req)
+        except grpc.RpcError as e:
+            ctx.abort(e.code(), e.details())
+    call.__name__=method
+    return call
+
+
+class _WorkerReads:
+    """
+    A worker does not know the leader's seq: reads with a token go to the
+    owner.  It is as fresh as its owner was at the last feed batch it
+    applied, so its staleness is that batch's staleness_ms plus the time
+    since; past follower_max_staleness_ms reads go to the owner too.
+    """
+
+    def __init__(self, max_staleness_ms: float = 1000):
+        self.bound     = max_staleness_ms / 1000.0   # 0 = serve whatever we have
+        self.base      = float("inf")                # owner's staleness at the last batch
+        self.at        = time.monotonic()
+        self.too_stale = 0
+
+    def note(self, staleness_ms):
+        self.base=staleness_ms/1000.0; self.at=time.monotonic()
+
+    def revision(self):
+        return 0
+
+    def staleness(self) -> float:
+        return self.base+(time.monotonic()-self.at)
+
+    def check(self, want_rev):
+        if want_rev:
+            return "revision token"
+        if self.bound and (s:=self.staleness()) > self.bound:
+            self.too_stale += 1
+            return "staleness unknown" if s == float("inf") else f"{s*1000:.0f} ms stale"
+        return None
+
+
+class ReadWorker(pb_grpc.ObjectRepositoryServicer):
+
+    # reads run the owner's own code against the replica's shards
+    GetObject    = ObjectRegistry.GetObject
+    ListObjects  = ObjectRegistry.ListObjects
+    _get_local   = ObjectRegistry._get_local
+    _list_local  = ObjectRegistry._list_local
+    BatchGet     = ObjectRegistry.BatchGet
+    _batch_get_local = ObjectRegistry._batch_get_local
+    _build_infos = staticmethod(ObjectRegistry._build_infos)
+
+    # writes and leases belong to the owner
+    RegisterObject   = _forwarded("RegisterObject")
+    DeregisterObject = _forwarded("DeregisterObject")
+    UpdateObject     = _forwarded("UpdateObject")
+    SyncState        = _forwarded("SyncState")
+    LeaseGrant       = _forwarded("LeaseGrant")
+    LeaseKeepAlive   = _forwarded("LeaseKeepAlive")
+    LeaseRevoke      = _forwarded("LeaseRevoke")
+    TouchObjects     = _forwarded("TouchObjects")
+    BatchRegister    = _forwarded("BatchRegister")
+    BatchDeregister  = _forwarded("BatchDeregister")
+    # peer traffic that lands on a worker's share of the port
+    FetchSnapshot    = _forwarded_stream("FetchSnapshot")
+    Replicate        = _forwarded_stream("Replicate")
+    GetDigests       = _forwarded("GetDigests")
+    FetchBuckets     = _forwarded_stream("FetchBuckets")
+
+    def __init__(self, cfg: dict, k: int, name: str | None = None):
+        self.cfg            = cfg
+        self.follower       = _WorkerReads(cfg.get("follower_max_staleness_ms", 1000))
+        self.name           = name or f"worker-{k}"
+        self.objects        = ShardedMap(cfg.get("shards", 16))
+        self.lockfree_reads = True
+        self.list_max_age   = cfg.get("list_snapshot_max_age_sec", 1.0)
+        self._list_snap     = ((), 0.0, None)
+        self.owner   = self._connect()
+        self.synced  = threading.Event()
+        self.applied = 0                      # last feed seq applied
+        self.resets  = 0
+        self._backoff= 0.1
+        self.flush_s = cfg.get("liveness_flush_ms", 200) / 1000.0
+        self._touch  = {}                     # name -> last_seen, flushed to the owner
+        self._tlock  = threading.Lock()
+        threading.Thread(target=self._follow,        daemon=True).start()
+        threading.Thread(target=self._flush_liveness, daemon=True).start()
+
+    def _connect(self):
+        return pb_grpc.ObjectRepositoryStub(grpc.insecure_channel(self.cfg["owner_address"]))
+
+    # =============== replica maintenance ====================================
+    def _follow(self):
+        while True:
+            try:
+                self._watch(self.owner.WatchChanges(pb.WatchRequest(subscriber=self.name)))
+            except grpc.RpcError as e:
+                print(f"[{self.name}] feed lost ({e.code().name}); resync in {self._backoff:.1f}s")
+            time.sleep(self._backoff); self._backoff=min(self._backoff*2, 5.0)
+
+    def _watch(self, stream):
+        """Apply one WatchChanges stream: snapshot into a fresh map, then live changes."""
+        staged=None
+        for batch in stream:
+            for ev in batch.events:
+                if ev.kind == ev.RESET:
+                    staged=ShardedMap(len(self.objects.shards)); self.resets += 1
+                elif ev.kind == ev.SYNCED:
+                    self.objects, staged=staged, None      # one reference swap
+                    self._list_snap=((), 0.0, None)
+                    self.synced.set(); self._backoff=0.1
+                else:
+                    self._apply(staged if staged is not None else self.objects, ev)
+                if ev.seq: self.applied=ev.seq
+            if staged is None: self.follower.note(batch.staleness_ms)   # serving this map
+
+    @staticmethod
+    def _apply(objects, ev):
+        o=ev.object
+        with objects.locked(o.object_name) as sh:
+            if ev.kind == ev.DELETE:
+                if sh.objects.pop(o.object_name, None) is None: return
+            else:
+                sh.objects[o.object_name]=dict(address=o.object_address, language=o.language,
+                                               version=o.version, region=o.region,
+                                               last_seen=o.last_seen, source="local")
+            sh.rev += 1
+
+    def _stale_read(self, method, req, ctx, empty, why):
+        return _forwarded(method)(self, req, ctx)
+
+    # =============== liveness ===============================================
+    def Heartbeat(self, req, ctx):
+        inf=self.objects.get(req.object_name)
+        if inf is None:
+            return pb.HeartbeatAck(ok=False)
+        inf["last_seen"]=now=time.time()
+        with self._tlock:
+            self._touch[req.object_name]=now
+        return pb.HeartbeatAck(ok=True)
+
+    def BatchHeartbeat(self, req, ctx):
+        now=time.time(); ok=[]
+        with self._tlock:
+            for n in req.object_name:
+                inf=self.objects.get(n)
+                if inf is not None:
+                    inf["last_seen"]=now; self._touch[n]=now
+                ok.append(inf is not None)
+        return pb.BatchHeartbeatResponse(ok=ok)
+
+    def _flush_liveness(self):
+        while True:
+            time.sleep(self.flush_s)
+            with self._tlock:
+                batch, self._touch = self._touch, {}
+            if not batch: continue
+            try:
+                self.owner.TouchObjects(pb.TouchRequest(object_name=list(batch),
+                                                        last_seen=list(batch.values())),
+                                        timeout=FWD_TIMEOUT)
+            except grpc.RpcError as e:
+                print(f"[{self.name}] liveness flush failed:", e.code().name)
+                with self._tlock:                  # keep the newest value per name
+                    for n, ts in batch.items():
+                        if ts > self._touch.get(n, 0): self._touch[n]=ts
+
+    # =============== main ===================================================
+    def serve(self):
+        self.synced.wait()
+        adm=Admission(self.cfg)
+        srv=grpc.server(ThreadPoolExecutor(max_workers=self.cfg.get("biz_workers", 10)),
+                        interceptors=[AdmissionInterceptor(adm)],
+                        maximum_concurrent_rpcs=adm.max_rpcs, options=REUSEPORT)
+        pb_grpc.add_ObjectRepositoryServicer_to_server(self, srv)
+        srv.add_insecure_port(self.cfg["self_address"])
+        srv.start()
+        print(f"✅ {self.name} @ {self.cfg['self_address']} ({len(self.objects)} objects)")
+        owner=multiprocessing.parent_process()
+        while owner is None or owner.is_alive():  # never outlive the owner
+            time.sleep(1)
+        srv.stop(0)
@@ -0,0 +1,22 @@
+import grpc
+import json
+import sys
+
+import heartbeat_service_pb2 as hb_pb
+import heartbeat_service_pb2_grpc as hb_grpc
+from google.protobuf import empty_pb2
+
+def dump_stats(target):
+    stub = hb_grpc.HeartbeatServiceStub(grpc.insecure_channel(target))
+    try:
+        r = stub.GetStats(empty_pb2.Empty(), timeout=2.0)
+    except grpc.RpcError as e:
+        print(f"⚠ {target} unreachable: {e.code()}")
+        return
+    print(f"\n Node {r.node_id} @ {target}")
+    print(json.dumps(json.loads(r.json), indent=2))
+
+if __name__ == "__main__":
+    # usage: python statscheck.py host:50052 [host:50052 ...]
+    for t in sys.argv[1:] or ["127.0.0.1:50052"]:
+        dump_stats(t)